@@ -0,0 +1,79 @@
+"""
+Throughput of myrrh.utils.mrpc against the xmlrpc path of myrrh.utils.pickler, both over loopback tcp
+
+    python benchmarks/bench_mrpc.py [calls]
+"""
+import socket
+import sys
+import threading
+import time
+import xmlrpc.client
+
+from xmlrpc.server import SimpleXMLRPCRequestHandler, SimpleXMLRPCServer
+
+from myrrh.utils.mrpc import RpcClient, RpcServer
+from myrrh.utils.pickler import decode_arg_self, encode_arg_self
+
+SMALL = b"x" * 64
+LARGE = bytes(1024 * 1024)
+
+
+class _Service:
+    def echo(self, value):
+        return value
+
+
+class _QuietHandler(SimpleXMLRPCRequestHandler):
+    def log_message(self, *_a):
+        pass
+
+
+def _timed(func, count):
+    start = time.perf_counter()
+    func(count)
+    return time.perf_counter() - start
+
+
+def bench_xmlrpc(calls):
+    server = SimpleXMLRPCServer(("127.0.0.1", 0), _QuietHandler, logRequests=False)
+    server.register_function(decode_arg_self(_Service().echo), "echo")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        echo = encode_arg_self(xmlrpc.client.ServerProxy("http://127.0.0.1:%d" % server.server_address[1]).echo)
+
+        small = _timed(lambda n: [echo(SMALL) for _ in range(n)], calls)
+        large = _timed(lambda n: [echo(LARGE) for _ in range(n)], calls // 50 or 1)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    return calls / small, None, 2 * (calls // 50 or 1) / large
+
+
+def bench_mrpc(calls):
+    listener = socket.create_server(("127.0.0.1", 0))
+    client_sock = socket.create_connection(listener.getsockname())
+    server_sock, _ = listener.accept()
+    listener.close()
+
+    server = RpcServer(_Service(), server_sock).start()
+    with RpcClient(client_sock) as client:
+        small = _timed(lambda n: [client.call("echo", SMALL) for _ in range(n)], calls)
+        pipelined = _timed(lambda n: [f.result() for f in [client.submit("echo", SMALL) for _ in range(n)]], calls)
+        large = _timed(lambda n: [client.call("echo", LARGE) for _ in range(n)], calls // 50 or 1)
+
+    server.join(10)
+
+    return calls / small, calls / pipelined, 2 * (calls // 50 or 1) / large
+
+
+def main(calls=2000):
+    print("%-8s %14s %14s %12s" % ("", "64B calls/s", "pipelined/s", "1MiB MiB/s"))
+    for name, bench in (("xmlrpc", bench_xmlrpc), ("mrpc", bench_mrpc)):
+        small, pipelined, large = bench(calls)
+        print("%-8s %14.0f %14s %12.1f" % (name, small, "-" if pipelined is None else "%.0f" % pipelined, large))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -1,12 +1,24 @@
+import atexit
+import collections
+import dataclasses
 import errno
+import functools
+import itertools
 import os
+import re
+import selectors
 import subprocess
+import sys
+import threading
 import typing
 import signal
 import shutil
+import time
+import uuid
 
 
 from myrrh.utils import mshlex
+from myrrh.utils import mcodec
 from myrrh.provider import (
     Wiring,
     Protocol,
@@ -16,6 +28,9 @@ from myrrh.provider import (
     IFileSystemService,
     IStreamService,
     StatField,
+    EnvDelta,
+    ISession,
+    SessionPool,
 )
 
 from myrrh.utils.mhandle import LightHandler
@@ -42,12 +57,166 @@ if os.name == "posix":
 
 _default_shell_encoding = "utf8"
 
+_env_bases: dict[tuple, dict] = dict()
+_ENV_BASES_SIZE = 16
+
+
+def _environ(env, conv=os.fsdecode):
+    if env is None:
+        return None
+
+    if not isinstance(env, EnvDelta):
+        return {conv(k): conv(v) for k, v in env.items()}
+
+    # the converted base is kept, only the changes are converted on each call
+    base = _env_bases.get((env.key, conv))
+    if base is None:
+        if len(_env_bases) >= _ENV_BASES_SIZE:
+            _env_bases.clear()
+        base = _env_bases[(env.key, conv)] = {conv(k): conv(v) for k, v in env.base.items()}
+
+    if not env.changes:
+        return base
+
+    environ = dict(base)
+    for k, v in env.changes.items():
+        if v is None:
+            environ.pop(conv(k), None)
+        else:
+            environ[conv(k)] = conv(v)
+
+    return environ
+
+
 OSErrorEBADF = OSError(errno.EBADF, os.strerror(errno.EBADF))
 
+_STAT_FILE_FIELDS = tuple(f for f in StatField if f & StatField.FILE)
+_STAT_TIME_FIELDS = (StatField.ATIME, StatField.MTIME, StatField.CTIME)
+
+
+_ENV_NAME = re.compile(rb"[A-Za-z_][A-Za-z0-9_]*")
+
+
+def _squote(s):
+    return b"'" + s.replace(b"'", b"'\\''") + b"'"
+
+
+class ShellSession(ISession):
+    """
+    persistent posix shell, each command runs in a subshell of it with its own working directory and environment changes
+    """
+
+    def __init__(self, env=None):
+        self._marker = b"__myrrh_%s__" % uuid.uuid4().hex.encode()
+        self._proc = subprocess.Popen(
+            [_shell],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+        )
+
+    def alive(self):
+        return self._proc.poll() is None
+
+    def close(self):
+        try:
+            self._proc.stdin.close()  # type: ignore[union-attr]
+            self._proc.wait(1)
+        except (OSError, subprocess.TimeoutExpired):
+            self._proc.kill()
+            self._proc.wait()
+        finally:
+            self._proc.stdout.close()  # type: ignore[union-attr]
+            self._proc.stderr.close()  # type: ignore[union-attr]
+
+    def execute(self, command: bytes, working_dir: str, changes: dict[bytes, bytes | None]):
+        # eval keeps syntax errors in the subshell, the session shell would exit otherwise
+        script = [b"( cd -- %s || exit 1" % _squote(os.fsencode(working_dir))]
+        script.extend(b"unset %s" % k if v is None else b"export %s=%s" % (k, _squote(v)) for k, v in changes.items())
+        script.append(b"eval %s\n) </dev/null" % _squote(command))
+        script.append(b"printf '\\n%s %%d\\n' $?" % self._marker)
+        script.append(b"printf '\\n%s\\n' >&2\n" % self._marker)
+
+        self._proc.stdin.write(b"\n".join(script))  # type: ignore[union-attr]
+        self._proc.stdin.flush()  # type: ignore[union-attr]
+
+        out, err = bytearray(), bytearray()
+        end = {self._proc.stdout: out, self._proc.stderr: err}
+
+        with selectors.DefaultSelector() as selector:
+            for f in end:
+                selector.register(f, selectors.EVENT_READ)
+
+            while end:
+                for key, _ in selector.select():
+                    buffer = end[key.fileobj]
+                    data = os.read(key.fd, 1024 * 64)
+                    if not data:
+                        raise OSError(errno.EPIPE, os.strerror(errno.EPIPE))
+
+                    buffer += data
+                    if buffer.endswith(b"\n") and buffer.rfind(b"\n" + self._marker, max(0, len(buffer) - len(self._marker) - 16)) != -1:
+                        selector.unregister(key.fileobj)
+                        del end[key.fileobj]
+
+        pos = out.rfind(b"\n" + self._marker)
+        rval = int(out[pos + len(self._marker) + 2 : -1])
+        del out[pos:]
+        del err[err.rfind(b"\n" + self._marker) :]
+
+        return bytes(out), bytes(err), rval
+
+
+@dataclasses.dataclass(frozen=True)
+class _SessionKey:
+    key: int | None
+    base: typing.Mapping | None = dataclasses.field(compare=False, hash=False, repr=False)
+
 
 class Shell(IShellService):
     protocol = Protocol.MYRRH
 
+    # commands run in pooled persistent shells when enabled, the output of a command left running in
+    # the background is then no longer waited for
+    sessions_max_size = cfg_init("shell_sessions_max_size", 0, section="mplugins.provider.local")
+    sessions_max_idle = cfg_init("shell_sessions_max_idle", 30.0, section="mplugins.provider.local")
+    # a key per working environment
+    sessions_max_keys = cfg_init("shell_sessions_max_keys", 8, section="mplugins.provider.local")
+
+    _sessions: SessionPool | None = None
+    _sessions_lock = threading.Lock()
+
+    @classmethod
+    def _session_pool(cls):
+        with cls._sessions_lock:
+            if cls._sessions is None:
+                cls._sessions = SessionPool(
+                    lambda key: ShellSession(_environ(None if key.base is None else EnvDelta(key.base, key=key.key))),
+                    max_size=cls.sessions_max_size,
+                    max_idle=cls.sessions_max_idle,
+                    max_keys=cls.sessions_max_keys,
+                )
+                atexit.register(cls._sessions.close)
+
+            return cls._sessions
+
+    def _session_execute(self, command, working_dir, env):
+        if env is not None and not isinstance(env, EnvDelta):
+            return None
+
+        changes = env.changes if env is not None else dict()
+        if not all(isinstance(v, (bytes, type(None))) and isinstance(k, bytes) and _ENV_NAME.fullmatch(k) for k, v in changes.items()):
+            return None
+
+        working_dir = working_dir or os.getcwd()
+        if not os.path.isdir(working_dir):
+            return None
+
+        key = _SessionKey(env.key, env.base) if env is not None else _SessionKey(None, None)
+        with self._session_pool().session(key) as session:
+            return session.execute(command, working_dir, changes)
+
     def execute(
         self,
         command,
@@ -60,8 +229,13 @@ class Shell(IShellService):
         if isinstance(command, list):
             command = b" ".join(command)
 
+        if self.sessions_max_size and os.name == "posix":
+            result = self._session_execute(command, working_dir, env)
+            if result is not None:
+                return result
+
         command = os.fsdecode(command)
-        env = env if env is None else {os.fsdecode(k): os.fsdecode(v) for k, v in env.items()}
+        env = _environ(env)
 
         with subprocess.Popen(
             command,
@@ -88,7 +262,7 @@ class Shell(IShellService):
 
         command = list(map(os.fsdecode, command))
 
-        env = env if env is None else {os.fsdecode(k): os.fsdecode(v) for k, v in env.items()}
+        env = _environ(env)
 
         proc = subprocess.Popen(command, cwd=working_dir, env=env)
 
@@ -107,6 +281,14 @@ class FileSystem(IFileSystemService):
     """
 
     protocol = Protocol.MYRRH
+    list_page_sz = cfg_init("list_page_size", 4096, section="mplugins.provider.local")
+    list_cursors_max = cfg_init("list_cursors_max", 64, section="mplugins.provider.local")
+    list_cursors_ttl = cfg_init("list_cursors_ttl", 60.0, section="mplugins.provider.local")
+
+    # cursor: (scandir iterator, last used), the least recently used first
+    _cursors: collections.OrderedDict[int, tuple[typing.Any, float]] = collections.OrderedDict()
+    _cursors_id = itertools.count(1)
+    _cursors_lock = threading.Lock()
 
     def exist(self, file_path, *, extras: dict[str, typing.Any] | None = None):
         return os.path.exists(file_path)
@@ -125,8 +307,84 @@ class FileSystem(IFileSystemService):
     def is_container(self, path, *, extras: dict[str, typing.Any] | None = None):
         return os.path.isdir(path)
 
-    def list(self, path: bytes, *, extras: dict[str, typing.Any] | None = None):
-        raise NotImplementedError
+    def list(
+        self,
+        path: bytes,
+        fields: int = 0,
+        cursor: int | None = None,
+        limit: int = 0,
+        *,
+        extras: dict[str, typing.Any] | None = None,
+    ):
+        fields = StatField(fields)
+        limit = limit or self.list_page_sz
+
+        with self._cursors_lock:
+            entries, _ = self._cursors.pop(cursor, (None, None))
+            expired = self._expired_cursors()
+        self._close_entries(expired)
+
+        if cursor is None:
+            entries = os.scandir(path)
+        elif entries is None:
+            raise OSErrorEBADF
+
+        result = []
+        try:
+            for entry in entries:
+                item = {"name": entry.name}
+
+                if fields:
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        st = entry.stat(follow_symlinks=False)
+
+                    item.update((f"st_{f.name.lower()}", getattr(st, f"st_{f.name.lower()}")) for f in _STAT_FILE_FIELDS if f & fields)
+                    item.update((f"st_{f.name.lower()}_ns", getattr(st, f"st_{f.name.lower()}_ns")) for f in _STAT_TIME_FIELDS if f & fields)
+
+                result.append(item)
+
+                if len(result) >= limit:
+                    with self._cursors_lock:
+                        cursor = next(self._cursors_id)
+                        self._cursors[cursor] = (entries, time.monotonic())
+                        expired = self._expired_cursors()
+                    self._close_entries(expired)
+                    return result, cursor
+        except BaseException:
+            entries.close()
+            raise
+
+        entries.close()
+        return result, None
+
+    def close_cursor(self, cursor: int, *, extras: dict[str, typing.Any] | None = None) -> None:
+        with self._cursors_lock:
+            entries, _ = self._cursors.pop(cursor, (None, None))
+            expired = self._expired_cursors()
+
+        self._close_entries(expired if entries is None else [entries, *expired])
+
+    @classmethod
+    def _expired_cursors(cls):
+        # the listings left unfinished are closed once too many are opened or too old
+        now = time.monotonic()
+        expired = list()
+
+        while cls._cursors:
+            entries, since = next(iter(cls._cursors.values()))
+            if len(cls._cursors) <= cls.list_cursors_max and now - since <= cls.list_cursors_ttl:
+                break
+            expired.append(entries)
+            cls._cursors.popitem(last=False)
+
+        return expired
+
+    @staticmethod
+    def _close_entries(entries):
+        for e in entries:
+            e.close()
 
     def stat(self, path: bytes, *, extras: dict | None = None) -> dict:
         stat = os.stat(path)
@@ -154,17 +412,47 @@ except ImportError:
 class StreamPosix(IStreamService):
     protocol = Protocol.POSIX
     chunk_sz = cfg_init("rd_chunk_size", 2048, section="mplugins.provider.local")
+    rdall_chunk_sz = cfg_init("rdall_chunk_size", 1024 * 64, section="mplugins.provider.local")
+    # nothing to save on a local link, codecs are offered on demand only
+    stream_codecs = cfg_init("stream_codecs", [], section="mplugins.provider.local")
 
     handler = LightHandler()
 
+    def codecs(self, *, extras: dict | None = None) -> tuple[str, ...]:
+        return tuple(c for c in self.stream_codecs if c in mcodec.CODECS)
+
+    def _codec(self, handle):
+        _, fd, manager = self.handler.h(handle)
+        return fd, manager if isinstance(manager, (mcodec.CodecReader, mcodec.CodecWriter)) else None
+
+    def _open_codec(self, path, fd, wiring, codec):
+        if codec not in self.codecs():
+            os.close(fd)
+            raise ValueError(f"unsupported codec: {codec}")
+
+        if wiring & Wiring.INOUT == Wiring.INOUT:
+            os.close(fd)
+            raise ValueError("codec streams are either read or written")
+
+        raw = open(fd, "wb" if wiring & Wiring.OUT else "rb", buffering=0)
+        if wiring & Wiring.OUT:
+            manager = mcodec.writer(raw, codec, decode=True)
+        else:
+            manager = mcodec.reader(raw, codec, decode=False, chunk_size=self.rdall_chunk_sz)
+
+        return self.handler.new(path, fd, manager)
+
     def open_file(self, path: bytes, wiring: int, *, extras: dict | None = None) -> tuple[bytes, int]:
+        extras = dict(extras) if extras else None
+        codec = extras.pop("codec", None) if extras else None
+
         try:
             flags = 0
             mode = 511
 
             wiring_ = Wiring(wiring)
 
-            if wiring_ & Wiring.INOUT:
+            if wiring_ & Wiring.INOUT == Wiring.INOUT:
                 flags |= os.O_RDWR
                 if not wiring_ & Wiring.RESET:
                     flags |= os.O_APPEND
@@ -186,7 +474,7 @@ class StreamPosix(IStreamService):
                 mode = extras["mode"]
 
             fd = os.open(os.fsdecode(path), flags, mode)
-            handle = self.handler.new(path, fd, None)
+            handle = self._open_codec(path, fd, wiring_, codec) if codec else self.handler.new(path, fd, None)
 
             return path, handle
 
@@ -226,7 +514,7 @@ class StreamPosix(IStreamService):
             umask = extras.get("umask") or umask
             creationflags = extras.get("creationflags") or creationflags
 
-        env_: dict[str, str] | None = env and {os.fsencode(k): os.fsencode(v) for k, v in env.items()}  # type: ignore[assignment]
+        env_: dict[str, str] | None = _environ(env, os.fsencode)  # type: ignore[assignment]
 
         proc = subprocess.Popen(executable=path, args=args, cwd=working_dir, env=env_, stdin=stdin, stdout=stdout, stderr=stderr, creationflags=creationflags, process_group=process_group, group=gid, extra_groups=gids, user=uid, umask=umask, close_fds=False)  # type: ignore[misc]
 
@@ -251,23 +539,49 @@ class StreamPosix(IStreamService):
         return path, hproc, hin, hout, herr
 
     def read(self, handle: int, nbytes: int, *, extras: dict[str, typing.Any] | None = None) -> bytearray:
-        fd = self.handler.h(handle, 1)
+        fd, codec = self._codec(handle)
+
+        if codec:
+            return bytearray(codec.read(nbytes))
 
         return bytearray(os.read(fd, nbytes))
 
     def readall(self, handle: int, *, extras: dict | None = None) -> bytearray:
-        fd = self.handler.h(handle, 1)
+        """
+        read until end of file, or at most max_size bytes when given (extras): call it again to get the remaining data
+        """
+        fd, codec = self._codec(handle)
+        max_sz = extras.get("max_size", sys.maxsize) if extras else sys.maxsize
+        read = codec.read if codec else functools.partial(os.read, fd)
 
-        sz = os.stat(fd).st_size
-        return bytearray(os.read(fd, sz))
+        data = bytearray()
+        while len(data) < max_sz and (chunk := read(min(self.rdall_chunk_sz, max_sz - len(data)))):
+            data += chunk
 
-    def readchunk(self, handle: int, *, extras: dict | None = None) -> bytearray:
-        fd = self.handler.h(handle, 1)
+        return data
+
+    def readinto(self, handle: int, buffer: bytearray | memoryview, *, extras: dict | None = None) -> int:
+        fd, codec = self._codec(handle)
 
-        return bytearray(os.read(fd, self.chunk_sz))
+        if codec:
+            return codec.readinto(buffer)
+
+        if hasattr(os, "readv"):
+            return os.readv(fd, (buffer,))
+
+        data = os.read(fd, len(buffer))
+        buffer[: len(data)] = data
+
+        return len(data)
+
+    def readchunk(self, handle: int, *, extras: dict | None = None) -> bytearray:
+        return self.read(handle, self.chunk_sz)
 
     def write(self, handle: int, data: bytes, *, extras: dict[str, typing.Any] | None = None):
-        fd = self.handler.h(handle, 1)
+        fd, codec = self._codec(handle)
+
+        if codec:
+            return codec.write(data)
 
         return os.write(fd, data)
 
@@ -278,14 +592,22 @@ class StreamPosix(IStreamService):
             manager = None
 
         fd = self.handler.close(handle, 1)
+        if fd <= 0:
+            return
+
+        # a codec stream ends its data on close, a truncated or corrupted one fails there
+        if isinstance(manager, (mcodec.CodecReader, mcodec.CodecWriter)):
+            manager.close()
+            return
+
         try:
-            if fd > 0:
-                if manager and hasattr(manager, "close"):
-                    manager.close()
-                else:
-                    os.close(fd)
-        except OSError:
-            pass
+            if manager and hasattr(manager, "close"):
+                manager.close()
+            else:
+                os.close(fd)
+        except OSError as e:
+            if manager is None and e.errno != errno.EBADF:
+                raise
 
     def seek(
         self,
@@ -295,7 +617,10 @@ class StreamPosix(IStreamService):
         *,
         extras: dict[str, typing.Any] | None = None,
     ) -> int:
-        fd = self.handler.h(handle, 1)
+        fd, codec = self._codec(handle)
+        if codec:
+            raise OSError(errno.ESPIPE, os.strerror(errno.ESPIPE))
+
         whence = Whence(whence)
 
         match whence:
@@ -319,7 +644,10 @@ class StreamPosix(IStreamService):
         return bytearray()
 
     def truncate(self, handle: int, length: int, *, extras: dict | None = None) -> None:
-        fd = self.handler.h(handle, 1)
+        fd, codec = self._codec(handle)
+        if codec:
+            raise OSError(errno.ESPIPE, os.strerror(errno.ESPIPE))
+
         return os.truncate(fd, length)
 
     def stat(
@@ -384,6 +712,7 @@ if winapi:
     class StreamWinAPi(IStreamService):
         protocol = Protocol.WINAPI
         chunk_sz = cfg_init("rd_chunk_size", 2048, section="mplugins.provider.local")
+        rdall_chunk_sz = cfg_init("rdall_chunk_size", 1024 * 64, section="mplugins.provider.local")
 
         handles: dict[int, typing.Any] = dict()
 
@@ -394,6 +723,9 @@ if winapi:
 
             return handle, *info
 
+        def codecs(self, *, extras: dict | None = None) -> tuple[str, ...]:
+            return ()
+
         def open_file(self, path: bytes, wiring: int, *, extras: dict | None = None) -> tuple[bytes, int]:
             extras = extras or dict()
             wiring = Wiring(wiring)
@@ -444,7 +776,7 @@ if winapi:
             extras = extras or {}
 
             working_dir = _working_dir(working_dir)
-            env = env if env is None else {os.fsdecode(k): os.fsdecode(v) for k, v in env.items()}
+            env = _environ(env)
 
             creation_flags = extras.get("creation_flags", 0)
 
@@ -477,7 +809,7 @@ if winapi:
                 dwFlags=extras.get("startup_info.flags", 0 if not wiring else winapi.STARTF_USESTDHANDLES), hStdInput=stdin_proc, hStdOutput=stdout_proc, hStdError=stderr_proc, lpAttributeList={"handle_list": []}, wShowWindow=extras.get("startup_info.show_window", 0)  # type: ignore[attr-defined]
             )
 
-            env_ = env and {os.fsdecode(k): os.fsdecode(v) for k, v in env.items()} or dict()
+            env_ = env or dict()
 
             try:
                 hp, ht, pid, _tid = winapi.CreateProcess(None, args, None, None, int(wiring.value != 0), creation_flags, env_, working_dir, startup_info)  # type: ignore
@@ -517,8 +849,29 @@ if winapi:
 
         def readall(self, handle: int, *, extras: dict | None = None) -> bytearray:
             handle, _, _ = self._h(handle)  # type: ignore[misc]
+            max_sz = extras.get("max_size", sys.maxsize) if extras else sys.maxsize
 
-            raise NotImplementedError
+            data = bytearray()
+            try:
+                while len(data) < max_sz:
+                    chunk, _ = winapi.ReadFile(handle, min(self.rdall_chunk_sz, max_sz - len(data)), False)  # type: ignore[attr-defined]
+                    if not chunk:
+                        break
+                    data += chunk
+            except BrokenPipeError:
+                pass
+
+            return data
+
+        def readinto(self, handle: int, buffer: bytearray | memoryview, *, extras: dict | None = None) -> int:
+            handle, _, _ = self._h(handle)  # type: ignore[misc]
+            try:
+                data, _ = winapi.ReadFile(handle, len(buffer), False)  # type: ignore[attr-defined]
+            except BrokenPipeError:
+                return 0
+
+            buffer[: len(data)] = data
+            return len(data)
 
         def readchunk(self, handle: int, *, extras: dict | None = None) -> bytearray:
             handle, _, _ = self._h(handle)  # type: ignore[misc]
@@ -1,6 +1,7 @@
 import sys
 import threading
 import fnmatch
+import inspect
 import typing
 
 from mplugins.provider.local import provider
@@ -175,6 +176,18 @@ def CoreProviderClass(provider_cls, name) -> typing.Type[IProvider]:
     return ABCDelegationMeta(_._provider_.__name__, _.__bases__, dict(_.__dict__))  # type: ignore[return-value]
 
 
+def _interface_defaults(interface):
+    return [m for m, v in vars(interface).items() if inspect.isfunction(v) and not m.startswith("_") and m not in interface.__abstractmethods__]
+
+
+def _forward(name):
+    def method(self, *a, **kwa):
+        return getattr(self._service_, name)(*a, **kwa)
+
+    method.__name__ = name
+    return method
+
+
 def CoreServiceClass(path, serv_cls, pname):
     ServInterface = ServiceGroup[serv_cls.category].__interfaces__[serv_cls.name]
 
@@ -189,13 +202,18 @@ def CoreServiceClass(path, serv_cls, pname):
         __delegated__ = (ServInterface,)
 
         def __init__(self, *a, **kwa):
-            self.__delegate__(ServInterface, self._serv_(*a, **kwa))
+            self._service_ = self._serv_(*a, **kwa)
+            self.__delegate__(ServInterface, self._service_)
 
         @classmethod
         def eref(cls):
             return cls._eref
 
-    return ABCDelegationMeta(_._serv_.__name__, _.__bases__, dict(_.__dict__))
+    # only abstract methods are delegated, the service overrides of the interface defaults are forwarded
+    dct = dict(_.__dict__)
+    dct.update((m, _forward(m)) for m in _interface_defaults(ServInterface))
+
+    return ABCDelegationMeta(_._serv_.__name__, _.__bases__, dct)
 
 
 class CoreProvider(IProvider):
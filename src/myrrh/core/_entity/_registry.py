@@ -2,7 +2,6 @@ import functools
 import threading
 import warnings
 import weakref
-import pydantic
 
 from ..interfaces import IRegistry
 from ..services import cfg_init
@@ -12,6 +11,16 @@ from ...warehouse.item import NoneItem
 from ...warehouse.registry import ItemRegistry
 
 
+class _Flight:
+    """
+    item load shared by the concurrent readers of a missing item
+    """
+
+    def __init__(self):
+        self.ident = threading.get_ident()
+        self.event = threading.Event()
+
+
 class Registry(IRegistry):
     __eid__: dict[str, weakref.WeakSet] = dict()
     _item_updaters: dict[str, list[provider.IProvider]]
@@ -20,6 +29,7 @@ class Registry(IRegistry):
         super().__init__()
 
         self.lock = threading.RLock()
+        self._flights: dict[str, _Flight] = dict()
         self._item_updaters = dict()
         self._predefined_items = {item.type_: item for item in items}
 
@@ -46,26 +56,58 @@ class Registry(IRegistry):
         raise AttributeError(name)
 
     def __getitem__(self, name):
-        with self.lock:
-            name, _, next = name.partition(".")
-            item = super().get(name, NoneItem)
-            if not item:
-                updaters = self._item_updaters.get(name) or list()
-                for p in updaters:
-                    try:
-                        self.append(p.deliver(name))
-                    except Exception as e:
-                        warnings.warn(
-                            'a provider failed to provide a required item "%s" : %s' % (name, e),
-                            UserWarning,
-                        )
+        name, _, next = name.partition(".")
+
+        # present items are read without lock
+        item = super().get(name, NoneItem)
+        if not item:
+            item = self._load(name)
+
+        if next:
+            item = item.__getitem__(next)
 
-                item = super().get(name, NoneItem)
+        return item
 
-            if next:
-                item = item.__getitem__(next)
+    def _load(self, name):
+        """
+        deliver a missing item, concurrent readers of the same item wait for a single delivery
+        """
+        with self.lock:
+            item = super().get(name, NoneItem)
+            if item:
+                return item
+
+            flight = self._flights.get(name)
+            if flight is None:
+                flight = self._flights[name] = _Flight()
+                leader = True
+            elif flight.ident == threading.get_ident():
+                # item read by its own delivery
+                return item
+            else:
+                leader = False
+
+        if not leader:
+            flight.event.wait()
+            return super().get(name, NoneItem)
 
-            return item
+        try:
+            for p in self._item_updaters.get(name) or list():
+                try:
+                    item = p.deliver(name)
+                    with self.lock:
+                        self.append(item)
+                except Exception as e:
+                    warnings.warn(
+                        'a provider failed to provide a required item "%s" : %s' % (name, e),
+                        UserWarning,
+                    )
+        finally:
+            with self.lock:
+                del self._flights[name]
+            flight.event.set()
+
+        return super().get(name, NoneItem)
 
     def predefined(self):
         return list(self._predefined_items.values())
@@ -84,7 +126,7 @@ class Registry(IRegistry):
             return
 
         if isinstance(item, dict):
-            item = pydantic.TypeAdapter(ItemRegistry().WarehouseItemT).validate_python(item)
+            item = ItemRegistry().warehouse_model_validate(item)
 
         try:
             cur_item = super().__getitem__(item.type_)
@@ -99,16 +141,11 @@ class Registry(IRegistry):
             mode = "replace"
 
         if mode == "update":
-            dump = cur_item.model_dump()
-            dump.update(item.model_dump(exclude_unset=True))
-            self[item.type_] = item.model_validate(dump)
+            self[item.type_] = self._merge(cur_item, item, type(item))
             return
 
         if mode == "keep":
-            dump = item.model_dump()
-            dump.update(cur_item.model_dump(exclude_unset=True))
-            self[item.type_] = item.model_validate(dump)
-
+            self[item.type_] = self._merge(item, cur_item, type(item))
             return
 
         if mode == "replace":
@@ -117,6 +154,21 @@ class Registry(IRegistry):
 
         raise ValueError("invalid mode argument, must be one of 'replace', 'preserve' or 'force' , not %s" % mode)
 
+    @staticmethod
+    def _merge(item, update, item_cls):
+        """
+        return an item_cls item, copy of item updated with the fields set in update
+        """
+        if not type(item) is type(update) is item_cls:
+            dump = item.model_dump()
+            dump.update(update.model_dump(exclude_unset=True))
+            return item_cls.model_validate(dump)
+
+        # both items are already validated
+        values = dict(item)
+        values.update((name, getattr(update, name)) for name in update.model_fields_set)
+        return ItemRegistry().warehouse_model_construct(values, item_cls)
+
     @functools.cached_property
     def eid(self):
         name = str(self.id.id)
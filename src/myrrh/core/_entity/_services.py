@@ -1,3 +1,4 @@
+from ...provider import EnvDelta
 from ..interfaces import (
     ABCDelegation,
     ICoreFileSystemService,
@@ -14,10 +15,10 @@ class FileSystemService(ICoreFileSystemService, ABCDelegation):
     def __init__(self, ifs):
         self.__delegate__(ICoreFileSystemService, ifs)
 
-    def list(self, path: bytes, *, extras: dict | None = None) -> list[bytes]:
+    def list(self, path: bytes, fields: int = 0, cursor: int | None = None, limit: int = 0, *, extras: dict | None = None) -> tuple[list[dict], int | None]:
         assert isinstance(path, bytes), f"path argument must be of type bytes not {path.__class__.__name__}"
 
-        return self._delegate_.list(path, extras=extras)
+        return self._delegate_.list(path, fields, cursor, limit, extras=extras)
 
     def stat(self, path: bytes, *, extras: dict | None = None) -> dict:
         assert isinstance(path, bytes), f"path argument must be of type bytes not {path.__class__.__name__}"
@@ -57,6 +58,10 @@ def _assert_env(env):
                 False,
                 "invalid env type detected, env must be of type dict not %s" % (env.__class__.__name__),
             )
+        if isinstance(env, EnvDelta):
+            # the base is the runtime environment, only the changes come from the caller
+            env = {k: b"" if v is None else v for k, v in env.changes.items()}
+
         for k, v in env.items():
             if not isinstance(k, bytes):
                 return (
@@ -165,6 +170,11 @@ class StreamService(ICoreStreamService, ABCDelegation):
 
         return self._delegate_.open_process(path, wiring, args, working_dir, env, extras=extras)
 
+    def readinto(self, handle: int, buffer: bytearray | memoryview, *, extras: dict | None = None) -> int:
+        assert isinstance(buffer, (bytearray, memoryview)), f"buffer argument must be of type bytearray or memoryview not {buffer.__class__.__name__}"
+
+        return self._delegate_.readinto(handle, buffer, extras=extras)
+
     def write(self, handle: int, data: bytes, *, extras: dict | None = None):
         assert isinstance(data, (bytes, bytearray)), f"data argument must be of type bytes not {data.__class__.__name__}"
 
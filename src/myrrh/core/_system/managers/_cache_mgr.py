@@ -15,11 +15,39 @@ class Acquiring(Exception):
 
 
 class RuntimeCache(dict):
+    """
+    Runtime values of a system.
+
+    The values of the set runtime properties are also published in an immutable snapshot,
+    name -> (value, deadline), read without locking. Writers replace the whole snapshot under the lock.
+    """
+
     def __init__(self):
         super().__init__(_runtime_cache)
+        object.__setattr__(self, "__snapshot__", dict())
         self.__lock__ = threading.RLock()
         self.__status__ = _new_runtime_status()
 
+    def _publish(self, name, value, deadline):
+        with self.__lock__:
+            snapshot = dict(self.__snapshot__)
+            snapshot[name] = (value, deadline)
+            object.__setattr__(self, "__snapshot__", snapshot)
+
+    def _withdraw(self, name):
+        with self.__lock__:
+            if name in self.__snapshot__:
+                snapshot = dict(self.__snapshot__)
+                del snapshot[name]
+                object.__setattr__(self, "__snapshot__", snapshot)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        # a value written directly is no longer the published one
+        entry = self.__snapshot__.get(key)
+        if entry is None or entry[0] is not value:
+            self._withdraw(key)
+
     @contextlib.contextmanager
     def attr(self, attr, default=None):
         with self.__lock__:
@@ -52,7 +80,8 @@ def init_cache(cache, system):
                 cache[k] = system.cfg[cfg_path]
 
             if d["init_at_creation_time"]:
-                cache[k] = d["property"].get(system, cache)
+                # stored and published by the property itself
+                d["property"].get(system, cache)
 
     system.__m_runtime_cache__ = cache
 
@@ -83,29 +112,42 @@ class _RuntimeProperty:
         self.property_name = name
 
     def get(self, instance, cache):
-        # optim?
-        status = cache.__status__[self.name]
-        if not (status["validity"] == -1 and status["state"] == self.SET):
-            with cache.__lock__:
-                if status["state"] == self.ACQ:
-                    raise Acquiring
+        entry = cache.__snapshot__.get(self.name)
+        if entry is not None:
+            value, deadline = entry
+            if deadline is None or time.monotonic() < deadline:
+                return value
 
-                isvalid = status["state"] == self.SET and (status["validity"] == -1 or (time.monotonic() > (status["date"] + status["validity"])))
+        with cache.__lock__:
+            status = cache.__status__[self.name]
+            if status["state"] == self.ACQ:
+                raise Acquiring
+
+            if status["state"] == self.SET and (status["deadline"] is None or time.monotonic() < status["deadline"]):
+                return cache[self.name]
 
-                if isvalid:
-                    return cache[self.name]
+            state = status["state"]
+            status["state"] = self.ACQ
 
-                status["state"] = self.ACQ
+            try:
+                value = self.func(instance)
+            except BaseException:
+                status["state"] = state
+                raise
 
-                self.set(instance, cache, self.func(instance))
+            self.set(instance, cache, value)
 
-        return cache[self.name]
+        return value
 
     def set(self, instance, cache, value):
         with cache.__lock__:
-            cache[self.name] = value
-            cache.__status__[self.name]["date"] = time.monotonic()
-            cache.__status__[self.name]["state"] = self.SET
+            status = cache.__status__[self.name]
+            status["date"] = time.monotonic()
+            status["deadline"] = None if status["validity"] == -1 else status["date"] + status["validity"]
+            status["state"] = self.SET
+
+            dict.__setitem__(cache, self.name, value)
+            cache._publish(self.name, value, status["deadline"])
 
     def __get__(self, instance, owner=None):
         if instance is None:
@@ -124,8 +166,10 @@ class _RuntimeProperty:
             msg = f"No '__dict__' attribute on {type(instance).__name__!r} " f"instance to cache {self.name!r} property."
             raise TypeError(msg) from None
 
-        with self._runtime_cache__.__lock_:
-            instance.__m_runtime_cache__.pop(self.name, None)
+        cache = instance.__m_runtime_cache__
+        with cache.__lock__:
+            cache._withdraw(self.name)
+            cache.__status__[self.name]["state"] = self.UNSET
 
 
 def runtime_cached_property(
@@ -149,6 +193,7 @@ def runtime_cached_property(
             "init_at_creation_time": init_at_creation_time,
             "init_cfg_path": init_cfg_path,
             "date": 0,
+            "deadline": None,
             "validity": validity,
             "property": _RuntimeProperty(func, name),
         }
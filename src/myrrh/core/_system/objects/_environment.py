@@ -41,6 +41,7 @@ class MyrrhEnviron:
 
     def __init__(self, env, *, conv=None, keyformat=None, filter=[]):
         self.__env = env
+        self.__version = 0
 
         self._conv = conv or (lambda k: k)
         self._kfmt = (lambda k: self._conv(keyformat(k))) if keyformat else conv
@@ -58,10 +59,18 @@ class MyrrhEnviron:
     def _filter(self):
         return self.__filter
 
+    @property
+    def version(self):
+        """
+        changes count, including the ones of the wrapped environment
+        """
+        return self.__version + getattr(self.__env, "version", 0)
+
     def __eq__(self, environ):
         return {k: v for k, v in self.items()} == {self._kfmt(k): self._conv(v) for k, v in environ.items()}
 
     def __setitem__(self, key, value):
+        self.__version += 1
         self._env[self._kfmt(key)] = value
 
     def __getitem__(self, key):
@@ -71,6 +80,7 @@ class MyrrhEnviron:
             raise KeyError(key) from None
 
     def __delitem__(self, key):
+        self.__version += 1
         try:
             del self._env[self._kfmt(key)]
         except KeyError:
@@ -89,6 +99,7 @@ class MyrrhEnviron:
         return self._env.__str__()
 
     def clear(self):
+        self.__version += 1
         self._env.clear()
 
     def copy(self):
@@ -110,6 +121,8 @@ class MyrrhEnviron:
         if len(kwargs) > 1 or len(args) > 1:
             raise ValueError("pop is called with too many arguments")
 
+        self.__version += 1
+
         try:
             default = args[0] if len(args) > 0 else kwargs.pop("default")
             return self._conv(self._env.pop(self._kfmt(key), self._conv(default)))
@@ -117,13 +130,16 @@ class MyrrhEnviron:
             return self._conv(self._env.pop(self._kfmt(key)))
 
     def popitem(self):
+        self.__version += 1
         k, v = self._env.popitem()
         return self._conv(k), self._conv(v)
 
     def setdefault(self, key, default=None):
+        self.__version += 1
         return self._conv(self._env.setdefault(self._kfmt(key), self._conv(default)))
 
     def update(self, other={}, **kwargs):
         kwargs.update(other)
+        self.__version += 1
         for k, v in kwargs.items():
             self._env.update({self._kfmt(k): self._conv(v)})
@@ -1,8 +1,11 @@
+import errno
 import os
 import sys
 import threading
 import typing
 
+from myrrh.utils import mcodec
+
 from myrrh.core.interfaces import ICoreStreamService
 
 from ...interfaces import (
@@ -17,13 +20,14 @@ from ...interfaces import (
     ABCDelegation,
 )
 
-from ....provider import Whence, StatField
+from ....provider import Whence, StatField, Wiring
 
 from ._objects import RuntimeObject
 from ._pipe import _Lock, Buffer
 
 __all__ = (
     "FileStream",
+    "CodecFileStream",
     "FileInStreamAsync",
     "FileOutStreamAsync",
     "FileInOutStream",
@@ -62,6 +66,9 @@ class FileStream(RuntimeObject, IFileInOutStream):
             return self.service.readall(self.ehandle, extras=extras)
         return self.service.read(self.ehandle, nbytes, extras=extras)
 
+    def readinto(self, buffer: bytearray | memoryview, *, extras: dict[str, typing.Any] | None = None) -> int:
+        return self.service.readinto(self.ehandle, buffer, extras=extras)
+
     def write(self, data: bytes, *, extras: dict[str, typing.Any] | None = None):
         return self.service.write(self.ehandle, data, extras=extras)
 
@@ -107,6 +114,62 @@ class FileStream(RuntimeObject, IFileInOutStream):
         return Stat(**self.service.stat(self.ehandle, fields=StatField.FILE.value))
 
 
+class _RawFileStream:
+    def __init__(self, stream: FileStream):
+        self.stream = stream
+
+    def read(self, nbytes):
+        return FileStream.read(self.stream, nbytes)
+
+    def write(self, data):
+        return FileStream.write(self.stream, data)
+
+    def close(self):
+        FileStream.close(self.stream)
+
+
+class CodecFileStream(FileStream):
+    """
+    file stream transferred compressed: the service encodes what is read and decodes what is written
+    """
+
+    CHUNK_SIZE = mcodec.CHUNK_SIZE
+
+    def __init__(self, handle: int, path: bytes, name: bytes, service: ICoreStreamService, codec: str, wiring: Wiring):
+        super().__init__(handle, path, name, service)
+        self.codec = codec
+
+        raw = _RawFileStream(self)
+        self._codec = mcodec.writer(raw, codec) if wiring & Wiring.OUT else mcodec.reader(raw, codec, chunk_size=self.CHUNK_SIZE)
+
+    def read(self, nbytes: int | None = 0, *, extras: dict[str, typing.Any] | None = None) -> bytearray:
+        if nbytes is None:
+            nbytes = self.CHUNK_SIZE
+        elif nbytes == 0:
+            nbytes = -1
+
+        return bytearray(self._codec.read(nbytes))
+
+    def readinto(self, buffer: bytearray | memoryview, *, extras: dict[str, typing.Any] | None = None) -> int:
+        return self._codec.readinto(buffer)
+
+    def write(self, data: bytes, *, extras: dict[str, typing.Any] | None = None):
+        return self._codec.write(data)
+
+    def close(self, *, extras: dict[str, typing.Any] | None = None) -> None:
+        if not self.closed:
+            try:
+                self._codec.close()
+            finally:
+                RuntimeObject.close(self)
+
+    def seek(self, pos: int, whence: int = os.SEEK_SET, *, extras: dict[str, typing.Any] | None = None) -> int:
+        raise OSError(errno.ESPIPE, os.strerror(errno.ESPIPE))
+
+    def truncate(self, length: int, *, extras: dict[str, typing.Any] | None = None) -> None:
+        raise OSError(errno.ESPIPE, os.strerror(errno.ESPIPE))
+
+
 class FileInStream(IFileInStream, ABCDelegation):
     __delegated__ = (IFileInStream, IRuntimeObject)
 
@@ -369,6 +432,12 @@ class FileInStreamAsync(PipeInStreamAsync, IFileInStream, ABCDelegation):
 
         return data
 
+    def readinto(self, buffer: bytearray | memoryview, *, extras: dict[str, typing.Any] | None = None) -> int:
+        data = self.read(len(buffer), extras=extras)
+        buffer[: len(data)] = data
+
+        return len(data)
+
 
 class FileOutStreamAsync(PipeOutStreamAsync, IFileOutStream, ABCDelegation):
     __delegated__ = (IFileOutStream,)
@@ -1,5 +1,6 @@
 import functools
 import importlib.util
+import re
 import warnings
 
 from abc import ABC, abstractmethod
@@ -14,7 +15,7 @@ from ...interfaces import (
     ICoreStreamService,
     ABCDelegation,
 )
-from ....provider import Protocol
+from ....provider import Protocol, EnvDelta
 
 from ..objects import MyrrhEnviron
 from ..managers import RuntimeCache, init_cache, runtime_cached_property, Acquiring
@@ -40,7 +41,34 @@ def _validate_exe_args_values(command, working_dir, env):
         raise ValueError("Invalid \\x00 not allowed in working directory")
 
 
+class _CmdTemplate:
+    """
+    cmdb template with the binaries placeholders resolved, only the call arguments are left to substitute
+    """
+
+    PLACEHOLDER = re.compile(rb"%(?:%|\(([^)]*)\)s)")
+
+    def __init__(self, cmdline, binb):
+        def resolve(m):
+            name = m.group(1)
+            if name is not None and name in binb:
+                return binb[name].replace(b"%", b"%%")
+            return m.group(0)
+
+        self.binb = binb
+        self.template = self.PLACEHOLDER.sub(resolve, cmdline)
+        self.static = self.template % () if b"%" not in self.template.replace(b"%%", b"") else None
+
+    def format(self, kwargs):
+        if self.static is not None:
+            return self.static
+
+        return self.template % kwargs
+
+
 class AbcMyrrhOs(IMyrrhOs, ABCDelegation):
+    CMD_TEMPLATES_SIZE = 1024
+
     @property
     @abstractmethod
     def _curdirb_(self):
@@ -237,11 +265,27 @@ class AbcMyrrhOs(IMyrrhOs, ABCDelegation):
         out, err, rval = self.cmdb(cmdline, **kwargs)
         return self.shdecode(out), self.shdecode(err), rval
 
+    @functools.cached_property
+    def _cmd_templates(self):
+        return dict()
+
+    def _cmd_template(self, cmdline):
+        binb = self.getbinb
+        template = self._cmd_templates.get(cmdline)
+
+        # compiled again when the binaries are updated
+        if template is None or template.binb is not binb:
+            if len(self._cmd_templates) >= self.CMD_TEMPLATES_SIZE:
+                self._cmd_templates.clear()
+
+            template = self._cmd_templates[cmdline] = _CmdTemplate(cmdline, binb)
+
+        return template
+
     def cmdb(self, cmdline, **kwargs):
         try:
             kwargs = {k.encode(): v for k, v in kwargs.items()}
-            kwargs.update(self.getbinb)
-            cmdline = cmdline % kwargs
+            cmdline = self._cmd_template(cmdline).format(kwargs)
         except KeyError as k:
             if not self.getbinb:
                 raise OSError("Usable binaries list is empty, provider connection too long or failure?")
@@ -316,6 +360,47 @@ class AbcMyrrhOs(IMyrrhOs, ABCDelegation):
     def getpath(self, path=None):
         return self.fsdecode(self.getpathb(self.fsencode(path)))
 
+    _base_envb: tuple | None = None
+
+    def getbaseenvb(self):
+        """
+        runtime environment without the read only variables, the same EnvDelta base is returned while the environment is unchanged
+        """
+        envb = self.envb
+        if envb is None:
+            return None
+
+        version = getattr(envb, "version", None)
+        base = self._base_envb
+
+        if base is None or base[0] is not envb or base[1] != version or version is None:
+            env = dict(envb)
+            for k in self.rdenvb:
+                env.pop(k, None)
+
+            base = self._base_envb = (envb, version, EnvDelta(env))
+
+        return base[2]
+
+    def getenvdeltab(self, env=None):
+        """
+        env as changes to the base environment, a None value unsets the variable, the base itself when env is None
+        """
+        base = self.getbaseenvb()
+        if env is None:
+            return base
+
+        env = dict(self.getenvb(env))
+        for k in self.rdenvb:
+            env.pop(k, None)
+
+        if base is None:
+            return env
+
+        changes: dict[bytes, bytes | None] = {k: v for k, v in env.items() if base.base.get(k) != v}
+        changes.update((k, None) for k in base.base if k not in env)
+        return base.derive(changes)
+
     def getenv(self):
         return MyrrhEnviron(self.getenvb(), conv=self.fsdecode, keyformat=self.environkeyformat)
 
@@ -367,13 +452,8 @@ class _RuntimeShell(ICoreShellService, ICoreService, ABCDelegation):
         self._runtime = runtime
 
     def _getenv(self, env):
-        env = self._runtime.getenvb(env)
-        if env is None:
-            return
-        env = dict(env)
-        for k in self._runtime.rdenvb:
-            env.pop(k, None)
-        return dict(env)  # need to be a dict
+        # only the base key and the changes travel when the provider keeps the base
+        return self._runtime.getenvdeltab(env)
 
     def execute(self, command, working_dir=None, env=None, *, extras=None):
         _validate_exe_args_values(command, working_dir, env)
@@ -424,8 +504,8 @@ class _RuntimeFs(ICoreFileSystemService, ICoreService, ABCDelegation):
     def exist(self, path, *, extras=None):
         return self._delegate_.exist(self._runtime.getpathb(path), extras=extras)
 
-    def list(self, path, *, extras=None):
-        return self._delegate_.list(self._runtime.getpathb(path), extras=extras)
+    def list(self, path, fields=0, cursor=None, limit=0, *, extras=None):
+        return self._delegate_.list(self._runtime.getpathb(path), fields, cursor, limit, extras=extras)
 
     def stat(self, path, *, extras=None):
         return self._delegate_.stat(self._runtime.getpathb(path), extras=extras)
@@ -451,12 +531,13 @@ class _RuntimeStream(ICoreStreamService, ABCDelegation):
         *,
         extras: dict | None = None,
     ) -> tuple[bytes, int, int, int, int]:
+        # no env leaves the process environment to the provider
         return self._delegate_.open_process(
             self._runtime.getpathb(path),
             wiring=wiring,
             args=args,
             working_dir=working_dir,
-            env=env,
+            env=None if env is None else self._runtime.getenvdeltab(env),
             extras=extras,
         )
 
@@ -1,9 +1,14 @@
 # flake8: noqa: E722
+import collections
+import os
+import stat
 import sys
 import typing
 
 from io import BytesIO
 
+from myrrh.utils import mcodec
+
 from ..managers import runtime_cached_property
 from ..managers import RuntimeTaskManager, RuntimeObjectManager
 
@@ -12,6 +17,7 @@ from ....provider import Wiring
 
 from ..objects import (
     FileStream,
+    CodecFileStream,
     FileInOutStream,
     FileInStreamAsync,
     FileOutStreamAsync,
@@ -38,12 +44,19 @@ class RuntimeSyscall:
     POOL_SIZE = cfg_init("system_max_concurren_tasks", 10, section="myrrh.core.services.system")
     IDLE_TIMEOUT = cfg_init("runtime_task_idle_timeout", 0.01, section="myrrh.core.services.system")
     CHUNK_SIZE = cfg_init("runtime_stream_chunk_size", 65535, section="myrrh.core.services.system")
+    CODECS = cfg_init("runtime_stream_codecs", ["zlib", "lzma"], section="myrrh.core.services.system")
+    CODEC_MIN_SIZE = cfg_init("runtime_stream_codec_min_size", 1024 * 64, section="myrrh.core.services.system")
+    CODEC_MAX_ENTROPY = cfg_init("runtime_stream_codec_max_entropy", 7.5, section="myrrh.core.services.system")
+    CODEC_SAMPLE_SIZE = 4096
+    CODEC_SAMPLES_MAX = 64
 
     Wiring = _Wiring
     Protocol = _Protocol
 
     def __init__(self, myrrh_os: IMyrrhOs):
         self.myrrh_os = myrrh_os
+        self._codecs: dict[str, tuple[str, ...]] = dict()
+        self._samples: collections.OrderedDict[tuple, bytes] = collections.OrderedDict()
 
     @runtime_cached_property("fds", init_at_creation_time=True)
     def objects(self) -> RuntimeObjectManager:
@@ -98,17 +111,31 @@ class RuntimeSyscall:
         path = self.myrrh_os.p(path)
         stream = self.myrrh_os.Stream(protocol)
 
+        codec = extras and extras.get("codec")
+        if codec and wiring & self.Wiring.INOUT == self.Wiring.INOUT:
+            raise ValueError("codec streams are either read or written")
+
         path, handle = stream.open_file(path, wiring.value, extras=extras)
 
         filestream = None
 
         try:
-            filestream = FileStream(
-                handle,
-                self.myrrh_os.dirname(path),
-                self.myrrh_os.basename(path),
-                self.myrrh_os.stream,
-            )
+            if codec:
+                filestream = CodecFileStream(
+                    handle,
+                    self.myrrh_os.dirname(path),
+                    self.myrrh_os.basename(path),
+                    self.myrrh_os.stream,
+                    codec,
+                    wiring,
+                )
+            else:
+                filestream = FileStream(
+                    handle,
+                    self.myrrh_os.dirname(path),
+                    self.myrrh_os.basename(path),
+                    self.myrrh_os.stream,
+                )
 
             StreamCls = (FileInStream, FileOutStream) if use_async else (FileInStreamAsync, FileOutStreamAsync)
 
@@ -197,6 +224,35 @@ class RuntimeSyscall:
 
         return hproc
 
+    def codecs(self, protocol: _Protocol | str | None = None) -> tuple[str, ...]:
+        """
+        codecs offered by the stream service, in preference order
+        """
+        try:
+            return self._codecs[str(protocol)]
+        except KeyError:
+            pass
+
+        offered = self.myrrh_os.Stream(protocol).codecs()
+        codecs = self._codecs[str(protocol)] = tuple(c for c in self.CODECS if c in offered and c in mcodec.CODECS)
+        return codecs
+
+    def _stream_extras(self, extras, protocol, size, sample=None):
+        if extras and "codec" in extras:
+            return extras
+
+        codecs = self.codecs(protocol)
+        if not codecs:
+            return extras
+
+        if size is not None and size < self.CODEC_MIN_SIZE:
+            return extras
+
+        if sample is not None and mcodec.entropy(sample) > self.CODEC_MAX_ENTROPY:
+            return extras
+
+        return {**(extras or {}), "codec": codecs[0]}
+
     def stream_in(
         self,
         file_path: bytes,
@@ -205,17 +261,48 @@ class RuntimeSyscall:
         extras: dict | None = None,
         protocol: _Protocol | str | None = None,
     ):
-        fd = self.open_file(file_path, wiring=Wiring.IN, extras=extras, protocol=protocol)
         chunk_size = self.CHUNK_SIZE
         if extras:
             chunk_size = extras.get("chunk_size", chunk_size)
 
+        buf = memoryview(bytearray(chunk_size))
+        key = None
+
+        # the content is remote, only a regular file of some size is worth compressing, and its entropy
+        # is sampled from the last download of a file of the same kind
+        if not (extras and "codec" in extras) and self.codecs(protocol):
+            try:
+                st = self.myrrh_os.fs.stat(self.myrrh_os.p(file_path))
+            except OSError:
+                st = None
+
+            if st is not None and stat.S_ISREG(st["st_mode"]):
+                key = (str(protocol), os.path.splitext(self.myrrh_os.basename(file_path))[1].lower())
+                extras = self._stream_extras(extras, protocol, st["st_size"], self._samples.get(key))
+
+        fd = self.open_file(file_path, wiring=Wiring.IN, extras=extras, protocol=protocol)
+
         with self.gethandle(fd) as handle:
-            while buf := handle.read(chunk_size):
-                sz = 0
-                ln = len(buf)
-                while sz < ln:
-                    sz += stream.write(buf[sz:])
+            ln = handle.readinto(buf)
+            if key is not None and ln:
+                self._sample(key, buf[: min(ln, self.CODEC_SAMPLE_SIZE)])
+
+            while ln:
+                self._write_all(stream, buf[:ln])
+                ln = handle.readinto(buf)
+
+    def _sample(self, key, data):
+        self._samples[key] = bytes(data)
+        self._samples.move_to_end(key)
+
+        while len(self._samples) > self.CODEC_SAMPLES_MAX:
+            self._samples.popitem(last=False)
+
+    @staticmethod
+    def _write_all(stream, data):
+        sz = 0
+        while sz < len(data):
+            sz += stream.write(data[sz:])
 
     def stream_out(
         self,
@@ -225,22 +312,28 @@ class RuntimeSyscall:
         extras: dict | None = None,
         protocol: _Protocol | str | None = None,
     ):
+        chunk_size = self.CHUNK_SIZE
+        if extras:
+            chunk_size = extras.get("chunk_size", chunk_size)
+
+        # the first chunk samples the content, a short one is the whole content
+        buf = stream.read(chunk_size)
+        extras = self._stream_extras(extras, protocol, len(buf) if len(buf) < chunk_size else None, buf)
+
         fd = self.open_file(
             file_path,
             wiring=Wiring.OUT | Wiring.CREATE | Wiring.RESET,
             extras=extras,
             protocol=protocol,
         )
-        chunk_size = self.CHUNK_SIZE
-        if extras:
-            chunk_size = extras.get("chunk_size", chunk_size)
 
         with self.gethandle(fd) as handle:
-            while buf := stream.read(chunk_size):
+            while buf:
                 sz = 0
                 ln = len(buf)
                 while sz < ln:
                     sz += handle.write(buf[sz:])
+                buf = stream.read(chunk_size)
 
     def gethandle(self, hint: int, detach=False) -> MHandle:
         handle = self.objects.gethandle(hint)
@@ -43,10 +43,24 @@ class ICoreService(IService):
 class ICoreStreamService(IStreamService, ICoreService):
     __delegate_all__ = (IStreamService, ICoreService)
 
+    # the provider defaults are delegated as well, only abstract methods are
+    @abc.abstractmethod
+    def readinto(self, handle: int, buffer: bytearray | memoryview, *, extras: dict | None = None) -> int:
+        ...
+
+    @abc.abstractmethod
+    def codecs(self, *, extras: dict | None = None) -> tuple[str, ...]:
+        ...
+
 
 class ICoreFileSystemService(IFileSystemService, ICoreService):
     __delegate_all__ = (IFileSystemService, ICoreService)
 
+    # the provider defaults are delegated as well, only abstract methods are
+    @abc.abstractmethod
+    def close_cursor(self, cursor: int, *, extras: dict | None = None) -> None:
+        ...
+
 
 class ICoreShellService(IShellService, ICoreService):
     __delegate_all__ = (IShellService, ICoreService)
@@ -386,6 +386,10 @@ class IFileInStream(IInStream):
     def seek(self, nbytes: int, *, extras: dict[str, typing.Any] | None = None) -> int:
         ...
 
+    @abc.abstractmethod
+    def readinto(self, buffer: bytearray | memoryview, *, extras: dict[str, typing.Any] | None = None) -> int:
+        ...
+
 
 class IFileOutStream(IOutStream):
     @abc.abstractmethod
@@ -0,0 +1,154 @@
+"""
+**Process pool offload**
+
+Pure python work on a large payload, such as parsing the output of a command, holds the GIL and
+serializes the threads of the runtimes and groups running it. run and submit execute it in a pool of
+processes once the payload reaches offload_threshold bytes, the payload is then handed over in shared
+memory, smaller ones are processed in the calling thread.
+
+fn is called with a memoryview on the payload, it must be importable by the workers and must not keep
+the view. The stdlib codecs and hashlib release the GIL on large buffers, they gain nothing here.
+
+The pool is disabled by default. Workers are spawned, a script using it must guard its main code with
+if __name__ == "__main__".
+
+    from myrrh.core.services import offload
+
+    entries = offload.run(parse_listing, out)
+
+-----------------
+"""
+import multiprocessing
+import os
+import threading
+import typing
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+from . import cfg_init
+
+__all__ = ("run", "submit", "shutdown", "MAX_WORKERS", "THRESHOLD")
+
+# None uses every core, 0 disables the pool
+MAX_WORKERS = cfg_init("offload_max_workers", 0, section="myrrh.core.services.offload")
+THRESHOLD = cfg_init("offload_threshold", 1024 * 1024, section="myrrh.core.services.offload")
+START_METHOD = cfg_init("offload_start_method", "spawn", section="myrrh.core.services.offload")
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _executor():
+    global _pool
+
+    if _pool is not None:
+        return _pool
+
+    max_workers = (os.cpu_count() or 1) if MAX_WORKERS is None else MAX_WORKERS
+    # a worker does not offload again
+    if max_workers < 1 or multiprocessing.parent_process() is not None:
+        return None
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers, multiprocessing.get_context(START_METHOD))
+
+    return _pool
+
+
+def _call(fn, data, args, kwargs):
+    with memoryview(data) as view:
+        return fn(view, *args, **kwargs)
+
+
+def _shm_call(fn, name, size, args, kwargs):
+    shm = shared_memory.SharedMemory(name)
+    try:
+        with shm.buf[:size] as view:
+            return fn(view, *args, **kwargs)
+    finally:
+        shm.close()
+
+
+def _release(shm):
+    shm.close()
+    shm.unlink()
+
+
+def submit(fn: typing.Callable, data: bytes | bytearray | memoryview, *args, **kwargs) -> Future:
+    size = memoryview(data).nbytes
+    executor = _executor() if size >= THRESHOLD else None
+
+    if executor is None:
+        future: Future = Future()
+        try:
+            future.set_result(_call(fn, data, args, kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        shm.buf[:size] = memoryview(data).cast("B")
+    except BaseException:
+        _release(shm)
+        raise
+
+    # the shared memory is released before the result is given
+    future: Future = Future()
+    _offload(executor, future, shm, fn, size, args, kwargs, retry=True)
+    return future
+
+
+def _reset(executor):
+    global _pool
+
+    with _pool_lock:
+        if _pool is executor:
+            _pool = None
+
+    executor.shutdown(wait=False)
+
+
+def _offload(executor, future, shm, fn, size, args, kwargs, retry):
+    def done(work):
+        exc = work.exception()
+        if isinstance(exc, BrokenProcessPool):
+            _reset(executor)
+            if retry and (fresh := _executor()) is not None:
+                return _offload(fresh, future, shm, fn, size, args, kwargs, retry=False)
+
+        _release(shm)
+        if exc is None:
+            future.set_result(work.result())
+        else:
+            future.set_exception(exc)
+
+    try:
+        work = executor.submit(_shm_call, fn, shm.name, size, args, kwargs)
+    except BrokenProcessPool as e:
+        # a worker died earlier, the call is given to a fresh pool
+        work = Future()
+        work.set_exception(e)
+    except BaseException as e:
+        _release(shm)
+        future.set_exception(e)
+        return
+
+    work.add_done_callback(done)
+
+
+def run(fn: typing.Callable, data: bytes | bytearray | memoryview, *args, **kwargs) -> typing.Any:
+    return submit(fn, data, *args, **kwargs).result()
+
+
+def shutdown(wait: bool = True) -> None:
+    global _pool
+
+    with _pool_lock:
+        pool, _pool = _pool, None
+
+    if pool is not None:
+        pool.shutdown(wait=wait)
@@ -1,7 +1,7 @@
 from .._system.runtime import *  # noqa: F403,F401
 from .._system.objects import *  # noqa: F403,F401
 
-from ...provider import Whence, Wiring, Protocol  # noqa: F401
+from ...provider import Whence, Wiring, Protocol, StatField  # noqa: F401
 
 from abc import ABCMeta, ABC
 
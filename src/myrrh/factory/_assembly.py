@@ -118,7 +118,8 @@ class Assembly:
         else:
             warehouse = entity.cfg.values()
 
-        return self.__class__(supply=self.supply, warehouse=warehouse)
+        # supply and entity items are already validated
+        return self.__class__(_model=_FactoryModel.model_construct(supply=self.supply, warehouse=list(warehouse)))
 
     def get_item(self, type_: str):
         t = [item for item in filter(lambda item: item.type_ == type_, self.warehouse)]
@@ -33,16 +33,14 @@ rm -f "$path"
 exit"""
 
     def chown(self, path, user, group):
-        path = self.myrrh_os.shencode(path)
         user = self.myrrh_os.shencode(user)
         group = self.myrrh_os.shencode(group)
-        _, _, rval = self.myrrh_os.shell.execute(b"/bin/chown %s:%s %s" % (user, group, path))
-        return rval == 0
+        ((_, err),) = self.bulk("chown", [path], b"%s:%s" % (user, group))
+        return err == 0
 
     def chmod(self, mode, path):
-        path = self.myrrh_os.shencode(path)
-        _, _, rval = self.myrrh_os.shell.execute(b"/bin/chmod %o %s" % (mode, path))
-        return rval == 0
+        ((_, err),) = self.bulk("chmod", [path], mode)
+        return err == 0
 
     def _localtransfer(self, srcs, dest):
         srcs = [b"'%s'" % src for src in srcs]
@@ -75,12 +73,120 @@ exit"""
 
         ExecutionFailureCauseRVal(self, err, rval, 0).check()
 
-    def _localremove(self, srcs):
-        srcs = b" ".join((self.myrrh_os.sh_escape_bytes(s) for s in srcs))
-        _, err, rval = self.myrrh_os.cmdb(b"%(rm)s -Rf %(srcs)s", srcs=srcs)
+    BULK_COMMANDS = {
+        "rm": b'%(rm)s -Rf -- "$p"',
+        "mkdir": b'%(mkdir)s -p -- "$p"',
+        "chmod": b'%(chmod)s "$a" -- "$p"',
+        "chown": b'%(chown)s "$a" -- "$p"',
+        "touch": b'%(touch)s -- "$p"',
+    }
+
+    # paths are read from the list file, failures are reported as "path\0error\0"
+    BULK_SCRIPT = b"""%%(xargs)s -0 %%(sh)s -c 'a=$1 ; shift ; for p ; do e=$(%(command)s 2>&1) || printf "%%%%s\\0%%%%s\\0" "$p" "$e" ; done' %%(sh)s %%(arg)s < %%(path)s ; %%(rm)s -f %%(path)s"""
+
+    def _bulk(self, op, paths, arg):
+        path = self._bulk_list(paths, b"\0")
+
+        command = self.BULK_SCRIPT % {b"command": self.BULK_COMMANDS[op]}
+        out, err, rval = self.myrrh_os.cmdb(
+            command,
+            arg=self.myrrh_os.sh_escape_bytes(arg or b"-"),
+            path=self.myrrh_os.sh_escape_bytes(path),
+        )
+        ExecutionFailureCauseRVal(self, err, rval, 0).check()
+
+        out = out.split(b"\0")
+        return dict(zip(out[0::2], self.myrrh_os.default_errnos_from_msg(out[1::2])))
+
+    BATCH_HEADER = b"""\
+ok() { printf '%%s\\0\\0' "$1" ; shift ; for v ; do printf '%%s\\0' "$v" ; done ; printf '\\0' ; }
+ko() { printf '%%s\\0%%s\\0\\0' "$1" "${2:-Input/output error}" ; }
+run() { i=$1 ; shift ; e=$("$@" 2>&1 </dev/null) && ok "$i" || ko "$i" "$e" ; }"""
+
+    BATCH_COMMANDS = {
+        "stat": b"""s=$(%(stat)s -L -c '%%f:%%i:%%d:%%h:%%u:%%g:%%s:%%X:%%Y:%%Z' -- %(batch_path)s 2>&1) && ok %(batch_index)s "$s" || ko %(batch_index)s "$s\"""",
+        "exists": b"if [ -e %(batch_path)s ] ; then ok %(batch_index)s 1 ; else ok %(batch_index)s ; fi",
+        "listdir": b"""if [ -d %(batch_path)s ] && [ -r %(batch_path)s ] ; then printf '%%s\\0\\0' %(batch_index)s ; for f in %(batch_path)s/* %(batch_path)s/.[!.]* %(batch_path)s/..?* ; do { [ -e "$f" ] || [ -L "$f" ] ; } && printf '%%s\\0' "${f##*/}" ; done ; printf '\\0' ; elif [ -d %(batch_path)s ] ; then ko %(batch_index)s 'Permission denied' ; elif [ -e %(batch_path)s ] ; then ko %(batch_index)s 'Not a directory' ; else ko %(batch_index)s 'No such file or directory' ; fi""",
+        "mkdir": b"run %(batch_index)s %(mkdir)s -- %(batch_path)s",
+        "makedirs": b"if [ %(batch_arg)s = 0 ] && [ -e %(batch_path)s ] ; then ko %(batch_index)s 'File exists' ; else run %(batch_index)s %(mkdir)s -p -- %(batch_path)s ; fi",
+        "remove": b"if [ -d %(batch_path)s ] && [ ! -L %(batch_path)s ] ; then ko %(batch_index)s 'Is a directory' ; elif [ -e %(batch_path)s ] || [ -L %(batch_path)s ] ; then run %(batch_index)s %(rm)s -f -- %(batch_path)s ; else ko %(batch_index)s 'No such file or directory' ; fi",
+        "rmdir": b"run %(batch_index)s %(rmdir)s -- %(batch_path)s",
+        "rmtree": b"if [ -e %(batch_path)s ] || [ -L %(batch_path)s ] ; then run %(batch_index)s %(rm)s -Rf -- %(batch_path)s ; else ko %(batch_index)s 'No such file or directory' ; fi",
+        # mv moves a directory inside an existing one, os.rename replaces it when empty
+        "rename": b"""if [ -d %(batch_arg)s ] && [ ! -L %(batch_arg)s ] ; then if [ -d %(batch_path)s ] ; then e=$(%(rmdir)s -- %(batch_arg)s 2>&1) && run %(batch_index)s %(mv)s -f -- %(batch_path)s %(batch_arg)s || ko %(batch_index)s "$e" ; else ko %(batch_index)s 'Is a directory' ; fi ; else run %(batch_index)s %(mv)s -f -- %(batch_path)s %(batch_arg)s ; fi""",
+        "chmod": b"run %(batch_index)s %(chmod)s %(batch_arg)s -- %(batch_path)s",
+    }
+
+    def _batch(self, ops):
+        binaries = dict(self.myrrh_os.getbinb)
+        script = [self.BATCH_HEADER % binaries]
+
+        for index, (op, path, arg) in enumerate(ops):
+            script.append(
+                self.BATCH_COMMANDS[op]
+                % {
+                    **binaries,
+                    b"batch_index": b"%d" % index,
+                    b"batch_path": self.myrrh_os.sh_escape_bytes(path),
+                    b"batch_arg": self.myrrh_os.sh_escape_bytes(arg or b""),
+                }
+            )
+
+        script.append(b'%s -f -- "$0"' % binaries[b"rm"])
+
+        path = self._bulk_list(script, b"\n", b"sh")
+        out, err, rval = self.myrrh_os.cmdb(b"%(sh)s %(path)s", path=self.myrrh_os.sh_escape_bytes(path))
+        ExecutionFailureCauseRVal(self, err, rval, 0).check()
+
+        return self._batch_records(out, self.myrrh_os.default_errno_from_msg)
+
+    # readable files are reported as "path\0digest\0"
+    HASH_SCRIPT = b"""%(xargs)s -0 %(sh)s -c 'for p ; do h=$(%(hash)s < "$p" 2>/dev/null) && printf "%%s\\0%%s\\0" "$p" "${h%%%% *}" ; done' %(sh)s < %(path)s ; %(rm)s -f %(path)s"""
+
+    def _hash_files(self, paths, algo):
+        hash = self.myrrh_os.getbinb.get(b"%ssum" % algo.encode())
+        if not hash:
+            raise ValueError(f"{algo} is not available on the entity")
 
+        path = self._bulk_list(paths, b"\0")
+
+        out, err, rval = self.myrrh_os.cmdb(
+            self.HASH_SCRIPT,
+            hash=hash,
+            path=self.myrrh_os.sh_escape_bytes(path),
+        )
         ExecutionFailureCauseRVal(self, err, rval, 0).check()
 
+        out = out.split(b"\0")
+        return {p: h.decode() for p, h in zip(out[0::2], out[1::2])}
+
+    ARCHIVE_FLAGS = {None: (b"", None), "gzip": (b"z", b"gzip"), "bzip2": (b"j", b"bzip2"), "xz": (b"J", b"xz")}
+
+    def _archive(self, archive_name, root_dir, paths, compress):
+        flag, compressor = self.ARCHIVE_FLAGS[compress]
+        if b"tar" not in self.myrrh_os.getbinb or (compressor and compressor not in self.myrrh_os.getbinb):
+            return False
+
+        _, _, rval = self.myrrh_os.cmdb(
+            b"%(tar)s -c%(archive_flag)sf %(archive_name)s -C %(root_dir)s -- %(archive_paths)s",
+            archive_flag=flag,
+            archive_name=self.myrrh_os.sh_escape_bytes(archive_name),
+            root_dir=self.myrrh_os.sh_escape_bytes(root_dir),
+            archive_paths=b" ".join(self.myrrh_os.sh_escape_bytes(p) for p in paths),
+        )
+        return rval == 0
+
+    def _extract(self, archive_name, extract_dir):
+        if b"tar" not in self.myrrh_os.getbinb:
+            return False
+
+        _, _, rval = self.myrrh_os.cmdb(
+            b"%(mkdir)s -p %(extract_dir)s && %(tar)s -xf %(archive_name)s -C %(extract_dir)s",
+            archive_name=self.myrrh_os.sh_escape_bytes(archive_name),
+            extract_dir=self.myrrh_os.sh_escape_bytes(extract_dir),
+        )
+        return rval == 0
+
     def _chunk_header(self, file_descs, *, destdir=None):
         szs = (str(f[2]).encode() for f in file_descs)
         paths = (self.myrrh_os.p(f[1]) for f in file_descs)
@@ -101,13 +207,6 @@ exit"""
         )
         ExecutionFailureCauseRVal(self, e, r, 0).check()
 
-    def _mkdirs(self, dirs: list):
-        cmd = b'for d in %(dirs)s; do %(mkdir)s -p "$d"; done'
-
-        dirs: bytes = b" ".join(dirs)
-        _, e, r = self.myrrh_os.cmdb(cmd, dirs=dirs)
-        ExecutionFailureCauseRVal(self, e, r, 0).check()
-
     def _scanfiles(self, files):
         """
         return files(path, size)
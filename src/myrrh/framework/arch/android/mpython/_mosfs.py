@@ -106,32 +106,20 @@ class OsFs(AbcOsFs):
         self.rename(src, dst, *args, src_dir_fd=src_dir_fd, dst_dir_fd=dst_dir_fd)
 
     def listdir(self, path="."):
-        _cast_ = self.myrrh_os.fdcast(path)
-        _path = self.myrrh_os.f(path)
-
-        if not self.isdir(path):
-            if not self.exists(path):
-                MOsError(self, errno.ENOENT, "No such file or directory", args=(path,)).raised()
-            MOsError(self, errno.ENOTDIR, "Not a directory", args=(path,)).raised()
+        entries = self._fs_listdir(path, 0o777)
 
-        paths = self.myrrh_os.fs.list(_path)
+        if entries is None:
+            MOsError(self, errno.ENOSYS, "Function not implemented", args=(path,)).raised()
 
-        return [self.myrrh_os.basename(_cast_(f.strip())) for f, _ in paths]
+        return entries
 
     def _scandir_list(self, path="."):
-        _cast_ = self.myrrh_os.fdcast(path)
-        _path = self.myrrh_os.p(path)
-
-        files = self.myrrh_os.fs.list(_path)
+        entries = self._fs_scandir_list(path, 0o777)
 
-        result = []
-        for file, idx in files:
-            if files.readable(idx) or files.writeable(idx) or files.executable(idx):
-                fname = self.myrrh_os.basename(file)
-                fpath = self.join(_path, fname)
-                result.append(self.DirEntry(_cast_(fname), _cast_(fpath), self._stat(fpath), self.lstat))
+        if entries is None:
+            MOsError(self, errno.ENOSYS, "Function not implemented", args=(path,)).raised()
 
-        return result
+        return entries
 
     def _stat(self, path, *, dir_fd=None, follow_symlinks=True):
         _path = self.myrrh_os.f(path, dir_fd=dir_fd)
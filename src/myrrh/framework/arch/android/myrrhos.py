@@ -49,6 +49,10 @@ class MyrrhOs(AbcMyrrhOs):
             b"getprop": b"/system/bin/getprop",
             b"cp": b"/system/bin/cp",
             b"tar": b"/system/bin/tar",
+            b"gzip": b"/system/bin/gzip",
+            b"mkdir": b"/system/bin/mkdir",
+            b"rm": b"/system/bin/rm",
+            b"rmdir": b"/system/bin/rmdir",
         }
 
     def _getdefaultshellb_(self):
@@ -104,6 +108,9 @@ class MyrrhOs(AbcMyrrhOs):
 
     def default_errno_from_msg(self, err):
         err = self.shencode(err)
-        return errno.errno_from_msgb(err)
+        return errno.errno_matcher().errno(err)
+
+    def default_errnos_from_msg(self, errs):
+        return errno.errno_matcher().errnos([self.shencode(err) for err in errs])
 
     environkeyformat = None  # type: ignore[assignment]
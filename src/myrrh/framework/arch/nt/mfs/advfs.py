@@ -87,15 +87,128 @@ exit /b 0"""
 
         ExecutionFailureCauseRVal(self, err, rval, 0).check()
 
-    def _localremove(self, srcs):
-        srcs = b" ".join((b'"%s"' % self.myrrh_os.sh_escape_bytes(s) for s in srcs))
-        _, err, rval = self.myrrh_os.cmdb(
-            b"for %%f in (%(srcs)s) do if EXIST %%f\\ ( %(rmdir)s /Q /S %%f ) else del /F /Q %%f",
-            srcs=srcs,
-        )
+    BULK_COMMANDS = {
+        "rm": b"if (Test-Path -LiteralPath $p) { Remove-Item -LiteralPath $p -Recurse -Force -ErrorAction Stop }",
+        "mkdir": b"[IO.Directory]::CreateDirectory($p) | Out-Null",
+        "touch": b"if (Test-Path -LiteralPath $p) { (Get-Item -LiteralPath $p -Force).LastWriteTime = Get-Date } else { [IO.File]::Create($p).Close() }",
+    }
+
+    # paths are read from the list file, failures are reported as "index;error"
+    BULK_SCRIPT = b"""$i=0 ; Get-Content -LiteralPath '%%(path)s' -Encoding UTF8 | ForEach-Object { $p=$_ ; try { %(command)s } catch { [Console]::Out.WriteLine([string]$i + ';' + $_.Exception.Message) } ; $i++ } ; Remove-Item -LiteralPath '%%(path)s' -Force"""
+
+    def _bulk(self, op, paths, arg):
+        # no access rights nor owners to change
+        if op not in self.BULK_COMMANDS:
+            return {}
 
+        path = self._bulk_list((self.myrrh_os.fsdecode(p).encode("utf-8") for p in paths), b"\r\n")
+
+        command = self.BULK_SCRIPT % {b"command": self.BULK_COMMANDS[op]}
+        out, err, rval = self.myrrh_os.cmdb(b'%(powershell)s -NoProfile -Command "' + command + b'"', path=path)
         ExecutionFailureCauseRVal(self, err, rval, 0).check()
 
+        failures = {}
+        for line in out.splitlines():
+            index, _, msg = line.partition(b";")
+            if index.isdigit() and int(index) < len(paths):
+                failures[paths[int(index)]] = self.myrrh_os.error_translate(msg)
+
+        return failures
+
+    BATCH_HEADER = b"""\
+[Console]::OutputEncoding = New-Object Text.UTF8Encoding $false
+function ok($i) { $o = "$i`0`0" ; foreach ($v in $args) { $o += "$v`0" } ; [Console]::Out.Write($o + "`0") }
+function ko($i, $m) { if (-not $m) { $m = 'Input/output error' } ; [Console]::Out.Write("$i`0$m`0`0") }
+function run($i, $b) { try { & $b | Out-Null ; ok $i } catch { ko $i $_.Exception.Message } }"""
+
+    BATCH_COMMANDS = {
+        "stat": b"""if (Test-Path -LiteralPath %(batch_path)s) { $f = Get-Item -LiteralPath %(batch_path)s -Force ; $m = if ($f.PSIsContainer) { 0x41ff } else { 0x81b6 } ; $s = if ($f.PSIsContainer) { 0 } else { $f.Length } ; ok %(batch_index)s ('{0:x}:0:0:1:0:0:{1}:{2}:{3}:{4}' -f $m, $s, ([DateTimeOffset]$f.LastAccessTimeUtc).ToUnixTimeSeconds(), ([DateTimeOffset]$f.LastWriteTimeUtc).ToUnixTimeSeconds(), ([DateTimeOffset]$f.CreationTimeUtc).ToUnixTimeSeconds()) } else { ko %(batch_index)s 'No such file or directory' }""",
+        "exists": b"if (Test-Path -LiteralPath %(batch_path)s) { ok %(batch_index)s 1 } else { ok %(batch_index)s }",
+        "listdir": b"if (Test-Path -LiteralPath %(batch_path)s -PathType Container) { $n = @(Get-ChildItem -LiteralPath %(batch_path)s -Force -Name) ; ok %(batch_index)s @n } elseif (Test-Path -LiteralPath %(batch_path)s) { ko %(batch_index)s 'Not a directory' } else { ko %(batch_index)s 'No such file or directory' }",
+        "mkdir": b"$d = [IO.Path]::GetDirectoryName(%(batch_path)s) ; if (Test-Path -LiteralPath %(batch_path)s) { ko %(batch_index)s 'File exists' } elseif ($d -and -not (Test-Path -LiteralPath $d -PathType Container)) { ko %(batch_index)s 'No such file or directory' } else { run %(batch_index)s { [IO.Directory]::CreateDirectory(%(batch_path)s) } }",
+        "makedirs": b"if (%(batch_arg)s -eq '0' -and (Test-Path -LiteralPath %(batch_path)s)) { ko %(batch_index)s 'File exists' } else { run %(batch_index)s { [IO.Directory]::CreateDirectory(%(batch_path)s) } }",
+        "remove": b"if (Test-Path -LiteralPath %(batch_path)s -PathType Container) { ko %(batch_index)s 'Is a directory' } elseif (Test-Path -LiteralPath %(batch_path)s) { run %(batch_index)s { Remove-Item -LiteralPath %(batch_path)s -Force -ErrorAction Stop } } else { ko %(batch_index)s 'No such file or directory' }",
+        "rmdir": b"if (-not (Test-Path -LiteralPath %(batch_path)s)) { ko %(batch_index)s 'No such file or directory' } elseif (-not (Test-Path -LiteralPath %(batch_path)s -PathType Container)) { ko %(batch_index)s 'Not a directory' } elseif (Get-ChildItem -LiteralPath %(batch_path)s -Force) { ko %(batch_index)s 'Directory not empty' } else { run %(batch_index)s { Remove-Item -LiteralPath %(batch_path)s -Force -ErrorAction Stop } }",
+        "rmtree": b"if (Test-Path -LiteralPath %(batch_path)s) { run %(batch_index)s { Remove-Item -LiteralPath %(batch_path)s -Recurse -Force -ErrorAction Stop } } else { ko %(batch_index)s 'No such file or directory' }",
+        "rename": b"if (-not (Test-Path -LiteralPath %(batch_path)s)) { ko %(batch_index)s 'No such file or directory' } elseif (Test-Path -LiteralPath %(batch_arg)s) { ko %(batch_index)s 'File exists' } else { run %(batch_index)s { Move-Item -LiteralPath %(batch_path)s -Destination %(batch_arg)s -ErrorAction Stop } }",
+        # no access rights to change
+        "chmod": b"ok %(batch_index)s",
+    }
+
+    def _batch(self, ops):
+        def literal(value):
+            return b"'%s'" % self.myrrh_os.fsdecode(value).replace("'", "''").encode("utf-8")
+
+        script = [b"\xef\xbb\xbf" + self.BATCH_HEADER]
+        for index, (op, path, arg) in enumerate(ops):
+            script.append(
+                self.BATCH_COMMANDS[op]
+                % {
+                    b"batch_index": b"%d" % index,
+                    b"batch_path": literal(path),
+                    b"batch_arg": literal(arg or b""),
+                }
+            )
+
+        script.append(b"Remove-Item -LiteralPath $PSCommandPath -Force")
+
+        path = self._bulk_list(script, b"\r\n", b"ps1")
+        out, err, rval = self.myrrh_os.cmdb(b'%(powershell)s -NoProfile -ExecutionPolicy Bypass -File "%(path)s"', path=path)
+        ExecutionFailureCauseRVal(self, err, rval, 0).check()
+
+        out = self.myrrh_os.fsencode(out.decode("utf-8", errors="surrogateescape"))
+        return self._batch_records(out, self.myrrh_os.error_translate)
+
+    # readable files are reported as "index;digest"
+    HASH_SCRIPT = (
+        b"""$i=0 ; Get-Content -LiteralPath '%(path)s' -Encoding UTF8 | ForEach-Object { $h=(Get-FileHash -LiteralPath $_ -Algorithm %(algo)s -ErrorAction SilentlyContinue).Hash ; if ($h) { [Console]::Out.WriteLine([string]$i + ';' + $h) } ; $i++ } ; Remove-Item -LiteralPath '%(path)s' -Force"""
+    )
+
+    def _hash_files(self, paths, algo):
+        path = self._bulk_list((self.myrrh_os.fsdecode(p).encode("utf-8") for p in paths), b"\r\n")
+
+        out, err, rval = self.myrrh_os.cmdb(
+            b'%(powershell)s -NoProfile -Command "' + self.HASH_SCRIPT + b'"',
+            path=path,
+            algo=algo.upper().encode(),
+        )
+        ExecutionFailureCauseRVal(self, err, rval, 0).check()
+
+        digests = {}
+        for line in out.splitlines():
+            index, _, digest = line.partition(b";")
+            if index.isdigit() and int(index) < len(paths):
+                digests[paths[int(index)]] = digest.strip().decode().lower()
+
+        return digests
+
+    # bsdtar handles the compression by itself
+    ARCHIVE_FLAGS = {None: b"", "gzip": b"z", "bzip2": b"j", "xz": b"J"}
+
+    def _archive(self, archive_name, root_dir, paths, compress):
+        if b"tar" not in self.myrrh_os.getbinb:
+            return False
+
+        _, _, rval = self.myrrh_os.cmdb(
+            b'%(tar)s -c%(archive_flag)sf "%(archive_name)s" -C "%(root_dir)s" %(archive_paths)s',
+            archive_flag=self.ARCHIVE_FLAGS[compress],
+            archive_name=self.myrrh_os.sh_escape_bytes(archive_name),
+            root_dir=self.myrrh_os.sh_escape_bytes(root_dir),
+            archive_paths=b" ".join(b'"%s"' % self.myrrh_os.sh_escape_bytes(p) for p in paths),
+        )
+        return rval == 0
+
+    def _extract(self, archive_name, extract_dir):
+        if b"tar" not in self.myrrh_os.getbinb:
+            return False
+
+        _, _, rval = self.myrrh_os.cmdb(
+            b'(if NOT EXIST "%(extract_dir)s\\" %(mkdir)s "%(extract_dir)s") && %(tar)s -xf "%(archive_name)s" -C "%(extract_dir)s"',
+            archive_name=self.myrrh_os.sh_escape_bytes(archive_name),
+            extract_dir=self.myrrh_os.sh_escape_bytes(extract_dir),
+        )
+        return rval == 0
+
     def _chunk_header(self, file_descs):
         szs = b";".join((str(f[2]).encode() for f in file_descs))
         paths = b";".join((self.myrrh_os.p(f[1]) for f in file_descs))
@@ -123,14 +236,6 @@ exit /b 0"""
         )
         ExecutionFailureCauseRVal(self, e, r, 0).check()
 
-    def _mkdirs(self, dirs: list):
-        cmd = b"for %%d in ( %(dirs)s ) do if NOT EXIST %%d %(mkdir)s %%d"
-
-        dirs = b" ".join((b'"%s\\"' % self.myrrh_os.sh_escape_bytes(d) for d in dirs))
-
-        _, e, r = self.myrrh_os.cmdb(cmd, dirs=dirs)
-        ExecutionFailureCauseRVal(self, e, r, 0).check()
-
     def _scanfiles(self, files):
         """
         return files(path, size)
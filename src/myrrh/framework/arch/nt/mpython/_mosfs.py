@@ -110,6 +110,10 @@ class OsFs(_interface, AbcOsFs, ABCDelegation):
         ExecutionFailureCauseRVal(self, err, rval, 0, src).check()
 
     def listdir(self, path="."):
+        entries = self._fs_listdir(path)
+        if entries is not None:
+            return entries
+
         _cast_ = self.myrrh_os.fdcast(path)
         path = self.myrrh_os.normpath(path)
 
@@ -124,6 +128,10 @@ class OsFs(_interface, AbcOsFs, ABCDelegation):
         return [_cast_(self.myrrh_os.shdecode(f)) for f in [f.strip() for f in out.split(self.myrrh_os.linesepb)] if f != self.myrrh_os.curdirb and f != self.myrrh_os.pardirb and len(f) != 0]
 
     def _scandir_list(self, path="."):
+        entries = self._fs_scandir_list(path)
+        if entries is not None:
+            return entries
+
         # wmic output always in os encoding
 
         _cast_ = self.myrrh_os.fdcast(path)
@@ -0,0 +1,33 @@
+from myrrh.framework.mpython.mglob import AbcGlob
+
+__mlib__ = "Glob"
+
+
+class Glob(AbcGlob):
+    _glob_ignorecase = True
+
+    def _glob_find(self, root, mindepth, maxdepth, name):
+        if b'"' in root or b"%" in root:
+            return None
+
+        command = b"$r=(Get-Item -LiteralPath '%(root)s' -Force -ErrorAction SilentlyContinue).FullName ; if ($r) { Get-ChildItem -LiteralPath $r -Force -ErrorAction SilentlyContinue"
+        if maxdepth is None:
+            command += b" -Recurse"
+        elif maxdepth > 1:
+            command += b" -Depth %(depth)i"
+        if name is not None:
+            command += b" -Filter '%(name)s'"
+        command += b" | ForEach-Object { $_.FullName.Substring($r.Length).TrimStart('\\') } }"
+
+        out, _, rval = self.myrrh_os.cmdb(
+            b'%(powershell)s -NoProfile -Command "' + command + b'"',
+            root=root.replace(b"'", b"''"),
+            depth=(maxdepth or 1) - 1,
+            name=name and name.replace(b"'", b"''"),
+        )
+
+        if rval != 0:
+            return None
+
+        entries = (entry.strip() for entry in out.split(self.myrrh_os.linesepb))
+        return [entry for entry in entries if entry and entry.count(b"\\") + 1 >= mindepth]
@@ -6,10 +6,11 @@ from myrrh.utils import mstring
 from myrrh.core.services.system import ExecutionFailureCauseRVal
 
 from myrrh.core.services.system import AbcRuntime
+from myrrh.core.services import offload
 from myrrh.framework.mpython import mimportlib
 
 
-from myrrh.resources.textfsm import getparser
+from myrrh.resources import textfsm
 
 __mlib__ = "WinReg"
 
@@ -27,10 +28,30 @@ def _revert_reg_multi_sz(v):
     return v.split("\\0") if v else []
 
 
+_ROOT_ALIASES = {
+    "hkcr": "hkey_classes_root",
+    "hkcu": "hkey_current_user",
+    "hklm": "hkey_local_machine",
+    "hku": "hkey_users",
+    "hkcc": "hkey_current_config",
+}
+
+
+def _keypath(key):
+    """
+    key path as compared, in lower case and with the long name of its root key
+    """
+    root, sep, sub = key.lower().partition("\\")
+    return _ROOT_ALIASES.get(root, root) + sep + sub
+
+
 class WinReg(AbcRuntime):
     """
     Notice : - RE_MULTI_SZ does not support empty string
              - Big data unsupported
+
+    SnapshotKey loads a whole subtree with a single query, the keys below it are then served
+    from memory until a write to the subtree or a FlushKey invalidates the snapshot
     """
 
     __frameworkpath__ = "mpython.winreg"
@@ -38,11 +59,14 @@ class WinReg(AbcRuntime):
     tempfile = mimportlib.module_property("tempfile")
     os = mimportlib.module_property("os")
 
-    QUERY_PARSER = staticmethod(getparser("nt_reg"))
+    QUERY_PARSER = staticmethod(textfsm.getparser("nt_reg"))
 
     def __init__(self, system=None):
         self._hkeys = dict()
 
+        self._snapshots = dict()
+        self._snapshots_lock = threading.Lock()
+
         self.HKEY_CLASSES_ROOT = self.PyHKEY(0, self, None, "HKEY_CLASSES_ROOT")
         self.HKEY_CURRENT_USER = self.PyHKEY(0, self, None, "HKEY_CURRENT_USER")
         self.HKEY_LOCAL_MACHINE = self.PyHKEY(0, self, None, "HKEY_LOCAL_MACHINE")
@@ -58,6 +82,71 @@ class WinReg(AbcRuntime):
         if self._default_key is None:
             self._default_key, _, _ = self.HKEY_CURRENT_USER._query_default()
 
+    def _parse(self, o):
+        with self.QUERY_PARSER as fsm:
+            return fsm.ParseText(o)
+
+    def _value(self, n, v, t):
+        if n == self.default_key:
+            n = ""
+
+        stype, value_conv = self._TYPE_CONVERT[t]
+        return (n, value_conv(v), stype)
+
+    def _snapshot_build(self, key, o):
+        tree = {_keypath(key): ([], [])}
+
+        # a whole subtree query can be large, its parsing is offloaded
+        for k, n, v, t in offload.run(textfsm.parse, o.encode("utf-8", "surrogatepass"), "nt_reg"):
+            path = _keypath(k)
+            if path not in tree:
+                self._snapshot_link(tree, k)
+
+            if t:
+                tree[path][1].append(self._value(n, v, t))
+
+        return tree
+
+    @staticmethod
+    def _snapshot_link(tree, key):
+        """
+        register key in tree, with its ancestors not registered yet
+        """
+        names = key.split("\\")
+        paths = _keypath(key).split("\\")
+
+        i = len(paths)
+        while i > 1 and "\\".join(paths[: i - 1]) not in tree:
+            i -= 1
+
+        for j in range(i, len(paths) + 1):
+            tree["\\".join(paths[:j])] = ([], [])
+            if j > 1:
+                tree["\\".join(paths[: j - 1])][0].append(names[j - 1])
+
+    def _snapshot_entries(self, computer, key):
+        path = _keypath(key)
+
+        with self._snapshots_lock:
+            for (c, root), tree in self._snapshots.items():
+                if c == computer and (path == root or path.startswith(root + "\\")):
+                    try:
+                        subkeys, values = tree[path]
+                    except KeyError:
+                        raise FileNotFoundError(key) from None
+
+                    return list(subkeys), list(values)
+
+        return None
+
+    def _snapshot_invalidate(self, computer, key):
+        path = _keypath(key)
+
+        with self._snapshots_lock:
+            for c, root in list(self._snapshots):
+                if c == computer and (path == root or path.startswith(root + "\\") or root.startswith(path + "\\")):
+                    del self._snapshots[(c, root)]
+
     class PyHKEY:
         def __init__(self, handle, winreg, hkey, key="", *, computer=None):
             self.handle = handle
@@ -162,8 +251,7 @@ class WinReg(AbcRuntime):
             )
             ExecutionFailureCauseRVal(self, e, r, 0, key_path).check()
 
-            with self.winreg.QUERY_PARSER as textfsm:
-                fsm = textfsm.ParseText(o)
+            fsm = self.winreg._parse(o)
 
             return fsm[0][1:] if len(fsm[0]) else tuple()
 
@@ -171,6 +259,12 @@ class WinReg(AbcRuntime):
             key_path = self.myrrh_os.p(self.path)
 
             if o is None:
+                entries = self.winreg._snapshot_entries(self._computer, self.key)
+                if entries is not None:
+                    with self._lock:
+                        self.__subkeys, self.__values = entries
+                    return
+
                 o, e, r = self.myrrh_os.cmd(
                     b'%(reg_utf8)s QUERY "%(path)s"',
                     path=self.myrrh_os.sh_escape_bytes(key_path),
@@ -180,16 +274,16 @@ class WinReg(AbcRuntime):
                 except ExecutionFailureCauseRVal:
                     raise FileNotFoundError(key_path)
 
-            with self._lock:
-                with self.winreg.QUERY_PARSER as textfsm:
-                    fsm = textfsm.ParseText(o)
+            fsm = self.winreg._parse(o)
+            path = _keypath(self.key)
 
+            with self._lock:
                 self.__subkeys = list()
                 self.__values = list()
                 for line in fsm:
                     k, n, v, t = line
 
-                    if k != self.key:
+                    if _keypath(k) != path:
                         k = self.winreg.os.path.basename(k)
 
                         try:
@@ -201,15 +295,27 @@ class WinReg(AbcRuntime):
                         if not t:
                             continue
 
-                        if n == self.winreg.default_key:
-                            n = ""
+                        self._add_value(self.winreg._value(n, v, t))
 
-                        stype, value_conv = self.winreg._TYPE_CONVERT[t]
-                        value = value_conv(v)
+        def _snapshot(self):
+            key_path = self.myrrh_os.p(self.path)
 
-                        self._add_value((n, value, stype))
+            o, e, r = self.myrrh_os.cmd(
+                b'%(reg_utf8)s QUERY "%(path)s" /s',
+                path=self.myrrh_os.sh_escape_bytes(key_path),
+            )
+            try:
+                ExecutionFailureCauseRVal(self, e, r, 0, key_path).check()
+            except ExecutionFailureCauseRVal:
+                raise FileNotFoundError(key_path)
+
+            tree = self.winreg._snapshot_build(self.key, o)
+
+            with self.winreg._snapshots_lock:
+                self.winreg._snapshots[(self._computer, _keypath(self.key))] = tree
 
         def _create(self):
+            self.winreg._snapshot_invalidate(self._computer, self.key)
             o, e, r = self.myrrh_os.cmd(
                 b'( %(reg_utf8)s QUERY "%(path)s" 2>NUL ) || ( ( %(reg_utf8)s ADD "%(path)s" 1>NUL ) && ( %(reg_utf8)s DELETE "%(path)s" /ve /f 1>NUL ) && %(reg_utf8)s QUERY "%(path)s")',
                 path=self.myrrh_os.sh_escape_bytes(self.key_path),
@@ -218,6 +324,7 @@ class WinReg(AbcRuntime):
             self._query(o)
 
         def _delete(self):
+            self.winreg._snapshot_invalidate(self._computer, self.key)
             key_path = self.myrrh_os.p(self.path)
 
             _, e, r = self.myrrh_os.cmd(
@@ -227,6 +334,7 @@ class WinReg(AbcRuntime):
             ExecutionFailureCauseRVal(self, e, r, 0, self.path).check()
 
         def _delete_value(self, value):
+            self.winreg._snapshot_invalidate(self._computer, self.key)
             key_path = self.myrrh_os.p(self.path)
             value = self.myrrh_os.shdecode(value)
 
@@ -239,6 +347,7 @@ class WinReg(AbcRuntime):
             self._query(o)
 
         def _loadkey(self, filename):
+            self.winreg._snapshot_invalidate(self._computer, self.key)
             key_path = self.myrrh_os.p(self.path)
             filename = self.myrrh_os.p(filename)
 
@@ -262,6 +371,7 @@ class WinReg(AbcRuntime):
             ExecutionFailureCauseRVal(self, e, r, 0, self.path).check()
 
         def _set_value(self, type, value, value_name=""):
+            self.winreg._snapshot_invalidate(self._computer, self.key)
             key_path = self.myrrh_os.p(self.path)
 
             stype, value_conv = self.winreg._TYPE_CONVERT[type]
@@ -481,6 +591,7 @@ class WinReg(AbcRuntime):
 
     def FlushKey(self, key):
         hkey = self._to_PyHKEY(key)
+        self._snapshot_invalidate(hkey._computer, hkey.key)
         hkey._query()
 
     def LoadKey(self, key, sub_key, file_name):
@@ -523,6 +634,10 @@ class WinReg(AbcRuntime):
             raise FileNotFoundError(key)
         return hkey._values[idx][1:]
 
+    def SnapshotKey(self, key, sub_key=None):
+        hkey = self._to_PyHKEY(key)
+        hkey._new(0, sub_key)._snapshot()
+
     def SaveKey(self, key, file_name):
         hkey = self._to_PyHKEY(key)
         hkey._save(file_name)
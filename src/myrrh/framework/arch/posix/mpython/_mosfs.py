@@ -1,5 +1,6 @@
 from abc import abstractmethod
 import errno
+import os
 import stat
 
 from myrrh.framework.mpython import mbuiltins
@@ -9,6 +10,7 @@ from myrrh.core.services.system import (
     MOsError,
     AbcRuntimeDelegate,
 )
+from myrrh.core.services import offload
 from myrrh.core.interfaces import ABC
 
 from myrrh.framework.mpython._mosfs import AbcOsFs, stat_result
@@ -31,6 +33,10 @@ def _stat_out_to_struct(out):
     )
 
 
+def _scandir_out_to_stats(out):
+    return [(name, _stat_out_to_struct(fstat)) for name, fstat in (o.split(b",", 1) for o in bytes(out).split(b"\n") if o)]
+
+
 def _statvfs_out_to_struct(out):
     stat_list = [int(v, 0) for v in out.strip().split(b",")]
     return OsFs.statvfs_result(*stat_list)
@@ -166,17 +172,22 @@ class OsFs(_interface, AbcOsFs, AbcRuntimeDelegate):
         self.rename(src, dst, *args, src_dir_fd=src_dir_fd, dst_dir_fd=dst_dir_fd)
 
     def listdir(self, path="."):
+        entries = self._fs_listdir(path, 0o777)
+        if entries is not None:
+            return entries
+
         _cast_ = self.myrrh_os.fdcast(path)
         _path = self.myrrh_os.f(path)
 
-        if not self.isdir(path):
-            if not self.exists(path):
-                MOsError(self, errno.ENOENT, "No such file or directory", args=(path,)).raised()
-            MOsError(self, errno.ENOTDIR, "Not a directory", args=(path,)).raised()
         out, err, rval = self.myrrh_os.cmdb(
-            b"%(find)s %(path)s/ -maxdepth 1 -mindepth 1 ! -path %(path)s -perm /777 -print",
+            b"if [ -d %(path)s ] ; then %(find)s %(path)s/ -maxdepth 1 -mindepth 1 ! -path %(path)s -perm /777 -print ; elif [ -e %(path)s ] ; then exit %(enotdir)i ; else exit %(enoent)i ; fi",
             path=self.myrrh_os.sh_escape_bytes(_path),
+            enotdir=errno.ENOTDIR,
+            enoent=errno.ENOENT,
         )
+        if rval in (errno.ENOTDIR, errno.ENOENT):
+            MOsError(self, rval, os.strerror(rval), args=(path,)).raised()
+
         ExecutionFailureCauseRVal(
             self,
             err,
@@ -188,6 +199,10 @@ class OsFs(_interface, AbcOsFs, AbcRuntimeDelegate):
         return [_cast_(self.myrrh_os.basename(f.strip())) for f in out.split(self.myrrh_os.linesepb) if len(f) != 0]
 
     def _scandir_list(self, path="."):
+        entries = self._fs_scandir_list(path, 0o777)
+        if entries is not None:
+            return entries
+
         _cast_ = self.myrrh_os.fdcast(path)
         _path = self.myrrh_os.p(path)
         command = b"%(find)s %(path)s -maxdepth 1 ! -path %(path)s -exec %(stat)s -L -c %%n,0x%%f,%%i,%%d,%%h,%%u,%%g,%%s,%%X,%%Y,%%Z {} \\; || %(stat)s -L -c %%n,0x%%f,%%i,%%d,%%h,%%u,%%g,%%s,%%X,%%Y,%%Z %(path)s"
@@ -202,11 +217,10 @@ class OsFs(_interface, AbcOsFs, AbcRuntimeDelegate):
         ).check()
 
         result = []
-        out = [o.split(b",", 1) for o in filter(None, out.split(b"\n"))]
-        for name, fstat in out:
+        # a large directory listing is parsed by the offload pool
+        for name, fstat in offload.run(_scandir_out_to_stats, out):
             fname = self.myrrh_os.basename(name)
             fpath = self.myrrh_os.joinpath(_path, fname)
-            fstat = _stat_out_to_struct(fstat)
             fmode = stat.filemode(fstat.st_mode)
             if "r" in fmode or "w" in fmode or "x" in fmode:
                 result.append(self.DirEntry(_cast_(fname), _cast_(fpath), fstat, self.lstat))
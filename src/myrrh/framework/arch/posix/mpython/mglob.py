@@ -0,0 +1,27 @@
+from myrrh.framework.mpython.mglob import AbcGlob
+
+__mlib__ = "Glob"
+
+
+class Glob(AbcGlob):
+    def _glob_find(self, root, mindepth, maxdepth, name):
+        command = b"if [ -d %(root)s ] ; then %(find)s -L %(root)s -mindepth %(mindepth)i"
+        if maxdepth is not None:
+            command += b" -maxdepth %(maxdepth)i"
+        if name is not None:
+            command += b" -name %(name)s"
+        command += b" -print0 ; fi"
+
+        out, _, rval = self.myrrh_os.cmdb(
+            command,
+            root=self.myrrh_os.sh_escape_bytes(root),
+            mindepth=mindepth,
+            maxdepth=maxdepth,
+            name=name and self.myrrh_os.sh_escape_bytes(name),
+        )
+
+        # find exits with 1 when some entries could not be read, glob ignores them too
+        if rval not in (0, 1):
+            return None
+
+        return [entry[len(root) :].lstrip(b"/") for entry in out.split(b"\0") if entry.startswith(root)]
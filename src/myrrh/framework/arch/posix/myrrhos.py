@@ -53,6 +53,7 @@ class MyrrhOs(AbcMyrrhOs):
         b"tar": b"/bin/tar",
         b"mkdir": b"/bin/mkdir",
         b"rm": b"/bin/rm",
+        b"rmdir": b"/bin/rmdir",
     }
 
     def _getbinb_(self):
@@ -124,9 +125,16 @@ class MyrrhOs(AbcMyrrhOs):
     def _errno_localized_mapping(self):
         return errno.errno_create_localized_mapping(self.getdefaultlocale()[0])
 
+    @cached_property
+    def _errno_matcher(self):
+        return errno.errno_matcher(self._errno_localized_mapping)
+
     def default_errno_from_msg(self, err):
         err = self.shencode(err)
-        return errno.errno_from_msgb(err, map=self._errno_localized_mapping)
+        return self._errno_matcher.errno(err)
+
+    def default_errnos_from_msg(self, errs):
+        return self._errno_matcher.errnos([self.shencode(err) for err in errs])
 
     environkeyformat = None  # type: ignore[assignment]
     error_translate = default_errno_from_msg
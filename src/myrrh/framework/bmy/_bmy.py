@@ -6,7 +6,8 @@ import logging
 import collections
 import functools
 
-from traceback import format_exc
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from traceback import format_exc, format_exception
 
 from myrrh import factory
 from myrrh.core.services import cfg_init
@@ -96,6 +97,7 @@ __all__ = [
 FILE_EXT = cfg_init("myrrh_file_ext", ".emyrrh", section="myrrh.framework.bmy")
 BMY_ASYNC = cfg_init("use_async_group_for_bmy", True, section="myrrh.framework.bmy")
 EXEC_MEMORY_LEN = cfg_init("execute_memory_len", 200, section="myrrh.framework.bmy")
+LOAD_MAX_WORKERS = cfg_init("load_max_concurrent_entities", 8, section="myrrh.framework.bmy")
 
 if BMY_ASYNC:
     _func = groups.myrrh_group_async
@@ -376,15 +378,33 @@ def save(path=None, full=False, *, eid):
         f.write(eid._assembly.fromEntity(eid, only_predefined=not full).json(indent=2))
 
 
-def load(path=None, eid=None):
+def _load_entity(path, eid, build):
+    assembly = factory.Assembly.fromFile(path)
+    if eid is None:
+        eid, _, _ = os.path.basename(path).partition(".")
+
+    bmy_entity = BmyEntity(assembly, eid)
+    if build:
+        bmy_entity.build()
+
+    return bmy_entity
+
+
+def load(path=None, eid=None, *, build=False, max_workers=None, progress=None):
     f"""
     Loads an entity information file ('{FILE_EXT}' file)
 
     This function is similar to:func:`bmy.new` excepts that the list of predefined warehouse is loaded from an emyrrh file
 
+    Files are loaded concurrently, a failing file does not prevent the other entities from being loaded,
+    the failures are reported together once all the files are processed
+
     Args:
         path (str|list|tuple): path to entity "{FILE_EXT}" file
         eid (str|list|tuple): entity eid
+        build (bool): build the entities while loading them
+        max_workers (int): maximum number of entities loaded at the same time
+        progress (callable): called with (path, eid, error, done, total) each time a file is processed
     Returns:
         str|list: eid of the newly created entity
 
@@ -392,7 +412,9 @@ def load(path=None, eid=None):
     if not path:
         path = os.getcwd()
 
-    if os.path.isdir(path):
+    if isinstance(path, (list, tuple)):
+        paths = list(path)
+    elif os.path.isdir(path):
         paths = glob.glob(os.path.join(path, f"*{FILE_EXT}"))
         path = []
     else:
@@ -406,21 +428,34 @@ def load(path=None, eid=None):
     else:
         eids = tuple(eid) + (None,) * (len(paths) - len(eid))
 
-    results = list()
-    for p, eid in zip(paths, eids):
-        try:
-            assembly = factory.Assembly.fromFile(p)
-            if eid is None:
-                eid, _, _ = os.path.basename(p).partition(".")
+    loaded = dict()
+    failures = list()
 
-            results.append(entities.append(assembly, eid))
+    with ThreadPoolExecutor(min(len(paths), max_workers or LOAD_MAX_WORKERS), "MyrrhLoad") as pool:
+        futures = {pool.submit(_load_entity, p, e, build): p for p, e in zip(paths, eids)}
 
-        except BmyException as e:
-            e.func = "load"
-            raise
-        except Exception as e:
-            log.debug("load entity failed with exception\n%s" % format_exc())
-            raise BmyMyrrhFailure(func="load", msg="load failure for %s: %s" % (p, e))
+        for done, future in enumerate(as_completed(futures), 1):
+            p = futures[future]
+            try:
+                loaded[p] = future.result()
+                error = None
+            except Exception as e:
+                log.debug("load entity failed with exception\n%s" % "".join(format_exception(e)))
+                failures.append((p, e))
+                error = e
+
+            if progress:
+                progress(p, loaded[p].eid if p in loaded else None, error, done, len(paths))
+
+    # entities are added in the path order, the first one is selected when none is
+    results = [entities.add(loaded[p]) for p in paths if p in loaded]
+
+    if failures:
+        if len(failures) == 1 and isinstance(failures[0][1], BmyException):
+            failures[0][1].func = "load"
+            raise failures[0][1]
+
+        raise BmyMyrrhFailure(func="load", msg="load failure for %s" % ", ".join("%s: %s" % f for f in failures))
 
     return results if isinstance(path, (list, tuple)) or isinstance(eid, (list, tuple)) or len(results) > 1 else results[0]
 
@@ -511,6 +546,8 @@ def execute(
     raiseonttl: bool = False,
     raiseontimeout: bool = True,
     executein: bool = True,
+    consumer=None,
+    lines: bool = False,
     eid=None,
 ):
     """Run a command on an entity.
@@ -532,6 +569,8 @@ def execute(
         raiseonttl (bool, optional): raise if ttl. Defaults to False.
         raiseontimeout (bool, optional): raise if timeout. Defaults to True.
         executein (bool, optional): execute immediately. Defaults to True.
+        consumer (callable, optional): called with ("out"|"err", data) as soon as output is read, raise advsh.Abort to stop. Defaults to None.
+        lines (bool, optional): call consumer per output line. Defaults to False.
         eid (str|tuple): eid of the entity to use for the command execution.
 
     Returns:
@@ -551,6 +590,8 @@ def execute(
         poll=poll,
         raiseonttl=raiseonttl,
         raiseontimeout=raiseontimeout,
+        consumer=consumer,
+        lines=lines,
     )
 
     execute.mem.append(exe)
@@ -739,13 +780,14 @@ def edit(path, nl=False, edit=None, *, eid):
 
 
 @bmy_func()
-def push(src_path, dest_path, *, eid: str, chunk_size=None):
+def push(src_path, dest_path, *, eid: str, chunk_size=None, verify=False):
     """
     Upload local files to an entity (src_path may contain simple shell-style wildcards)
 
     Args:
         src_path (str): source local path (may be a directory. in such a case, full directory content is pushed on remote entity)
         dest_path (str): destination entity path
+        verify (bool): compare the checksums of the uploaded files with the local ones
 
         eid (str): destination entity id
 
@@ -760,19 +802,20 @@ def push(src_path, dest_path, *, eid: str, chunk_size=None):
     chunk_size = advfs.CHUNK_SZ if chunk_size is None else chunk_size
 
     if os.local_os.path.isdir(src_path):
-        return advfs.pushdir(src_path, dest_path, chunk_size=chunk_size)
+        return advfs.pushdir(src_path, dest_path, chunk_size=chunk_size, verify=verify)
 
-    return list(), advfs.pushfile(src_path, dest_path)
+    return list(), advfs.pushfile(src_path, dest_path, verify=verify)
 
 
 @bmy_func()
-def get(src_path, dest_path, *, eid: str, chunk_size=None):
+def get(src_path, dest_path, *, eid: str, chunk_size=None, verify=False):
     """
     Download a file from the selected entity to localhost
 
     Args:
         src_path (str): entity source path
         dest_path (str): local destination path
+        verify (bool): compare the checksums of the downloaded files with the entity ones
 
         eid (str): source entity id
 
@@ -787,13 +830,13 @@ def get(src_path, dest_path, *, eid: str, chunk_size=None):
     chunk_size = advfs.CHUNK_SZ if chunk_size is None else chunk_size
 
     if os.path.isdir(src_path):
-        return advfs.getdir(src_path, dest_path, chunk_size=chunk_size)
+        return advfs.getdir(src_path, dest_path, chunk_size=chunk_size, verify=verify)
 
-    return list(), advfs.getfile(src_path, dest_path)
+    return list(), advfs.getfile(src_path, dest_path, verify=verify)
 
 
 @bmy_func()
-def transfer(target_eid, src_path, dest_path, *, eid: str, chunk_size=None):
+def transfer(target_eid, src_path, dest_path, *, eid: str, chunk_size=None, verify=False):
     """
     Transfer of files from a target entity to the selected entity
 
@@ -802,6 +845,7 @@ def transfer(target_eid, src_path, dest_path, *, eid: str, chunk_size=None):
         target_eid (str); destination entity id
         src_path (str): source entity path (directory or file)
         dest_path (str): destination local path
+        verify (bool): compare the checksums of the transferred files on both entities
 
         eid (str): source entity id
 
@@ -815,7 +859,7 @@ def transfer(target_eid, src_path, dest_path, *, eid: str, chunk_size=None):
 
     chunk_size = advfs.CHUNK_SZ if chunk_size is None else chunk_size
 
-    return advfs.transfer(entities[target_eid], src_path, dest_path, chunk_size=chunk_size)
+    return advfs.transfer(entities[target_eid], src_path, dest_path, chunk_size=chunk_size, verify=verify)
 
 
 @bmy_func()
@@ -926,8 +970,15 @@ def rm(path, *, eid: str):
     """
     with select(eid):
         from mlib.fs import advfs
+        from mlib.py import glob
+
+    paths = []
+    for p in path if isinstance(path, (list, tuple)) else [path]:
+        # a pattern matching nothing is taken as a literal path
+        paths.extend(glob.has_magic(p) and glob.glob(p, recursive=True) or [p])
 
-    advfs.rm(path)
+    if paths:
+        advfs.rm(paths)
 
 
 @bmy_func()
@@ -1002,7 +1053,7 @@ def pwd(*, eid: Runtime):
 
 
 @bmy_func()
-def lsdir(path=None, *, eid: str):
+def lsdir(path=None, recursive=False, *, eid: str):
     """
     List entries in directories of an entity
 
@@ -1010,6 +1061,7 @@ def lsdir(path=None, *, eid: str):
 
     Args:
         path (str): folder path or pattern (default = current folder path)
+        recursive (bool): "**" pattern matches any files and zero or more directories
 
         eid (str): entity id
 
@@ -1024,7 +1076,7 @@ def lsdir(path=None, *, eid: str):
     path = path or os.curdir
 
     if glob.has_magic(path):
-        return glob.glob(path)
+        return glob.glob(path, recursive=recursive)
 
     return os.listdir(path)
 
@@ -159,10 +159,11 @@ class _BmyEntities:
 
     @groups.myrrh_group_sync_member
     def append(self, assembly, eid):
-        bmy_entity = BmyEntity(assembly, eid)
+        return self.add(BmyEntity(assembly, eid))
 
+    def add(self, bmy_entity: BmyEntity):
         with self._lock_entities:
-            self._entities[eid] = bmy_entity
+            self._entities[bmy_entity.eid] = bmy_entity
 
             if len(self._entities) == 1 or self.eid == bmy_entity.eid:
                 # select or reselect entity
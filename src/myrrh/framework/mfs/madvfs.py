@@ -2,6 +2,8 @@
 
 import os
 import errno
+import hashlib
+import itertools
 import tempfile
 import threading
 
@@ -12,6 +14,8 @@ from ..mpython import _mosfs
 
 __mlib__ = "AbcAdvFs"
 
+_bulk_ids = itertools.count()
+
 
 class AdvFsFile:
     def __init__(self, arg):
@@ -50,6 +54,32 @@ class AdvFsFileR(AdvFsFile):
         return open(self.arg, "rb")
 
 
+class AdvFsHashStream:
+    """
+    file-like wrapper computing the digest of the data read or written
+    """
+
+    def __init__(self, stream, algo):
+        self.stream = stream
+        self.hash = hashlib.new(algo)
+
+    def read(self, *a):
+        buf = self.stream.read(*a)
+        self.hash.update(buf)
+        return buf
+
+    def write(self, buf):
+        sz = self.stream.write(buf)
+        self.hash.update(buf if sz is None else buf[:sz])
+        return sz
+
+    def seek(self, *a):
+        return self.stream.seek(*a)
+
+    def hexdigest(self):
+        return self.hash.hexdigest()
+
+
 class AdvFsFileGet(AdvFsFile):
     def __init__(self, system: AbcRuntime, path, size, header=b""):
         super().__init__((system, path, size))
@@ -82,20 +112,120 @@ class AdvFsFileGet(AdvFsFile):
         super().close()
 
 
+class AdvFsBatchOp:
+    """
+    operation recorded in a batch, its result is available once the batch has run
+    """
+
+    def __init__(self, advfs, op, path, arg=None):
+        self.advfs = advfs
+        self.op = op
+        self.path = path
+        self.arg = arg
+        self.value = None
+        self.errno = None
+
+    def __repr__(self):
+        return f"<AdvFsBatchOp {self.op} {self.path!r} errno={self.errno}>"
+
+    @property
+    def done(self):
+        return self.errno is not None
+
+    def result(self):
+        """
+        return the operation value, raise the operation error
+        """
+        if not self.done:
+            raise RuntimeError("batch has not run yet")
+
+        if self.errno:
+            FileException(self.advfs, errno=self.errno, filename=self.path).raised()
+
+        return self.value
+
+
+class AdvFsBatch:
+    """
+    record filesystem operations and run them on the entity with a single script
+
+    each recording returns an AdvFsBatchOp, the batch runs when the context exits without error
+    """
+
+    def __init__(self, advfs):
+        self.advfs = advfs
+        self.ops = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *a):
+        if exc_type is None:
+            self.run()
+
+    def _record(self, op, path, arg=None):
+        op = AdvFsBatchOp(self.advfs, op, path, arg)
+        self.ops.append(op)
+        return op
+
+    def stat(self, path):
+        return self._record("stat", path)
+
+    def exists(self, path):
+        return self._record("exists", path)
+
+    def listdir(self, path="."):
+        return self._record("listdir", path)
+
+    def mkdir(self, path):
+        return self._record("mkdir", path)
+
+    def makedirs(self, path, exist_ok=False):
+        return self._record("makedirs", path, exist_ok)
+
+    def remove(self, path):
+        return self._record("remove", path)
+
+    unlink = remove
+
+    def rmdir(self, path):
+        return self._record("rmdir", path)
+
+    def rmtree(self, path):
+        return self._record("rmtree", path)
+
+    def rename(self, src, dst):
+        return self._record("rename", src, dst)
+
+    def chmod(self, path, mode):
+        return self._record("chmod", path, mode)
+
+    @property
+    def errors(self):
+        return [op for op in self.ops if op.errno]
+
+    def run(self):
+        """
+        run the operations not yet done, return all the recorded operations
+        """
+        ops = [op for op in self.ops if not op.done]
+        if ops:
+            self.advfs._run_batch(ops)
+
+        return self.ops
+
+
 class AbcAdvFs(AbcRuntime):
     __frameworkpath__ = "mfs.advfs"
 
     CHUNK_SZ = cfg_init("advfs_file_chunk_size", 1024 * 500, section="myrrh.framework.mfs")
     COPY_BUFSIZE = cfg_init("advfs_copy_buffer_size", 1024 * 64, section="myrrh.framework.mfs")
+    HASH_ALGO = cfg_init("advfs_hash_algorithm", "sha256", section="myrrh.framework.mfs")
 
     @property
     def os(self):
         return _mlib_(_mosfs)(self)
 
-    @abstractmethod
-    def _mkdirs(self, dirs: list):
-        pass
-
     @abstractmethod
     def _chunk_header(self, file_descs):
         pass
@@ -196,12 +326,16 @@ class AbcAdvFs(AbcRuntime):
 
         return _trpath(path)
 
-    def _local_write_chunk(self, stream, file_descs):
+    def _local_write_chunk(self, stream, file_descs, digests=None):
         stream.write(self._chunk_header(file_descs))
 
-        for src, _, _ in file_descs:
+        for src, dest, _ in file_descs:
             with AdvFsFileR(src) as f:
+                if digests is not None:
+                    f = AdvFsHashStream(f, self.HASH_ALGO)
                 self.copyfileobj(f, stream)
+                if digests is not None:
+                    digests[dest] = f.hexdigest()
 
     def _chunk_file_name(self, chunk_nb=None, chunk_name=None):
         if chunk_nb is None:
@@ -217,7 +351,7 @@ class AbcAdvFs(AbcRuntime):
             chunk_nb,
         )
 
-    def _local_makechunks(self, srcs, dests, sizes, chunk_size, chunk_name=None):
+    def _local_makechunks(self, srcs, dests, sizes, chunk_size, chunk_name=None, digests=None):
         # return src, dest, ischunk, file_descs
         nb_chunk = 0
         file_descs = []
@@ -241,7 +375,7 @@ class AbcAdvFs(AbcRuntime):
                 chunkpath = self.myrrh_os.joinpath(tempdir, self._chunk_file_name(nb_chunk, chunk_name=chunk_name))
                 try:
                     stf = tempfile.SpooledTemporaryFile()
-                    self._local_write_chunk(stf, file_descs)
+                    self._local_write_chunk(stf, file_descs, digests)
                     stf.seek(0)
                     yield stf, chunkpath, True, file_descs
                     nb_chunk += 1
@@ -260,7 +394,7 @@ class AbcAdvFs(AbcRuntime):
             try:
                 chunkpath = self.myrrh_os.joinpath(tempdir, self._chunk_file_name(nb_chunk, chunk_name=chunk_name))
                 stf = tempfile.SpooledTemporaryFile()
-                self._local_write_chunk(stf, file_descs)
+                self._local_write_chunk(stf, file_descs, digests)
                 stf.seek(0)
                 yield stf, chunkpath, True, file_descs
             finally:
@@ -325,11 +459,13 @@ class AbcAdvFs(AbcRuntime):
         filtered_dirs = []
         for i in range(0, len(dirs) - 1):
             if not dirs[i] in dirs[i + 1]:
-                filtered_dirs.append(self.myrrh_os.sh_escape_bytes(self.myrrh_os.p(dirs[i])))
+                filtered_dirs.append(dirs[i])
         if dirs:
-            filtered_dirs.append(self.myrrh_os.sh_escape_bytes(self.myrrh_os.p(dirs[-1])))
+            filtered_dirs.append(dirs[-1])
 
-        self._mkdirs(filtered_dirs)
+        for d, err in self.bulk("mkdir", filtered_dirs):
+            if err:
+                FileException(self, errno=err, filename=d).raised()
 
     def getfiles(
         self,
@@ -339,8 +475,10 @@ class AbcAdvFs(AbcRuntime):
         sizes=None,
         chunk_size=CHUNK_SZ,
         ignore_overwrite=False,
+        verify=False,
     ):
         result = []
+        digests = {}
 
         if not dest_files:
             dest_files = [os.path.join(os.getcwd(), self.basename(f)) for f in src_files]
@@ -355,36 +493,51 @@ class AbcAdvFs(AbcRuntime):
 
         if not chunk_size:
             for src, dest in zip(src_files, dest_files):
-                src = self.myrrh_os.p(src)
-
                 with AdvFsFileW(dest) as f:
-                    self.myrrh_syscall.stream_in(src, f)
+                    f = AdvFsHashStream(f, self.HASH_ALGO) if verify else f
+                    self.myrrh_syscall.stream_in(self.myrrh_os.p(src), f)
                     result.append(dest)
 
-            return result
+                if verify:
+                    digests[src] = f.hexdigest()
 
-        if not sizes:
-            _, sizes = self.scanfiles(src_files)
+        else:
+            if not sizes:
+                _, sizes = self.scanfiles(src_files)
 
-        for src, dest, ischunk, file_descs in self._makechunks(src_files, dest_files, sizes, chunk_size):
-            with AdvFsFileW(dest) as stream:
-                self.myrrh_syscall.stream_in(os.fsencode(src), stream)
+            for src, dest, ischunk, file_descs in self._makechunks(src_files, dest_files, sizes, chunk_size):
+                with AdvFsFileW(dest) as stream:
+                    if verify and not ischunk:
+                        stream = AdvFsHashStream(stream, self.HASH_ALGO)
 
-                if ischunk:
-                    stream.seek(0)
-                    for _, dest, sz in file_descs:
-                        with AdvFsFileW(dest) as f:
-                            self.copyfileobj(stream, f, sz)
+                    self.myrrh_syscall.stream_in(os.fsencode(src), stream)
 
-            result.extend(d for _, d, _ in file_descs)
+                    if ischunk:
+                        stream.seek(0)
+                        for src, dest, sz in file_descs:
+                            with AdvFsFileW(dest) as f:
+                                f = AdvFsHashStream(f, self.HASH_ALGO) if verify else f
+                                if sz:
+                                    self.copyfileobj(stream, f, sz)
+
+                            if verify:
+                                digests[src] = f.hexdigest()
+
+                    elif verify:
+                        digests[src] = stream.hexdigest()
+
+                result.extend(d for _, d, _ in file_descs)
+
+        if verify:
+            self._verify(list(digests), list(digests.values()))
 
         return result
 
-    def getfile(self, src, dest=""):
+    def getfile(self, src, dest="", *, verify=False):
         dests = [] if not dest else [dest]
-        return self.getfiles([src], dests, chunk_size=0)
+        return self.getfiles([src], dests, chunk_size=0, verify=verify)
 
-    def getdir(self, src, dest="", *, chunk_size=CHUNK_SZ):
+    def getdir(self, src, dest="", *, chunk_size=CHUNK_SZ, verify=False):
         if not dest:
             dest = os.getcwd()
 
@@ -403,9 +556,10 @@ class AbcAdvFs(AbcRuntime):
             [os.path.join(dest, *f.split(self.myrrh_os.sepb.decode())) for f in files],
             sizes=sizes,
             chunk_size=chunk_size,
+            verify=verify,
         )
 
-    def pushfiles(self, src_files, dest_files=[], *, sizes=None, chunk_size=CHUNK_SZ):
+    def pushfiles(self, src_files, dest_files=[], *, sizes=None, chunk_size=CHUNK_SZ, verify=False):
         if not dest_files:
             dest_files = [self.myrrh_os.joinpath(self.myrrh_os._getcwdb_(), os.basename(f)) for f in src_files]
 
@@ -413,38 +567,52 @@ class AbcAdvFs(AbcRuntime):
             raise ValueError("number of elements in source file list and destination path list must be equal")
 
         result = []
+        digests = {} if verify else None
+
         if not chunk_size:
             for src, dest in zip(src_files, dest_files):
                 with AdvFsFileR(src) as f:
+                    f = AdvFsHashStream(f, self.HASH_ALGO) if verify else f
                     self.myrrh_syscall.stream_out(self.myrrh_os.fsencode(dest), f)
                     result.append(dest)
 
-            return result
+                if verify:
+                    digests[dest] = f.hexdigest()
 
-        if not sizes:
-            sizes = []
-            for f in src_files:
-                sizes.append(os.path.getsize(f))
+        else:
+            if not sizes:
+                sizes = []
+                for f in src_files:
+                    sizes.append(os.path.getsize(f))
 
-        for src, dest, merged, file_descs in self._local_makechunks(src_files, dest_files, sizes, chunk_size=chunk_size):
-            with AdvFsFileR(src) as stream:
-                self.myrrh_syscall.stream_out(os.fsencode(dest), stream)
-            if merged:
-                self._unchunk(dest)
+            for src, dest, merged, file_descs in self._local_makechunks(src_files, dest_files, sizes, chunk_size=chunk_size, digests=digests):
+                with AdvFsFileR(src) as stream:
+                    if verify and not merged:
+                        stream = AdvFsHashStream(stream, self.HASH_ALGO)
 
-            result.extend(d for _, d, _ in file_descs)
+                    self.myrrh_syscall.stream_out(os.fsencode(dest), stream)
+
+                if merged:
+                    self._unchunk(dest)
+                elif verify:
+                    digests[dest] = stream.hexdigest()
+
+                result.extend(d for _, d, _ in file_descs)
+
+        if verify:
+            self._verify(list(digests), list(digests.values()))
 
         return result
 
-    def pushfile(self, src, dest=""):
+    def pushfile(self, src, dest="", *, verify=False):
         if self.myrrh_os.fs.is_container(self.myrrh_os.fsencode(dest)):
             dest = self.myrrh_os.joinpath(dest, os.path.basename(src))
 
         dests = [] if not dest else [dest]
 
-        return self.pushfiles([src], dests, chunk_size=0)
+        return self.pushfiles([src], dests, chunk_size=0, verify=verify)
 
-    def pushdir(self, src, dest="", *, chunk_size=CHUNK_SZ):
+    def pushdir(self, src, dest="", *, chunk_size=CHUNK_SZ, verify=False):
         if not dest:
             dest = self.myrrh_os.fsdecode(self.myrrh_os._getcwdb_())
 
@@ -461,6 +629,7 @@ class AbcAdvFs(AbcRuntime):
             [self.myrrh_os.joinpath(dest, *f.split(os.sep)) for f in files],
             sizes=sizes,
             chunk_size=chunk_size,
+            verify=verify,
         )
 
         return dirs, files
@@ -474,7 +643,7 @@ class AbcAdvFs(AbcRuntime):
         if fmode != -1:
             self.chmod(fmode, destpath)
 
-    def transferfiles(self, entity, src_files, dest_files=[], *, sizes=None, chunk_size=CHUNK_SZ):
+    def transferfiles(self, entity, src_files, dest_files=[], *, sizes=None, chunk_size=CHUNK_SZ, verify=False):
         result = []
 
         entity = AbcAdvFs(entity.system)
@@ -502,6 +671,9 @@ class AbcAdvFs(AbcRuntime):
                     self.myrrh_syscall.stream_out(self.myrrh_os.fsencode(dest), f)
                 result.append(dest)
 
+            if verify:
+                self._verify(dest_files, entity.hash_files(src_files, self.HASH_ALGO))
+
             return result
 
         target_tempdir = self.myrrh_os.tmpdirb
@@ -525,16 +697,19 @@ class AbcAdvFs(AbcRuntime):
 
             result.extend(d for _, d, _ in file_descs)
 
+        if verify:
+            self._verify(dest_files, entity.hash_files(src_files, self.HASH_ALGO))
+
         return result
 
-    def transferfile(self, entity, src, dest=""):
+    def transferfile(self, entity, src, dest="", *, verify=False):
         if dest and self.myrrh_os.fs.is_container(dest):
             dest = self.myrrh_os.joinpath(dest, entity.runtime.myrrh_os.basename(src))
 
         dests = [] if not dest else [dest]
-        return self.transferfiles(entity, [src], dests, chunk_size=0)
+        return self.transferfiles(entity, [src], dests, chunk_size=0, verify=verify)
 
-    def transferdir(self, entity, src, dest="", *, chunk_size=CHUNK_SZ):
+    def transferdir(self, entity, src, dest="", *, chunk_size=CHUNK_SZ, verify=False):
         e_advfs = AbcAdvFs(entity.system)
 
         _cast_ = e_advfs.myrrh_os.fdcast(src)
@@ -564,15 +739,16 @@ class AbcAdvFs(AbcRuntime):
             [self.myrrh_os.joinpath(dest, self.myrrh_os.fsencode(f)) for f in files],
             sizes=sizes,
             chunk_size=chunk_size,
+            verify=verify,
         )
 
         return [_cast_(d) for d in dirs], [_cast_(f) for f in files]
 
-    def transfer(self, entity, src, dest="", *, chunk_size=CHUNK_SZ):
+    def transfer(self, entity, src, dest="", *, chunk_size=CHUNK_SZ, verify=False):
         if entity.runtime.myrrh_os.fs.is_container(src):
-            return self.transferdir(entity, src, dest, chunk_size=chunk_size)
+            return self.transferdir(entity, src, dest, chunk_size=chunk_size, verify=verify)
 
-        return [], self.transferfile(entity, src, dest=dest)
+        return [], self.transferfile(entity, src, dest=dest, verify=verify)
 
     def copy(self, srcs, dest):
         """
@@ -618,8 +794,199 @@ class AbcAdvFs(AbcRuntime):
 
         self._localremove(srcs)
 
-    @abstractmethod
     def _localremove(self, srcs):
+        for src, err in self.bulk("rm", srcs):
+            if err:
+                FileException(self, errno=err, filename=src).raised()
+
+    BULK_OPS = ("rm", "mkdir", "chmod", "chown", "touch")
+
+    def bulk(self, op, paths, arg=None):
+        """
+        apply op on many entries with a single remote command
+
+        op is one of BULK_OPS, arg is the mode for chmod and "user:group" for chown.
+        the path list is sent to the entity as a file, its length is not limited by the command line size
+
+        return a list of (path, errno), errno is 0 on success
+        """
+        if op not in self.BULK_OPS:
+            raise ValueError(f"unsupported bulk operation: {op}")
+
+        if op in ("chmod", "chown") and arg is None:
+            raise ValueError(f"{op} bulk operation requires an argument")
+
+        if isinstance(arg, int):
+            arg = b"%o" % arg
+        elif arg is not None:
+            arg = self.myrrh_os.shencode(arg)
+
+        paths = list(paths)
+        _paths = [self.myrrh_os.p(p) for p in paths]
+
+        failures = self._bulk(op, _paths, arg) if _paths else {}
+
+        return [(p, failures.get(_p, 0)) for p, _p in zip(paths, _paths)]
+
+    def _bulk_list(self, paths, sep, suffix=b"bulk"):
+        """
+        write the path list in a temporary file on the entity and return its path
+        """
+        path = self.myrrh_os.joinpath(self.myrrh_os.tmpdirb, b"%s%d.%s" % (self._chunk_file_name(), next(_bulk_ids), suffix))
+        with tempfile.SpooledTemporaryFile() as f:
+            for p in paths:
+                f.write(p)
+                f.write(sep)
+            f.seek(0)
+            self.myrrh_syscall.stream_out(path, f)
+
+        return path
+
+    @abstractmethod
+    def _bulk(self, op, paths, arg):
+        """
+        return failed paths with their errno
+        """
+
+    BATCH_OPS = ("stat", "exists", "listdir", "mkdir", "makedirs", "remove", "rmdir", "rmtree", "rename", "chmod")
+
+    def batch(self):
+        """
+        return a batch recording filesystem operations, they run with a single remote script
+
+        with advfs.batch() as batch:
+            st = batch.stat(path)
+            batch.rename(path, dest)
+
+        st.result()
+        """
+        return AdvFsBatch(self)
+
+    def _run_batch(self, ops):
+        commands = []
+        for op in ops:
+            if op.op not in self.BATCH_OPS:
+                raise ValueError(f"unsupported batch operation: {op.op}")
+
+            if op.op == "rename":
+                arg = self.myrrh_os.p(op.arg)
+            elif op.op == "chmod":
+                arg = b"%o" % op.arg
+            elif op.op == "makedirs":
+                arg = b"1" if op.arg else b"0"
+            else:
+                arg = None
+
+            commands.append((op.op, self.myrrh_os.p(op.path), arg))
+
+        records = self._batch(commands)
+
+        for index, op in enumerate(ops):
+            err, items = records.get(index, (errno.EIO, []))
+            if err:
+                op.errno = err
+                continue
+
+            if op.op == "stat":
+                mode, *fields = items[0].split(b":")
+                op.value = _mosfs.stat_result(int(mode, 16), *(int(f) for f in fields))
+            elif op.op == "exists":
+                op.value = bool(items)
+            elif op.op == "listdir":
+                _cast_ = self.myrrh_os.fdcast(op.path)
+                op.value = [_cast_(name) for name in items]
+
+            op.errno = 0
+
+    @staticmethod
+    def _batch_records(out, error_translate):
+        """
+        parse the batch script output, each operation is reported as NUL terminated fields:
+        index, error (empty on success), items then an empty field.
+        stat item is "mode:ino:dev:nlink:uid:gid:size:atime:mtime:ctime" with a hexadecimal mode
+        """
+        tokens = out.split(b"\0")
+        records = {}
+
+        start = 0
+        while start + 1 < len(tokens):
+            try:
+                end = tokens.index(b"", start + 2)
+            except ValueError:
+                break
+
+            index, err = tokens[start].strip(), tokens[start + 1]
+            if index.isdigit():
+                records[int(index)] = ((error_translate(err) or errno.EIO) if err else 0), tokens[start + 2 : end]
+
+            start = end + 1
+
+        return records
+
+    @abstractmethod
+    def _batch(self, ops):
+        """
+        run the (op, path, arg) operations, return the records parsed by _batch_records
+        """
+
+    HASH_ALGOS = ("md5", "sha1", "sha256", "sha512")
+
+    def hash_files(self, paths, algo=HASH_ALGO):
+        """
+        compute the digest of many files with a single remote command
+
+        return the list of hexadecimal digests, None for the entries which can not be read
+        """
+        if algo not in self.HASH_ALGOS:
+            raise ValueError(f"unsupported hash algorithm: {algo}")
+
+        paths = [self.myrrh_os.p(p) for p in paths]
+        digests = self._hash_files(paths, algo) if paths else {}
+
+        return [digests.get(p) for p in paths]
+
+    def _verify(self, paths, digests):
+        """
+        check the digests of the entity files match the expected ones
+        """
+        for path, expected, digest in zip(paths, digests, self.hash_files(paths, self.HASH_ALGO)):
+            if digest is None or digest != expected:
+                FileException(self, errno=errno.EIO, filename=path).raised()
+
+    @abstractmethod
+    def _hash_files(self, paths, algo):
+        """
+        return readable paths with their hexadecimal digest
+        """
+
+    ARCHIVE_COMPRESSIONS = (None, "gzip", "bzip2", "xz")
+
+    def archive(self, archive_name, root_dir, paths, compress=None):
+        """
+        create a tar archive on the entity with paths relative to root_dir
+
+        return False if the entity is not able to build it, the caller then falls back on local codecs
+        """
+        if compress not in self.ARCHIVE_COMPRESSIONS:
+            return False
+
+        root_dir = self.myrrh_os.p(root_dir) if root_dir else self.myrrh_os.curdirb
+        return self._archive(self.myrrh_os.p(archive_name), root_dir, [self.myrrh_os.p(p) for p in paths], compress)
+
+    def extract(self, archive_name, extract_dir):
+        """
+        extract a tar archive on the entity, compression is detected by the entity tar
+
+        return False if the entity is not able to extract it
+        """
+        return self._extract(self.myrrh_os.p(archive_name), self.myrrh_os.p(extract_dir))
+
+    @abstractmethod
+    def _archive(self, archive_name, root_dir, paths, compress):
+        ...
+
+    @abstractmethod
+    def _extract(self, archive_name, extract_dir):
         ...
 
 
@@ -17,6 +17,7 @@ from myrrh.core.services.system import (
     MIOException,
     AbcRuntime,
     ImplPropertyClass,
+    StatField,
 )
 
 from . import mimportlib
@@ -520,6 +521,79 @@ class AbcOsFs(AbcRuntime):
     def normpath(self, path):
         return self.myrrh_os.normpath(path)
 
+    _fs_list_supported = True
+
+    def _fs_list(self, path, fields=StatField(0)):
+        """
+        directory listing pages from the file system service, None if not supported by the provider
+        """
+        if not self._fs_list_supported:
+            return None
+
+        _path = self.myrrh_os.p(path)
+
+        try:
+            entries, cursor = self.myrrh_os.fs.list(_path, fields.value)
+        except NotImplementedError:
+            self._fs_list_supported = False
+            return None
+        except OSError as e:
+            MOsError(self, exc=e, args=(path,)).raised()
+
+        def _pages(entries, cursor):
+            try:
+                yield from entries
+                while cursor is not None:
+                    try:
+                        entries, cursor = self.myrrh_os.fs.list(_path, fields.value, cursor)
+                    except OSError as e:
+                        cursor = None
+                        MOsError(self, exc=e, args=(path,)).raised()
+                    yield from entries
+            finally:
+                # the listing is left before its end
+                if cursor is not None:
+                    try:
+                        self.myrrh_os.fs.close_cursor(cursor)
+                    except OSError:
+                        pass
+
+        return _pages(entries, cursor)
+
+    def _fs_listdir(self, path, perm=0):
+        """
+        perm skips the entries having none of its permission bits, as find -perm /perm does
+        """
+        entries = self._fs_list(path, StatField.MODE if perm else StatField(0))
+
+        if entries is None:
+            return None
+
+        _cast_ = self.myrrh_os.fdcast(path)
+        return [_cast_(e["name"]) for e in entries if not perm or e["st_mode"] & perm]
+
+    def _fs_scandir_list(self, path, perm=0):
+        entries = self._fs_list(path, StatField.FILE)
+
+        if entries is None:
+            return None
+
+        _cast_ = self.myrrh_os.fdcast(path)
+        _path = self.myrrh_os.p(path)
+
+        result = []
+        for e in entries:
+            if perm and not e["st_mode"] & perm:
+                continue
+
+            fstat = stat_result(
+                [e[f] for f in _stat_named_tuple_field_names],
+                {f: e.get(f, int(e[f[:-3]] * 1000000000)) for f in _stat_named_tuple_kfield_names},
+            )
+            result.append(self.DirEntry(_cast_(e["name"]), _cast_(self.myrrh_os.joinpath(_path, e["name"])), fstat, self.lstat))
+
+        return result
+
     @abstractmethod
     def listdir(self, path="."):
         ...
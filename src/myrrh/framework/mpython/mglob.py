@@ -1,3 +1,6 @@
+import fnmatch
+import os
+import re
 import typing
 
 from myrrh.core.interfaces import abstractmethod, ABC
@@ -46,7 +49,108 @@ class AbcGlob(_interface, AbcRuntimeDelegate):
     __delegated__ = {_interface: _interface.local_glob}
     __delegate_check_type__ = False
 
+    _glob_ignorecase = False
+
     def __init__(self, *a, **kwa):
         mod = mbuiltins.wrap_module(self.local_glob, self)
 
+        # tune module: glob.glob relies on the module iglob
+        self._local_iglob = mod.iglob
+        mod.iglob = self._myrrh_iglob
+
         self.__delegate__(_interface, mod)
+
+    def _myrrh_iglob(self, pathname, *, root_dir=None, dir_fd=None, recursive=False, include_hidden=False):
+        """Return an iterator which yields the paths matching a pathname pattern.
+
+        When possible, the pattern is matched by the entity in a single command,
+        otherwise the directory tree is walked level by level.
+        """
+        matches = None
+
+        if root_dir is None and dir_fd is None:
+            matches = self._remote_iglob(os.fspath(pathname), recursive, include_hidden)
+
+        if matches is None:
+            return self._local_iglob(
+                pathname,
+                root_dir=root_dir,
+                dir_fd=dir_fd,
+                recursive=recursive,
+                include_hidden=include_hidden,
+            )
+
+        return matches
+
+    def _glob_find(self, root: bytes, mindepth: int, maxdepth: int | None, name: bytes | None) -> list[bytes] | None:
+        """
+        list entries of root between mindepth and maxdepth, optional name is a hint pattern for the last level
+
+        Returns paths relative to root or None if the entity can not perform the search
+        """
+        return None
+
+    def _remote_iglob(self, pathname, recursive, include_hidden):
+        _cast_ = self.myrrh_os.fdcast(pathname)
+        pattern = self.myrrh_os.fsencode(pathname)
+
+        seps = self.myrrh_os.sepb + (self.myrrh_os.altsepb or b"")
+        tokens = re.split(b"([%s])" % re.escape(seps), pattern)
+        parts = tokens[0::2]
+
+        for first, part in enumerate(parts):
+            if self.local_glob.has_magic(part):
+                break
+        else:
+            return None
+
+        prefix = b"".join(tokens[: 2 * first])
+        parts = [b"*" if p == b"**" and not recursive else p for p in parts[first:]]
+
+        # edge cases stdlib glob handles differently
+        if b"" in parts or b"." in parts or b".." in parts or parts[-1] == b"**" or parts.count(b"**") > 1:
+            return None
+
+        if self._glob_ignorecase and (b":" in pattern[len(prefix) :] or not all(map(self.local_glob.has_magic, parts))):
+            return None
+
+        stars = parts.count(b"**")
+        mindepth = len(parts) - stars
+        maxdepth = None if stars else len(parts)
+
+        name = parts[-1]
+        if b"[" in name or b"\\" in name:
+            name = None
+
+        entries = self._glob_find(prefix or self.myrrh_os.curdirb, mindepth, maxdepth, name)
+        if entries is None:
+            return None
+
+        flags = re.IGNORECASE if self._glob_ignorecase else 0
+        regexes = [None if p == b"**" else self._glob_compile(p, include_hidden, flags) for p in parts]
+        split = re.compile(b"[%s]" % re.escape(seps)).split
+
+        return (_cast_(prefix + entry) for entry in entries if self._glob_match(regexes, split(entry), include_hidden))
+
+    @staticmethod
+    def _glob_compile(part: bytes, include_hidden: bool, flags: int):
+        regex = fnmatch.translate(str(part, "ISO-8859-1"))
+        if not include_hidden and not part.startswith(b"."):
+            regex = r"(?!\.)" + regex
+
+        return re.compile(bytes(regex, "ISO-8859-1"), flags)
+
+    @staticmethod
+    def _glob_match(regexes, names, include_hidden):
+        def match(i, j):
+            if i == len(regexes):
+                return j == len(names)
+
+            if regexes[i] is None:
+                if match(i + 1, j):
+                    return True
+                return j < len(names) and (include_hidden or not names[j].startswith(b".")) and match(i, j + 1)
+
+            return j < len(names) and regexes[i].match(names[j]) is not None and match(i + 1, j + 1)
+
+        return match(0, 0)
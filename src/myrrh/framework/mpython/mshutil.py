@@ -1,4 +1,5 @@
 import os
+import stat
 import typing
 
 from myrrh.core.interfaces import abstractmethod, ABC
@@ -6,6 +7,7 @@ from myrrh.core.services.system import AbcRuntimeDelegate
 
 from . import mbuiltins
 from . import mimportlib
+from ..mfs import madvfs
 
 __mlib__ = "AbcShutil"
 
@@ -253,6 +255,7 @@ class AbcShutil(_interface, AbcRuntimeDelegate):
     ]
 
     os = mimportlib.module_property("os")
+    advfs = mimportlib.module_property(madvfs)
 
     __delegated__ = {_interface: _interface.local_shutil}
     __delegate_check_type__ = False
@@ -265,6 +268,18 @@ class AbcShutil(_interface, AbcRuntimeDelegate):
 
         mod._HAS_FCOPYFILE = False
 
+        self._local_rmtree = mod.rmtree
+        mod.rmtree = self._myrrh_rmtree
+
+        self._local_make_tarball = mod._make_tarball
+        self._local_unpack_tarfile = mod._unpack_tarfile
+        for name, (func, *info) in mod._ARCHIVE_FORMATS.items():
+            if func is mod._make_tarball:
+                mod._ARCHIVE_FORMATS[name] = (self._myrrh__make_tarball, *info)
+        for name, (exts, func, *info) in mod._UNPACK_FORMATS.items():
+            if func is mod._unpack_tarfile:
+                mod._UNPACK_FORMATS[name] = (exts, self._myrrh__unpack_tarfile, *info)
+
         self.__delegate__(_interface, mod)
 
     def _myrrh_disk_usage(self, path):
@@ -282,6 +297,84 @@ class AbcShutil(_interface, AbcRuntimeDelegate):
         used = (st.f_blocks - st.f_bfree) * st.f_frsize
         return _ntuple_diskusage(total, used, free)
 
+    def _myrrh_rmtree(self, path, ignore_errors=False, onerror=None, *, dir_fd=None):
+        """Recursively delete a directory tree.
+
+        A plain directory is removed by the entity in a single command, other cases
+        and failures go through the standard walk to report errors as shutil does.
+        """
+        if onerror is None and dir_fd is None:
+            try:
+                st = self.os.lstat(path)
+            except OSError:
+                st = None
+
+            if st is not None and stat.S_ISDIR(st.st_mode) and not getattr(st, "st_reparse_tag", 0):
+                ((_, err),) = self.advfs.bulk("rm", [path])
+                if not err:
+                    return
+
+        return self._local_rmtree(path, ignore_errors, onerror, dir_fd=dir_fd)
+
+    _myrrh_rmtree.avoids_symlink_attacks = False  # type: ignore[attr-defined]
+
+    _TAR_COMPRESSIONS = {None: "", "gzip": ".gz", "bzip2": ".bz2", "xz": ".xz"}
+
+    def _myrrh__make_tarball(
+        self,
+        base_name,
+        base_dir,
+        compress="gzip",
+        verbose=0,
+        dry_run=0,
+        owner=None,
+        group=None,
+        logger=None,
+        root_dir=None,
+    ):
+        """Create a (possibly compressed) tar file from all the files under
+        'base_dir'.
+
+        The archive is built by the entity tar when available, ownership changes and
+        dry runs go through the standard implementation.
+        """
+        if not dry_run and owner is None and group is None and compress in self._TAR_COMPRESSIONS:
+            os = self.os
+            archive_name = os.path.abspath(os.fspath(base_name) + ".tar" + self._TAR_COMPRESSIONS[compress])
+            archive_dir = os.path.dirname(archive_name)
+
+            if not os.path.exists(archive_dir):
+                if logger is not None:
+                    logger.info("creating %s", archive_dir)
+                os.makedirs(archive_dir)
+
+            if logger is not None:
+                logger.info("Creating tar archive")
+
+            if self.advfs.archive(archive_name, os.path.abspath(root_dir or os.curdir), [os.fspath(base_dir)], compress):
+                return archive_name
+
+        return self._local_make_tarball(
+            base_name,
+            base_dir,
+            compress,
+            verbose,
+            dry_run,
+            owner,
+            group,
+            logger,
+            root_dir=root_dir,
+        )
+
+    def _myrrh__unpack_tarfile(self, filename, extract_dir, *, filter=None):
+        """Unpack tar/tar.gz/tar.bz2/tar.xz `filename` to `extract_dir`"""
+        if filter is None:
+            os = self.os
+            if self.advfs.extract(os.path.abspath(filename), os.path.abspath(extract_dir)):
+                return
+
+        return self._local_unpack_tarfile(filename, extract_dir, filter=filter)
+
     def _myrrh__unpack_zipfile(self, filename, extract_dir):
         """Unpack zip `filename` to `extract_dir`"""
         raise NotImplementedError
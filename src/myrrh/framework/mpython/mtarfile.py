@@ -4,6 +4,8 @@ from myrrh.core.interfaces import abstractmethod, ABC
 from myrrh.core.services.system import AbcRuntimeDelegate
 
 from . import mbuiltins
+from . import mimportlib
+from ..mfs import madvfs
 
 __mlib__ = "AbcTarFile"
 
@@ -170,7 +172,34 @@ class AbcTarFile(_interface, AbcRuntimeDelegate):
 
     __name__ = _interface.local_tarfile.__name__
 
+    os = mimportlib.module_property("os")
+    advfs = mimportlib.module_property(madvfs)
+
     def __init__(self, *a, **kwa):
         mod = mbuiltins.wrap_module(self.local_tarfile, self)
 
+        # tune module
+        runtime = self
+        self._local_extractall = mod.TarFile.extractall
+
+        def extractall(tarfile, path=".", members=None, *, numeric_owner=False, filter=None):
+            return runtime._myrrh_extractall(tarfile, path, members, numeric_owner=numeric_owner, filter=filter)
+
+        mod.TarFile.extractall = extractall
+
         self.__delegate__(_interface, mod)
+
+    def _myrrh_extractall(self, tarfile, path=".", members=None, *, numeric_owner=False, filter=None):
+        """Extract all members from the archive to the current working
+        directory and set owner, modification time and permissions on
+        directories afterwards.
+
+        An archive opened by name for reading is extracted by the entity tar when
+        no member selection, ownership or filter is requested.
+        """
+        if members is None and not numeric_owner and filter is None and getattr(tarfile, "extraction_filter", None) is None and tarfile.mode == "r" and tarfile.name and not tarfile._extfileobj:
+            os = self.os
+            if self.advfs.extract(os.path.abspath(tarfile.name), os.path.abspath(path)):
+                return
+
+        return self._local_extractall(tarfile, path, members, numeric_owner=numeric_owner, filter=filter)
@@ -7,13 +7,18 @@ This module provides advanced shell operations such as polling and predefined ru
 
 .. seealso:: :class:`myrrh.core.service.IShellService`
 """
+import mmap
+import os
+import queue
 import statistics
+import tempfile
 import threading
 import weakref
 
 from myrrh.utils import mtimer, mshlex
 
 from myrrh.core.interfaces import IInStream, IProcess
+from myrrh.core.services import cfg_init
 from myrrh.core.services.system import AbcRuntime, InheritedPropertyClass
 from myrrh.utils import mstring
 
@@ -23,6 +28,13 @@ _FAKE_PROC_START_PID = 90000
 _fake_proc_count = 0
 
 
+def _unlink(path):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
 def _fakepid():
     global _fake_proc_count
     _fake_proc_count += 1
@@ -75,8 +87,20 @@ class AbcAdvSh(AbcRuntime):
             poll=None,
             raiseonttl=None,
             raiseontimeout=True,
+            consumer=None,
+            lines=False,
+            deferred=False,
         ):
+            """
+            consumer(stream, data) is called from reader threads with "out" or "err" data as soon as it is read,
+            per line if lines is set. Raising Abort terminates the process and stops the executions,
+            AbortAndContinue only terminates the current one.
+
+            A deferred execution only runs when iterated, see also events().
+            """
             self._cmd = cmd
+            self._consumer = consumer
+            self._lines = lines
             if isinstance(cmd, (str, bytes)):
                 if path:
                     raise ValueError("bytes or string is not supported for cmd when path parameter is set")
@@ -123,7 +147,7 @@ class AbcAdvSh(AbcRuntime):
             elif path:
                 self._args = mshlex.list2cmdlineb(self._args)
 
-            if self.__oneexecution:
+            if self.__oneexecution and not deferred:
                 self.values()
 
         @property
@@ -163,7 +187,7 @@ class AbcAdvSh(AbcRuntime):
                     try:
                         with self.__ttl_timer:
                             try:
-                                with _ExecutionInformation(proc=proc, cast=self._cast) as exe:
+                                with _ExecutionInformation(proc=proc, cast=self._cast, consumer=self._consumer, lines=self._lines) as exe:
                                     proc.exec()
 
                                     self.append(exe)
@@ -184,6 +208,12 @@ class AbcAdvSh(AbcRuntime):
 
                                 yield self[-1]
 
+                                if exe.abort is not None:
+                                    if not isinstance(exe.abort, AdvSh.Abort):
+                                        raise exe.abort
+                                    if not isinstance(exe.abort, AdvSh.AbortAndContinue):
+                                        break
+
                                 if cause == "killed" and self.__raiseonttl:
                                     raise AdvSh.TTLExpired(
                                         cmd=self,
@@ -232,6 +262,53 @@ class AbcAdvSh(AbcRuntime):
                     pass
             return self
 
+        def events(self, lines=False):
+            """
+            run a deferred execution and iterate over its (stream, data) events as they are read,
+            leaving the iteration terminates the process
+            """
+            if self.ncalls or self.__global_timer.endtime:
+                raise RuntimeError("execution already started")
+
+            events = queue.Queue()
+            stopped = threading.Event()
+            consumer, lines_ = self._consumer, self._lines
+            end = object()
+
+            def put(stream, data):
+                if consumer:
+                    consumer(stream, data)
+                if stopped.is_set():
+                    raise AdvSh.Abort()
+                events.put((stream, data))
+
+            def run():
+                try:
+                    self.values()
+                except BaseException as e:
+                    events.put((end, e))
+                else:
+                    events.put((end, None))
+
+            self._consumer, self._lines = put, lines
+            runner = threading.Thread(target=run, daemon=True)
+            runner.start()
+
+            try:
+                while True:
+                    stream, data = events.get()
+                    if stream is end:
+                        if data is not None:
+                            raise data
+                        break
+                    yield stream, data
+            finally:
+                stopped.set()
+                for exe in self.calls:
+                    exe.proc.terminate()
+                runner.join()
+                self._consumer, self._lines = consumer, lines_
+
         def iter(self):
             yield self.__iter__()
 
@@ -310,6 +387,9 @@ class _AdvshellFakeProc:
     def is_running(self):
         return False
 
+    def wait(self, timeout=None):
+        return self._rval
+
     def terminate(self):
         pass
 
@@ -406,23 +486,170 @@ class _AdvshellProc:
             self._proc.terminate()
             self._exit_status = self.system.myrrh_syscall.wait(self._proc)
 
+    def wait(self, timeout=None):
+        if not self.closed and self._pid:
+            return self.system.myrrh_syscall.wait(self._proc, timeout)
+
     @property
     def pid(self):
         return self._pid
 
 
+class _OutputCapture:
+    """
+    Captured output of a process.
+
+    At most max_size bytes are kept (None: no limit), the first ones or, in tail mode, the last ones.
+    Data is moved to a temporary file once spill_size bytes are stored (None: never), the file is closed
+    by close and removed with the capture.
+    """
+
+    COPY_BUFSIZE = 1024 * 64
+
+    def __init__(self, max_size=None, tail=False, spill_size=None):
+        self.max_size = max_size
+        self.tail = tail
+        self.spill_size = spill_size
+        self.dropped = 0
+
+        self._buf = bytearray()
+        self._path = None
+        self._file = None
+        self._size = 0
+        self._start = 0
+
+    def __len__(self):
+        return self._size - self._start
+
+    def clear(self):
+        self._buf.clear()
+        if self._path is not None:
+            file = self._open()
+            file.seek(0)
+            file.truncate()
+
+        self._size = self._start = self.dropped = 0
+
+    def extend(self, data):
+        if not data:
+            return
+
+        if self.max_size is not None and not self.tail:
+            room = max(self.max_size - len(self), 0)
+            if len(data) > room:
+                self.dropped += len(data) - room
+                data = data[:room]
+
+                if not data:
+                    return
+
+        if self._path is None and self.spill_size is not None and self._size + len(data) > self.spill_size:
+            self._spill()
+
+        if self._path is None:
+            self._buf += data
+        else:
+            self._open().write(data)
+
+        self._size += len(data)
+
+        if self.tail and self.max_size is not None and len(self) > self.max_size:
+            dropped = len(self) - self.max_size
+            self._start += dropped
+            self.dropped += dropped
+
+            # kept data moves back at the beginning once the discarded data reaches its size
+            if self._start >= max(self.max_size, self.COPY_BUFSIZE):
+                self._compact()
+
+    def _spill(self):
+        fd, self._path = tempfile.mkstemp(prefix="myrrh-")
+        weakref.finalize(self, _unlink, self._path)
+
+        self._file = open(fd, "w+b")
+        self._file.write(self._buf)
+        self._buf = bytearray()
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self._path, "r+b")
+            self._file.seek(self._size)
+
+        return self._file
+
+    def _compact(self):
+        if self._path is None:
+            del self._buf[: self._start]
+        else:
+            file = self._open()
+            pos = 0
+            while pos < len(self):
+                file.seek(self._start + pos)
+                data = file.read(self.COPY_BUFSIZE)
+                file.seek(pos)
+                file.write(data)
+                pos += len(data)
+
+            file.truncate(pos)
+
+        self._size -= self._start
+        self._start = 0
+
+    def _map(self, file, cast):
+        with mmap.mmap(file.fileno(), self._size, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view, view[self._start : self._size] as data:
+                return cast(data)
+
+    def getvalue(self, cast=bytes):
+        """
+        return cast applied on a view of the captured data, the view is released once cast returns
+        """
+        if self._path is None:
+            with memoryview(self._buf) as view, view[self._start :] as data:
+                return cast(data)
+
+        if not len(self):
+            return cast(b"")
+
+        if self._file is not None:
+            self._file.flush()
+            return self._map(self._file, cast)
+
+        with open(self._path, "rb") as file:
+            return self._map(file, cast)
+
+    def close(self):
+        """
+        close the temporary file, the captured data stays readable
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
 class _ExecutionInformation:
-    MAX_BUFFER_SIZE = 50000
+    # spilling bounds the memory used, the output is only cut when a size is set
+    CAPTURE_MAX_SIZE = cfg_init("advsh_capture_max_size", None, section="myrrh.framework.msh")
+    CAPTURE_TAIL = cfg_init("advsh_capture_tail", False, section="myrrh.framework.msh")
+    CAPTURE_SPILL_SIZE = cfg_init("advsh_capture_spill_size", 1024 * 1024, section="myrrh.framework.msh")
 
-    def __init__(self, proc, cast, **kwargs):
+    def __init__(self, proc, cast, consumer=None, lines=False, **kwargs):
         self._proc = proc
         self._cast = cast
         self._timer = mtimer.MTimer()
         self._state = None
 
+        self._consumer = consumer
+        self._lines = lines
+        self._partial = {"out": bytearray(), "err": bytearray()}
+        self._pumps = []
+        self._watcher = None
+        self._wakeup = threading.Event()
+        self.abort = None
+
         self._buflock = threading.RLock()
-        self._out = bytearray(self.MAX_BUFFER_SIZE)
-        self._err = bytearray(self.MAX_BUFFER_SIZE)
+        self._out = _OutputCapture(self.CAPTURE_MAX_SIZE, self.CAPTURE_TAIL, self.CAPTURE_SPILL_SIZE)
+        self._err = _OutputCapture(self.CAPTURE_MAX_SIZE, self.CAPTURE_TAIL, self.CAPTURE_SPILL_SIZE)
 
         self._closed = False
 
@@ -449,33 +676,136 @@ class _ExecutionInformation:
         self.close()
         self._timer.stop()
 
+    def _deliver(self, stream, data, final=False):
+        if self._lines:
+            partial = self._partial[stream]
+            partial += data
+            end = len(partial) if final else partial.rfind(b"\n") + 1
+            data = bytes(partial[:end])
+            del partial[:end]
+            chunks = data.splitlines(keepends=True)
+        else:
+            chunks = [data] if data else []
+
+        for chunk in chunks:
+            self._consumer(stream, self._cast(chunk))
+
+    def _feed(self, stream, data):
+        with self._buflock:
+            (self._out if stream == "out" else self._err).extend(data)
+
+        if self.abort is None:
+            try:
+                with self._buflock:
+                    self._deliver(stream, data)
+            except BaseException as e:
+                self.abort = e
+                self.state = "aborted"
+                self._proc.terminate()
+
+    def _pump(self, stream, read):
+        while True:
+            try:
+                data = read(timeout=None)
+            except (OSError, RuntimeError):
+                data = None
+
+            if not data:
+                break
+
+            self._feed(stream, data)
+
+        if self.abort is None and self._lines:
+            try:
+                self._deliver(stream, b"", final=True)
+            except BaseException as e:
+                self.abort = e
+
+        # the stream is closed, the process is exiting
+        self._wakeup.set()
+
+    def _start_pumps(self):
+        for stream, read in (("out", self._proc.output), ("err", self._proc.error)):
+            pump = threading.Thread(target=self._pump, args=(stream, read), daemon=True)
+            pump.start()
+            self._pumps.append(pump)
+
+    def _join_pumps(self, timeout=None):
+        for pump in self._pumps:
+            pump.join(timeout)
+
+    def _watch(self):
+        try:
+            self._proc.wait()
+        except Exception:
+            pass
+
+        # the process exited, its output may still be open in a child
+        self._wakeup.set()
+
+    def _start_watcher(self):
+        if self._watcher is None:
+            self._watcher = threading.Thread(target=self._watch, daemon=True)
+            self._watcher.start()
+
     def communicate(self, timeout=None):
         # wait en of proc
-        com_timer = mtimer.MBurstTimer(timeout=timeout, raise_on_expired=True)
-        self._out.clear()
-        self._err.clear()
+        com_timer = mtimer.MBurstTimer(timeout=timeout, raise_on_expired=True, wakeup=self._wakeup)
+        with self._buflock:
+            self._out.clear()
+            self._err.clear()
+
+        self._start_watcher()
+
+        if self._consumer:
+            # reader threads deliver data as soon as it reaches the pipes
+            if not self._pumps:
+                self._start_pumps()
+
+            while self._proc.exit_status is None:
+                com_timer.idle
+
+            # the output is delivered up to its end
+            self._join_pumps()
+            return
 
         while True:
             if self._proc.exit_status is not None:
                 break
 
+            data = False
             try:
-                self._out.extend(self._proc.output(timeout=com_timer.timeleft) or b"")
+                out = self._proc.output(timeout=com_timer.timeleft)
+                self._out.extend(out or b"")
+                data = bool(out)
             except TimeoutError:
                 ...
 
             try:
-                self._err.extend(self._proc.error(timeout=com_timer.timeleft) or b"")
+                err = self._proc.error(timeout=com_timer.timeleft)
+                self._err.extend(err or b"")
+                data = data or bool(err)
             except TimeoutError:
                 ...
+
+            if data:
+                # the process is active, check again without waiting
+                com_timer.wake()
+
             com_timer.idle
 
     def close(self):
         if not self._closed:
             self.proc.terminate()
-            self._out.extend(self._proc.output() or b"")
-            self._err.extend(self._proc.error() or b"")
+            if self._pumps:
+                self._join_pumps()
+            else:
+                self._out.extend(self._proc.output() or b"")
+                self._err.extend(self._proc.error() or b"")
             self.proc.close()
+            with self._buflock:
+                self._out.close()
+                self._err.close()
             self._closed = True
 
     @property
@@ -516,11 +846,18 @@ class _ExecutionInformation:
 
     @property
     def out(self):
-        return self._cast(self._out)
+        return self._out.getvalue(self._cast)
 
     @property
     def err(self):
-        return self._cast(self._err)
+        return self._err.getvalue(self._cast)
+
+    @property
+    def dropped(self):
+        """
+        number of output and error bytes discarded by the capture limits
+        """
+        return self._out.dropped, self._err.dropped
 
     @property
     def rval(self):
@@ -0,0 +1,270 @@
+"""
+**Periodic executions scheduler**
+
+Runs commands periodically on many entities over a shared worker pool.
+
+A job runs a command with the advanced shell of an entity every interval seconds, the first run is
+delayed by a random jitter to spread the load. A run is skipped if the previous one has not ended yet
+and the dispatch waits for a free worker when they are all busy. Results are published on a bounded
+queue, the oldest result is dropped when the queue is full, and/or given to a callback.
+
+    with bmy.select(eid):
+        from mlib.sh import advsh
+
+    with Scheduler() as scheduler:
+        scheduler.add(advsh, "df -h", 5)
+        result = scheduler.results.get()
+
+-----------------
+"""
+import collections
+import heapq
+import itertools
+import queue
+import random
+import statistics
+import threading
+import time
+import typing
+
+from concurrent.futures import ThreadPoolExecutor
+
+from myrrh.core.services import cfg_init
+from myrrh.core.services.logging import log
+
+__all__ = ("Scheduler", "Job", "JobResult")
+
+
+class JobResult(typing.NamedTuple):
+    job: "Job"
+    exe: typing.Any
+    error: BaseException | None
+    scheduled: float
+    started: float
+    ended: float
+
+    @property
+    def lag(self):
+        return self.started - self.scheduled
+
+    @property
+    def latency(self):
+        return self.ended - self.started
+
+
+class Job:
+    STATS_LEN = 100
+
+    def __init__(self, advsh, cmd, interval, *, name=None, jitter=0.0, **kwargs):
+        if interval <= 0:
+            raise ValueError("interval must be strictly positive")
+
+        self.advsh = advsh
+        self.cmd = cmd
+        self.interval = interval
+        self.name = name or str(cmd)
+        self.kwargs = kwargs
+
+        self.runs = 0
+        self.skipped = 0
+        self.errors = 0
+
+        self._jitter = jitter
+        self._latencies: collections.deque[float] = collections.deque(maxlen=self.STATS_LEN)
+        self._lags: collections.deque[float] = collections.deque(maxlen=self.STATS_LEN)
+        self._running = False
+        self._cancelled = False
+        self._base = 0.0
+
+    def __repr__(self):
+        return "<Job %s every %ss>" % (self.name, self.interval)
+
+    def _next(self, now=None):
+        self._base = now if now is not None else self._base + self.interval
+        return self._base + random.uniform(0, self._jitter * self.interval)
+
+    def _run(self, scheduled):
+        started = time.monotonic()
+        exe = error = None
+
+        try:
+            exe = self.advsh.execute(self.cmd, **self.kwargs)
+        except Exception as e:
+            error = e
+
+        ended = time.monotonic()
+
+        self.runs += 1
+        self.errors += error is not None
+        self._latencies.append(ended - started)
+        self._lags.append(started - scheduled)
+
+        return JobResult(self, exe, error, scheduled, started, ended)
+
+    @property
+    def running(self):
+        return self._running
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    @property
+    def stats(self):
+        latencies = list(self._latencies)
+        lags = list(self._lags)
+
+        return {
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "latency_mean": statistics.fmean(latencies) if latencies else None,
+            "latency_max": max(latencies) if latencies else None,
+            "latency_p95": statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else None,
+            "lag_max": max(lags) if lags else None,
+        }
+
+
+class Scheduler:
+    MAX_WORKERS = cfg_init("scheduler_max_workers", 16, section="myrrh.framework.msh")
+    JITTER = cfg_init("scheduler_jitter", 0.1, section="myrrh.framework.msh")
+    QUEUE_SIZE = cfg_init("scheduler_queue_size", 1024, section="myrrh.framework.msh")
+
+    def __init__(self, max_workers=None, *, jitter=None, callback=None, maxsize=None):
+        """
+        callback(result) is called from the worker threads with each JobResult
+        """
+        self.max_workers = max_workers or self.MAX_WORKERS
+        self.jitter = self.JITTER if jitter is None else jitter
+        self.callback = callback
+        self.results: queue.Queue[JobResult] = queue.Queue(self.QUEUE_SIZE if maxsize is None else maxsize)
+        self.dropped = 0
+
+        self._jobs: list[Job] = list()
+        self._heap: list[tuple[float, int, Job]] = list()
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._slots = threading.Semaphore(self.max_workers)
+        self._pool = None
+        self._dispatcher = None
+        self._stopped = True
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *_a, **_k):
+        self.stop()
+
+    @property
+    def jobs(self):
+        with self._cond:
+            return list(self._jobs)
+
+    def add(self, advsh, cmd, interval, *, name=None, **kwargs):
+        """
+        schedule cmd every interval seconds, advsh can be a group of advanced shells, a job is then created per member.
+        kwargs are given to advsh.execute
+        """
+        if isinstance(advsh, (list, tuple)):
+            return [self.add(a, cmd, interval, name=name, **kwargs) for a in advsh]
+
+        job = Job(advsh, cmd, interval, name=name, jitter=self.jitter, **kwargs)
+
+        with self._cond:
+            self._jobs.append(job)
+            self._push(job, job._next(time.monotonic()))
+            self._cond.notify()
+
+        return job
+
+    def remove(self, job):
+        with self._cond:
+            job._cancelled = True
+            self._jobs.remove(job)
+
+    def start(self):
+        with self._cond:
+            if not self._stopped:
+                return
+
+            self._stopped = False
+            self._pool = ThreadPoolExecutor(self.max_workers, "MyrrhScheduler")
+            self._dispatcher = threading.Thread(target=self._dispatch, name="MyrrhSchedulerDispatch", daemon=True)
+            self._dispatcher.start()
+
+    def stop(self, wait=True):
+        with self._cond:
+            if self._stopped:
+                return
+
+            self._stopped = True
+            self._cond.notify()
+
+        # a dispatcher waiting for a free worker is released
+        self._slots.release()
+        self._dispatcher.join()
+        self._slots.acquire()
+        self._pool.shutdown(wait=wait)
+
+    def _push(self, job, when):
+        heapq.heappush(self._heap, (when, next(self._seq), job))
+
+    def _dispatch(self):
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    timeout = None
+                    if self._heap:
+                        timeout = self._heap[0][0] - time.monotonic()
+                        if timeout <= 0:
+                            break
+                    self._cond.wait(timeout)
+
+                if self._stopped:
+                    return
+
+                scheduled, _, job = heapq.heappop(self._heap)
+                if job.cancelled:
+                    continue
+
+                self._push(job, job._next())
+
+                if job.running:
+                    job.skipped += 1
+                    continue
+
+                job._running = True
+
+            # backpressure, the dispatch waits for a free worker
+            self._slots.acquire()
+            if self._stopped:
+                job._running = False
+                self._slots.release()
+                return
+
+            self._pool.submit(self._execute, job, scheduled)
+
+    def _execute(self, job, scheduled):
+        try:
+            result = job._run(scheduled)
+        finally:
+            job._running = False
+            self._slots.release()
+
+        if self.callback:
+            try:
+                self.callback(result)
+            except Exception as e:
+                log.debug("scheduler callback failed for %s: %s" % (job, e))
+
+        while True:
+            try:
+                self.results.put_nowait(result)
+                break
+            except queue.Full:
+                try:
+                    self.results.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
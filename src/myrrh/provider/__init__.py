@@ -2,6 +2,7 @@
 
 from ._iprovider import *
 from ._iservices import *
+from ._ipool import *
 
 
 def service_fullname(service):
@@ -0,0 +1,306 @@
+import abc
+import collections
+import contextlib
+import threading
+import time
+import typing
+
+__all__ = ("ISession", "SessionPool")
+
+
+class ISession(abc.ABC):
+    """
+    Provider session, a connection or a process reused by many calls
+    """
+
+    @abc.abstractmethod
+    def alive(self) -> bool:
+        ...
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        ...
+
+
+class _Sessions:
+    __slots__ = ("idle", "busy")
+
+    def __init__(self):
+        # (session, idle since), the most recently released is on the right
+        self.idle: collections.deque[tuple[ISession, float]] = collections.deque()
+        self.busy = 0
+
+    def __len__(self):
+        return len(self.idle) + self.busy
+
+
+class SessionPool:
+    """
+    Keyed session pool, a key is typically an entity or a connection target.
+
+    At most max_size sessions are opened per key, it is also the number of concurrent calls a key accepts,
+    acquire waits for a session to be released beyond. A session idle for more than max_idle seconds is
+    closed unless min_size sessions remain for its key. A session idle for more than check_idle seconds is
+    checked before being reused.
+
+    At most max_keys keys are kept, the idle sessions of the least recently used key without busy session
+    are closed to make room for a new key, acquire waits for one beyond.
+    """
+
+    def __init__(
+        self,
+        factory: typing.Callable[[typing.Hashable], ISession],
+        *,
+        min_size: int = 0,
+        max_size: int = 4,
+        max_idle: float = 60.0,
+        check_idle: float = 0.0,
+        max_keys: int | None = 64,
+    ):
+        if max_size < 1 or min_size > max_size:
+            raise ValueError("invalid pool size: %d..%d" % (min_size, max_size))
+
+        if max_keys is not None and max_keys < 1:
+            raise ValueError("invalid pool keys: %d" % max_keys)
+
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.check_idle = check_idle
+        self.max_keys = max_keys
+
+        # the least recently used key first
+        self._sessions: dict[typing.Hashable, _Sessions] = dict()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._counters = collections.Counter[str]()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_a, **_k):
+        self.close()
+
+    def _expired(self, sessions, now):
+        expired = list()
+
+        while sessions.idle and len(sessions) > self.min_size and now - sessions.idle[0][1] > self.max_idle:
+            expired.append(sessions.idle.popleft()[0])
+
+        self._counters["evicted"] += len(expired)
+        return expired
+
+    def _expired_all(self, now):
+        expired = list()
+
+        for key, sessions in list(self._sessions.items()):
+            expired.extend(self._expired(sessions, now))
+            self._drop(key, sessions)
+
+        return expired
+
+    def _drop(self, key, sessions):
+        if not len(sessions) and self._sessions.get(key) is sessions:
+            del self._sessions[key]
+
+    def _use(self, key, expired):
+        """
+        the sessions of key, None if there is no room for a new key
+        """
+        sessions = self._sessions.pop(key, None)
+
+        if sessions is None and self.max_keys is not None and len(self._sessions) >= self.max_keys:
+            lru = next((k for k, s in self._sessions.items() if not s.busy), None)
+            if lru is None:
+                return None
+
+            idle = self._sessions.pop(lru).idle
+            self._counters["evicted"] += len(idle)
+            expired.extend(s for s, _ in idle)
+
+        if sessions is None:
+            sessions = _Sessions()
+
+        self._sessions[key] = sessions
+        return sessions
+
+    @staticmethod
+    def _close(sessions):
+        for session in sessions:
+            try:
+                session.close()
+            except Exception:
+                pass
+
+    def _create(self, key):
+        try:
+            session = self.factory(key)
+        except BaseException:
+            with self._cond:
+                sessions = self._sessions[key]
+                sessions.busy -= 1
+                self._drop(key, sessions)
+                self._cond.notify_all()
+            raise
+
+        with self._cond:
+            self._counters["created"] += 1
+
+        return session
+
+    def acquire(self, key: typing.Hashable, timeout: float | None = None) -> ISession:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waited = False
+
+        while True:
+            expired: list[ISession] = list()
+            try:
+                with self._cond:
+                    expired.extend(self._expired_all(time.monotonic()))
+
+                    while True:
+                        if self._closed:
+                            raise ValueError("session pool closed")
+
+                        sessions = self._use(key, expired)
+                        if sessions is not None and (sessions.idle or len(sessions) < self.max_size):
+                            break
+
+                        if not waited:
+                            waited = True
+                            self._counters["waits"] += 1
+
+                        remaining = None if deadline is None else deadline - time.monotonic()
+                        if remaining is not None and remaining <= 0:
+                            self._counters["timeouts"] += 1
+                            raise TimeoutError("no session available for %s" % (key,))
+
+                        self._cond.wait(remaining)
+
+                    now = time.monotonic()
+                    expired.extend(self._expired(sessions, now))
+                    sessions.busy += 1
+
+                    session, since = sessions.idle.pop() if sessions.idle else (None, now)
+            finally:
+                self._close(expired)
+
+            if session is None:
+                return self._create(key)
+
+            if now - since <= self.check_idle or self._alive(session):
+                with self._cond:
+                    self._counters["reused"] += 1
+                return session
+
+            self._close((session,))
+
+            with self._cond:
+                sessions.busy -= 1
+                self._counters["discarded"] += 1
+                self._drop(key, sessions)
+                self._cond.notify_all()
+
+    @staticmethod
+    def _alive(session):
+        try:
+            return session.alive()
+        except Exception:
+            return False
+
+    def release(self, key: typing.Hashable, session: ISession, discard: bool = False) -> None:
+        with self._cond:
+            sessions = self._sessions[key]
+            sessions.busy -= 1
+
+            discard = discard or self._closed
+            if discard:
+                self._counters["discarded"] += 1
+            else:
+                sessions.idle.append((session, time.monotonic()))
+
+            expired = self._expired_all(time.monotonic())
+            self._drop(key, sessions)
+            self._cond.notify_all()
+
+        self._close(expired)
+        if discard:
+            self._close((session,))
+
+    @contextlib.contextmanager
+    def session(self, key: typing.Hashable, timeout: float | None = None):
+        """
+        the session is discarded if the call fails, its state is unknown
+        """
+        session = self.acquire(key, timeout)
+        try:
+            yield session
+        except BaseException:
+            self.release(key, session, discard=True)
+            raise
+        else:
+            self.release(key, session)
+
+    def fill(self, key: typing.Hashable) -> None:
+        """
+        open sessions up to min_size for key, nothing is opened if there is no room for a new key
+        """
+        while True:
+            expired: list[ISession] = list()
+            try:
+                with self._cond:
+                    if self._closed:
+                        raise ValueError("session pool closed")
+
+                    sessions = self._use(key, expired)
+                    if sessions is None or len(sessions) >= self.min_size:
+                        return
+
+                    sessions.busy += 1
+            finally:
+                self._close(expired)
+
+            self.release(key, self._create(key))
+
+    def evict(self) -> None:
+        """
+        close idle sessions expired, the pool does it on each acquire and release
+        """
+        with self._cond:
+            expired = self._expired_all(time.monotonic())
+
+        self._close(expired)
+
+    def close(self) -> None:
+        """
+        close idle sessions, busy ones are closed on release
+        """
+        with self._cond:
+            self._closed = True
+            idle = [s for sessions in self._sessions.values() for s, _ in sessions.idle]
+            for key, sessions in list(self._sessions.items()):
+                sessions.idle.clear()
+                self._drop(key, sessions)
+            self._cond.notify_all()
+
+        self._close(idle)
+
+    @property
+    def closed(self):
+        return self._closed
+
+    @property
+    def stats(self):
+        with self._cond:
+            return {
+                "created": self._counters["created"],
+                "reused": self._counters["reused"],
+                "discarded": self._counters["discarded"],
+                "evicted": self._counters["evicted"],
+                "waits": self._counters["waits"],
+                "timeouts": self._counters["timeouts"],
+                "idle": sum(len(s.idle) for s in self._sessions.values()),
+                "busy": sum(s.busy for s in self._sessions.values()),
+                "keys": {key: {"idle": len(s.idle), "busy": s.busy} for key, s in self._sessions.items()},
+            }
@@ -1,5 +1,7 @@
 import abc
+import collections.abc
 import enum
+import itertools
 import typing
 
 __all__ = (
@@ -16,6 +18,7 @@ __all__ = (
     "Wiring",
     "Whence",
     "StatField",
+    "EnvDelta",
 )
 
 
@@ -34,6 +37,46 @@ class Stat(typing.NamedTuple):
     st_status: int | None = None
 
 
+class EnvDelta(collections.abc.Mapping):
+    """
+    Environment given as changes to a base environment shared by many calls, a None value unsets the variable.
+
+    It reads as the resulting environment, a provider may also keep the base, identified by its key,
+    for its session and only apply the changes. The base must not be modified once given.
+    """
+
+    __slots__ = ("base", "changes", "key")
+
+    _keys = itertools.count(1)
+
+    def __init__(self, base: typing.Mapping[bytes, bytes], changes: dict[bytes, bytes | None] | None = None, key: int | None = None):
+        self.base = base
+        self.changes = changes or dict()
+        self.key = next(self._keys) if key is None else key
+
+    def derive(self, changes: dict[bytes, bytes | None]) -> "EnvDelta":
+        return EnvDelta(self.base, changes, self.key)
+
+    def __getitem__(self, name):
+        if name in self.changes:
+            value = self.changes[name]
+            if value is None:
+                raise KeyError(name)
+            return value
+
+        return self.base[name]
+
+    def __iter__(self):
+        yield from (k for k in self.base if k not in self.changes)
+        yield from (k for k, v in self.changes.items() if v is not None)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return "EnvDelta(%d, %r)" % (self.key, self.changes)
+
+
 class StatField(enum.Flag):
     MODE = 0x001
     INO = 0x002
@@ -261,9 +304,14 @@ class IFileSystemService(abc.ABC):
         ...
 
     @abc.abstractmethod
-    def list(self, path: bytes, *, extras: dict | None = None) -> list[bytes]:
+    def list(self, path: bytes, fields: int = 0, cursor: int | None = None, limit: int = 0, *, extras: dict | None = None) -> tuple[list[dict], int | None]:
         ...
 
+    def close_cursor(self, cursor: int, *, extras: dict | None = None) -> None:
+        """
+        release a cursor returned by list before its last page, nothing to release by default
+        """
+
     @abc.abstractmethod
     def stat(self, path: bytes, *, extras: dict | None = None) -> dict:
         ...
@@ -287,6 +335,15 @@ class IStreamService(abc.ABC):
     def readall(self, handle: int, *, extras: dict | None = None) -> bytearray:
         ...
 
+    def readinto(self, handle: int, buffer: bytearray | memoryview, *, extras: dict | None = None) -> int:
+        """
+        read into buffer, the default copies what read returns
+        """
+        view = memoryview(buffer).cast("B")
+        data = self.read(handle, view.nbytes, extras=extras)
+        view[: len(data)] = data
+        return len(data)
+
     @abc.abstractmethod
     def readchunk(self, handle: int, *, extras: dict | None = None) -> bytearray:
         ...
@@ -322,3 +379,9 @@ class IStreamService(abc.ABC):
     @abc.abstractmethod
     def terminate(self, handle: int, *, extras: dict | None = None) -> None:
         ...
+
+    def codecs(self, *, extras: dict | None = None) -> tuple[str, ...]:
+        """
+        compression codecs the service applies on file streams opened with a "codec" extra, none by default
+        """
+        return tuple()
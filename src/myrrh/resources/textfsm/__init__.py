@@ -1,4 +1,7 @@
+import functools
+import io
 import os
+import threading
 import textfsm
 
 _dir = os.path.dirname(__file__)
@@ -6,12 +9,39 @@ _dir = os.path.dirname(__file__)
 
 def getparser(name):
     with open(os.path.join(_dir, name + ".textfsm")) as f:
-        return Context(textfsm.TextFSM(f))
+        return Context(f.read())
+
+
+_parser = functools.cache(getparser)
+
+
+def parse(data, name):
+    """
+    parse utf-8 encoded data with the template name, it is given to the offload pool.
+    data is encoded with surrogatepass, the undecoded bytes of a command output are kept
+    """
+    with _parser(name) as fsm:
+        return fsm.ParseText(str(data, "utf-8", "surrogatepass"))
 
 
 class Context:
-    def __init__(self, textfsm):
-        self.textfsm = textfsm
+    """
+    each thread gets its own parser instance, built on first use from the template
+    """
+
+    def __init__(self, template):
+        self.template = template
+        self._local = threading.local()
+
+    @property
+    def textfsm(self):
+        try:
+            return self._local.textfsm
+        except AttributeError:
+            pass
+
+        self._local.textfsm = textfsm.TextFSM(io.StringIO(self.template))
+        return self._local.textfsm
 
     def __enter__(self):
         return self.textfsm
@@ -3,7 +3,7 @@ import click
 import typing
 import logging
 import asyncio
-import itertools
+import collections
 
 from traceback import format_exc
 from click.core import MultiCommand
@@ -33,18 +33,30 @@ from prompt_toolkit.application.current import get_app_session
 
 
 class EidOuput:
+    """
+    Print entity outputs side by side, one column per entity.
+
+    Complete lines are rendered by pages as they arrive: a page row is printed once every column
+    has a full page, or once a column holds more than MAX_PENDING_PAGES pages.
+    """
+
+    MAX_PENDING_PAGES = cfg_init("output_max_pending_pages", 4, section="myrrh.tools.myrrhc")
+
     def __init__(self, eid: str):
         self.output = get_app_session().output
 
-        self.texts: dict[str, str] = dict()
+        # per entity: chunks of the current line, complete lines not yet rendered, column width
+        self.partials: dict[str, list[str]] = dict()
+        self.lines: dict[str, collections.deque[str]] = dict()
+        self.widths: dict[str, int] = dict()
 
         eid = bmy.current(eid)  # type: ignore[attr-defined]
 
         if eid and bmy.isgroup(eid):  # type: ignore[attr-defined]
             for e in bmy.groupkeys(eid):  # type: ignore[attr-defined]
-                self.texts[e] = ""
+                self._add(e)
         else:
-            self.texts[eid] = ""
+            self._add(eid)
 
     def __enter__(self):
         return self
@@ -52,70 +64,91 @@ class EidOuput:
     def __getitem__(self, eid):
         return Output(self, eid)
 
-    def _print_container(self):
-        frames = list()
-        bodies = dict()
-        pages = list()
+    def _add(self, eid):
+        if eid not in self.lines:
+            self.partials[eid] = list()
+            self.lines[eid] = collections.deque()
+
+    def _append(self, eid, message):
+        self._add(eid)
+
+        *lines, last = message.split("\n")
+        partial = self.partials[eid]
 
-        output = get_app_session().output
-        rows = output.get_size().rows
+        if lines:
+            partial.append(lines[0])
+            lines[0] = "".join(partial)
+            partial.clear()
+            self.lines[eid].extend(line.removesuffix("\r") for line in lines)
 
-        for e, m in self.texts.items():
-            if not m:
+        if last:
+            partial.append(last)
+
+    def _page_size(self):
+        return max(self.output.get_size().rows - 1, 1)
+
+    def _print_page(self, page_size):
+        columns = list()
+
+        for e, lines in self.lines.items():
+            if not lines and e not in self.widths:
                 continue
 
-            header = e and Label(to_formatted_text([("class:bold italic", e)])) or None
-            lines = m.splitlines()
-            max_line_len = D(preferred=max(*map(len, lines)))
+            body = [lines.popleft() for _ in range(min(page_size, len(lines)))]
+            rows = list()
 
-            bodies[e] = list()
-            bodies[e].append(max_line_len)
-            while lines:
-                body = Label(
-                    to_formatted_text(ANSI("\n".join(lines[: rows - 1]))),
-                    width=max_line_len,
-                )
+            if e not in self.widths:
+                self.widths[e] = 0
+                if e:
+                    rows.append(Label(to_formatted_text([("class:bold italic", e)])))
 
-                lines = lines[rows - 1 :]
+            self.widths[e] = max(self.widths[e], max(map(len, body), default=0))
+            width = D(preferred=self.widths[e])
 
-                bodies[e].append(header and [header, body] or [body])
-                header = None
+            rows.append(Label(to_formatted_text(ANSI("\n".join(body))), width=width) if body else Label("", width=width))
+            columns.append(HSplit(rows))
 
-        pages = list(itertools.zip_longest(*bodies.values()))
+        print_container(VSplit(columns))
 
-        if not pages:
-            return
+    def _render(self, final=False):
+        page_size = self._page_size()
 
-        lens = pages[0]
-        pages = pages[1:]
-        for p in pages:
-            p = [*(([Label("", width=lens[i])] if v is None else v) for i, v in enumerate(p))]
+        while True:
+            pending = [len(lines) for lines in self.lines.values() if lines]
+            if not pending:
+                return
 
-            hsplit = list(map(HSplit, p))
-            frames.append(VSplit(hsplit))
+            if not final and min(pending) < page_size and max(pending) <= page_size * self.MAX_PENDING_PAGES:
+                return
 
-        for f in frames:
-            print_container(f)
+            self._print_page(page_size)
 
     def write(self, message, eid=None):
         if not message:
             return
 
         if eid is None:
-            for k, v in self.texts.items():
-                self.texts[k] = v + message
+            for k in list(self.lines):
+                self._append(k, message)
 
         elif bmy.isgroup(eid):
             for eid in bmy.groupkeys(eid):
-                self.texts[eid] = self.texts.get(eid, "") + message
+                self._append(eid, message)
         else:
-            self.texts[eid] = self.texts.get(eid, "") + message
+            self._append(eid, message)
+
+        self._render()
 
     def __exit__(self, *a, **kwa):
         self.close()
 
     def close(self):
-        self._print_container()
+        for eid, partial in self.partials.items():
+            if partial:
+                self.lines[eid].append("".join(partial))
+                partial.clear()
+
+        self._render(final=True)
 
 
 class Output:
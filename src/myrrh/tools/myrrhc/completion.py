@@ -1,10 +1,14 @@
+import collections
 import os
 import stat
+import threading
+import time
 from click.core import BaseCommand
 
 import click.shell_completion
 from prompt_toolkit import completion, eventloop
 
+from myrrh.core.services import cfg_init
 from myrrh.utils import mshlex
 import bmy
 
@@ -18,6 +22,103 @@ class ThreadedCompleter:
         return eventloop.generator_to_async_generator(lambda: self.get_completions(document, complete_event) or ())
 
 
+class _DirCache:
+    """
+    Per-entity directory listings, an expired listing is still returned while it is refreshed in background
+    """
+
+    TTL = cfg_init("completion_cache_ttl", 5.0, section="myrrh.tools.myrrhc")
+    MAX_SIZE = cfg_init("completion_cache_size", 256, section="myrrh.tools.myrrhc")
+
+    def __init__(self):
+        self._listings = collections.OrderedDict()
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def _load(self, key, mos, directory):
+        try:
+            entries = list(mos.scandir(directory))
+        except OSError:
+            entries = []
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+        with self._lock:
+            self._listings[key] = (time.monotonic(), entries)
+            self._listings.move_to_end(key)
+            while len(self._listings) > self.MAX_SIZE:
+                self._listings.popitem(last=False)
+
+        return entries
+
+    def _refresh(self, key, mos, directory):
+        with self._lock:
+            listing = self._listings.get(key)
+            if key in self._pending or (listing and time.monotonic() - listing[0] < self.TTL):
+                return
+            self._pending.add(key)
+
+        threading.Thread(target=self._load, args=(key, mos, directory), daemon=True, name="myrrhc-completion").start()
+
+    @staticmethod
+    def _key(eid, mos, directory):
+        return eid, mos.path.join(mos.getcwd(), directory)
+
+    def scandir(self, eid, mos, directory):
+        key = self._key(eid, mos, directory)
+
+        with self._lock:
+            listing = self._listings.get(key)
+
+        if listing is None:
+            return self._load(key, mos, directory)
+
+        if time.monotonic() - listing[0] >= self.TTL:
+            self._refresh(key, mos, directory)
+
+        return listing[1]
+
+    def prefetch(self, eid, mos, directories):
+        for directory in filter(None, directories):
+            self._refresh(self._key(eid, mos, directory), mos, directory)
+
+    def clear(self):
+        with self._lock:
+            self._listings.clear()
+
+
+_dircache = _DirCache()
+
+
+def _entity_os(eid):
+    if not eid:
+        return os
+
+    with bmy.select(eid=eid):
+        from mlib.py import os as mos
+
+    return mos
+
+
+def _executable_paths(mos):
+    return mos.environ.get("PATH", "").split(mos.pathsep) + [mos.getcwd()]
+
+
+def prefetch(eid=None):
+    """
+    Load in background the current directory and PATH directories listings of an entity
+    """
+    if bmy.isgroup(eid):
+        return
+
+    try:
+        mos = _entity_os(eid)
+        _dircache.prefetch(eid, mos, [mos.curdir] + _executable_paths(mos))
+    except Exception:
+        pass
+
+
 class _ShellComplete(click.shell_completion.ShellComplete):
     def get_completion_args(self):
         try:
@@ -52,7 +153,7 @@ class _ShellComplete(click.shell_completion.ShellComplete):
         return args, incomplete
 
 
-class _ClickCompleter(completion.Completer, ThreadedCompleter):
+class _ClickCompleter(ThreadedCompleter, completion.Completer):
     def __init__(self, cli: BaseCommand):
         self.cli = cli
 
@@ -92,6 +193,9 @@ class _BmyPathShellComplete:
         self.doc = None
         self.file_text = file_text or self._file_text
 
+    def _scandir(self, ctx, directory):
+        return _dircache.scandir(self._eid(ctx), self._os(ctx), directory)
+
     def _file_text(self, dirent, ctx):
         if dirent.is_dir():
             filename = dirent.name + self._os(ctx).sep
@@ -110,6 +214,8 @@ class _BmyPathShellComplete:
             return
         text = incomplet
         try:
+            _dircache.prefetch(self._eid(ctx), self._os(ctx), self.get_paths(ctx))
+
             # Do tilde expansion.
             if self.expanduser:
                 text = self._os(ctx).path.expanduser(text)
@@ -134,7 +240,7 @@ class _BmyPathShellComplete:
                     # Look for matches in this directory.
                     files = filter(
                         lambda dirent: (dirent.name.startswith(prefix) and ((not self.only_directories or dirent.is_dir()) and self.file_filter(dirent))),
-                        self._os(ctx).scandir(directory),
+                        self._scandir(ctx, directory),
                     )
                     files = sorted(files, key=lambda d: d.name)
                     for dirent in files:
@@ -150,30 +256,31 @@ class _BmyPathShellComplete:
 
         return paths
 
-    def _os(self, ctx):
-        eid = None
-
+    def _eid(self, ctx):
         eid = ctx.params.get(self.use_argument_for_eid, None) or bmy.current(ident=ctx.ident)
         if not bmy.isgroup(eid) and eid:
             eid = (eid,)
 
         if not eid:
-            return os
+            return None
 
         if len(eid) == 1:
-            try:
-                with bmy.select(eid=eid[0]):
-                    from mlib.py import os
-                return os
-            except Exception:
-                pass
+            return eid[0]
+
+        raise OSError
+
+    def _os(self, ctx):
+        try:
+            return _entity_os(self._eid(ctx))
+        except Exception:
+            pass
 
         raise OSError
 
 
 class _LocalPathShellComplete(_BmyPathShellComplete):
-    def _os(self, ctx):
-        return os
+    def _eid(self, ctx):
+        return None
 
 
 class _BmyExecutableShellComplete(_BmyPathShellComplete):
@@ -185,7 +292,7 @@ class _BmyExecutableShellComplete(_BmyPathShellComplete):
         super().__init__(
             only_directories=False,
             min_input_len=1,
-            get_paths=lambda ctx: self._os(ctx).environ.get("PATH", "").split(self._os(ctx).pathsep) + [self._os(ctx).getcwd()],
+            get_paths=lambda ctx: _executable_paths(self._os(ctx)),
             file_filter=lambda dirent: stat.S_IMODE(dirent.stat().st_mode) & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH),
             expanduser=True,
         ),
@@ -200,13 +307,13 @@ class _LocalExecutableShellComplete(_BmyPathShellComplete):
         super().__init__(
             only_directories=False,
             min_input_len=1,
-            get_paths=lambda ctx: self._os(ctx).environ.get("PATH", "").split(self._os(ctx).pathsep) + [self._os(ctx).getcwd()],
-            file_filter=lambda ctx, dirent: self._os(ctx).access(dirent.path, os.X_OK),
+            get_paths=lambda ctx: _executable_paths(self._os(ctx)),
+            file_filter=lambda dirent: os.access(dirent.path, os.X_OK),
             expanduser=True,
         )
 
-    def _os(self, ctx):
-        return os
+    def _eid(self, ctx):
+        return None
 
 
 def eids_completer(_ctx, _cli, _incomplet):
@@ -130,7 +130,7 @@ ctrl-D to exit console
             history=History(),
             enable_history_search=True,
             complete_style=shortcuts.CompleteStyle.MULTI_COLUMN,
-            complete_in_thread=True,
+            complete_in_thread=False,
             auto_suggest=AutoSuggest(),
             output=output,
         )
@@ -282,6 +282,7 @@ ctrl-D to exit console
         try:
             while True:
                 try:
+                    completion.prefetch(bmy.current(ident=self._group.context_settings.get("ident")))
                     with patch_stdout():
                         command = await self.prompt_async()
                     await self.command_call(command)
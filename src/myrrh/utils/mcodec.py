@@ -0,0 +1,138 @@
+"""
+**On-the-fly stream compression helper module**
+
+Streams are compressed with the stdlib zlib and lzma codecs, a reader pulls raw data from
+a file object and returns it transformed, a writer transforms data before pushing it to a
+file object.
+
+-----------------
+"""
+import collections
+import errno
+import lzma
+import math
+import os
+import zlib
+
+__all__ = ("CODECS", "CodecReader", "CodecWriter", "reader", "writer", "entropy")
+
+CODECS = {
+    "zlib": (zlib.compressobj, zlib.decompressobj),
+    "lzma": (lzma.LZMACompressor, lzma.LZMADecompressor),
+}
+
+CHUNK_SIZE = 1024 * 64
+
+
+def _codec(codec, decode):
+    try:
+        compressor, decompressor = CODECS[codec]
+    except KeyError:
+        raise ValueError(f"unsupported codec: {codec}") from None
+
+    if not decode:
+        obj = compressor()
+        return obj.compress, obj.flush
+
+    obj = decompressor()
+
+    def flush():
+        # zlib returns the remaining data, lzma holds nothing once eof is reached
+        data = obj.flush() if hasattr(obj, "flush") else b""
+        if not obj.eof:
+            raise OSError(errno.EIO, os.strerror(errno.EIO))
+        return data
+
+    return obj.decompress, flush
+
+
+class CodecReader:
+    """
+    read raw data from a file object and return it transformed
+    """
+
+    def __init__(self, raw, transform, flush, chunk_size=CHUNK_SIZE):
+        self.raw = raw
+        self._transform = transform
+        self._flush = flush
+        self._chunk_size = chunk_size
+        self._pending = bytearray()
+        self._eof = False
+
+    def _fill(self, size):
+        while len(self._pending) < size and not self._eof:
+            data = self.raw.read(self._chunk_size)
+            if data:
+                self._pending += self._transform(data)
+            else:
+                self._pending += self._flush()
+                self._eof = True
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            self._fill(math.inf)
+            size = len(self._pending)
+        else:
+            self._fill(size)
+
+        data = bytes(self._pending[:size])
+        del self._pending[:size]
+        return data
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self):
+        self.raw.close()
+
+
+class CodecWriter:
+    """
+    transform data before writing it to a file object, the transformation ends on close
+    """
+
+    def __init__(self, raw, transform, flush):
+        self.raw = raw
+        self._transform = transform
+        self._flush = flush
+        self._closed = False
+
+    def _write(self, data):
+        view = memoryview(data)
+        while view:
+            view = view[self.raw.write(view) :]
+
+    def write(self, data):
+        self._write(self._transform(data))
+        return len(data)
+
+    def close(self):
+        if self._closed:
+            return
+
+        self._closed = True
+        try:
+            self._write(self._flush())
+        finally:
+            self.raw.close()
+
+
+def reader(raw, codec, *, decode=True, chunk_size=CHUNK_SIZE):
+    return CodecReader(raw, *_codec(codec, decode), chunk_size=chunk_size)
+
+
+def writer(raw, codec, *, decode=False):
+    return CodecWriter(raw, *_codec(codec, decode))
+
+
+def entropy(data):
+    """
+    return the shannon entropy of data in bits per byte, from 0. (constant) to 8. (random)
+    """
+    if not data:
+        return 0.0
+
+    ln = len(data)
+    return -sum(c / ln * math.log2(c / ln) for c in collections.Counter(data).values())
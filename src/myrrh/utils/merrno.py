@@ -1,5 +1,8 @@
+import collections
+import functools
 import gettext
 import os
+import threading
 
 from errno import *  # noqa: F403
 import warnings
@@ -27,14 +30,70 @@ for n in errorcode:  # noqa : F405
     posix_error_mappings[os.strerror(n)] = n
 
 
+class ErrnoMatcher:
+    """
+    error message to errno matcher, the messages of the mapping are encoded once in a bytes table
+
+    As errno_from_msgb did, an error matches when its text after the last ':' is a message of the mapping
+    """
+
+    def __init__(self, map, encoding="utf8", errors="ignore"):
+        self._errnos = dict()
+        for msg, n in map.items():
+            self._errnos[msg.strip().encode(encoding, errors=errors)] = n
+
+    def errno(self, err):
+        if not err:
+            return default_errorno
+
+        return self._errnos.get(err.rpartition(b":")[2].strip(), default_errorno)
+
+    def errnos(self, errs):
+        """
+        errno of each error of errs
+        """
+        get = self._errnos.get
+        return [get(err.rpartition(b":")[2].strip(), default_errorno) if err else default_errorno for err in errs]
+
+
+MATCHERS_MAX = 16
+
+# the most recently used last
+_matchers: collections.OrderedDict[tuple, tuple[dict, ErrnoMatcher]] = collections.OrderedDict()
+_matchers_lock = threading.Lock()
+
+
+def errno_matcher(map=posix_error_mappings, encoding="utf8", errors="ignore"):
+    """
+    matcher compiled for map, the MATCHERS_MAX last used are cached, map must not be modified afterwards
+    """
+    key = (id(map), encoding, errors)
+
+    with _matchers_lock:
+        if key in _matchers:
+            _matchers.move_to_end(key)
+            return _matchers[key][1]
+
+    matcher = ErrnoMatcher(map, encoding, errors)
+
+    with _matchers_lock:
+        # a cached map is kept alive, so that its id is not reused
+        _matchers[key] = (map, matcher)
+        while len(_matchers) > MATCHERS_MAX:
+            _matchers.popitem(last=False)
+
+    return matcher
+
+
 def errno_from_msgb(err, map=posix_error_mappings, encoding="utf8", errors="ignore"):
-    if err:
-        error = err.rsplit(b":", 1)[-1].strip()
-    else:
-        return default_errorno
-    return map.get(error.decode(encoding, errors=errors), default_errorno)
+    return errno_matcher(map, encoding, errors).errno(err)
+
+
+def errnos_from_msgb(errs, map=posix_error_mappings, encoding="utf8", errors="ignore"):
+    return errno_matcher(map, encoding, errors).errnos(errs)
 
 
+@functools.lru_cache(maxsize=None)
 def errno_create_localized_mapping(lang):
     try:
         _ = gettext.translation("libc", languages=[lang])
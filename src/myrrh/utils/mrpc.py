@@ -0,0 +1,460 @@
+"""
+**Multiplexed RPC helper module**
+
+Binary RPC over a stream socket for providers running in another process or on another host.
+
+Each message is a frame: a fixed header giving the request id, the kind of message and the sizes of its
+parts, the pickled payload, then the out-of-band buffers of the payload. Large bytes-like values are
+pickled out-of-band (pickle protocol 5), they are sent from and received into their own memory without
+being copied into the payload.
+
+Many calls can be in flight on a connection, the server runs them on a thread pool and answers in any
+order. A method returning a generator is streamed, each item is sent as soon as produced. A stream is
+flow controlled, the server runs at most STREAM_WINDOW items ahead of the client which grants credits as
+it consumes them, and closing the iterator on the client side cancels the generator on the server side.
+
+    server = RpcServer(service, server_sock)
+    server.start()
+
+    with RpcClient(client_sock) as client:
+        client.call("read", handle, 1024)
+        for chunk in client.stream("readchunks", handle):
+            ...
+
+-----------------
+"""
+import errno
+import inspect
+import io
+import itertools
+import os
+import pickle
+import queue
+import socket
+import struct
+import threading
+import traceback
+import typing
+import weakref
+
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from myrrh.core.services.logging import log
+
+__all__ = ("RpcClient", "RpcServer", "RpcProxy", "OOB_THRESHOLD", "STREAM_WINDOW")
+
+OOB_THRESHOLD = 1024 * 4
+STREAM_WINDOW = 16
+
+CALL, RESULT, ERROR, ITEM, END, CREDIT, CANCEL = range(7)
+
+# request id, kind, payload size, buffers count
+_HEADER = struct.Struct("!QBIH")
+_SIZE = struct.Struct("!Q")
+_CREDIT = struct.Struct("!I")
+
+
+def _bytes(buffer):
+    return bytes(buffer)
+
+
+def _bytearray(buffer):
+    return buffer if type(buffer) is bytearray else bytearray(buffer)
+
+
+class _Pickler(pickle.Pickler):
+    def reducer_override(self, obj):
+        if type(obj) is bytes and len(obj) >= OOB_THRESHOLD:
+            return _bytes, (pickle.PickleBuffer(obj),)
+
+        if type(obj) is bytearray and len(obj) >= OOB_THRESHOLD:
+            return _bytearray, (pickle.PickleBuffer(obj),)
+
+        return NotImplemented
+
+
+def _dumps(obj):
+    buffers: list[pickle.PickleBuffer] = list()
+    f = io.BytesIO()
+    _Pickler(f, protocol=5, buffer_callback=buffers.append).dump(obj)
+    return f.getbuffer(), [b.raw() for b in buffers]
+
+
+def _exception(exc):
+    trcbck = traceback.format_tb(exc.__traceback__)
+    try:
+        return pickle.dumps((exc, trcbck), protocol=5)
+    except Exception:
+        return pickle.dumps((RuntimeError("%s: %s" % (type(exc).__name__, exc)), trcbck), protocol=5)
+
+
+def _raise(payload):
+    exc, trcbck = pickle.loads(payload)
+    exc.straceback = trcbck
+
+    log.debug(f'{"".join(trcbck)}{str(exc)}\n')
+
+    raise exc
+
+
+class _Connection:
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self._rfile = sock.makefile("rb")
+        self._wlock = threading.Lock()
+
+    def _read(self, size):
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        while view:
+            n = self._rfile.readinto(view)
+            if not n:
+                raise EOFError
+            view = view[n:]
+
+        return buffer
+
+    def recv(self):
+        """
+        return the next frame as (request id, kind, payload, buffers), raise EOFError once the peer is gone
+        """
+        rid, kind, size, nbuffers = _HEADER.unpack(self._read(_HEADER.size))
+        sizes = [s for s, in _SIZE.iter_unpack(self._read(_SIZE.size * nbuffers))] if nbuffers else []
+        payload = self._read(size)
+        return rid, kind, payload, [self._read(s) for s in sizes]
+
+    def send(self, rid, kind, payload, buffers=()):
+        parts = [_HEADER.pack(rid, kind, len(payload), len(buffers))]
+        parts.extend(_SIZE.pack(b.nbytes) for b in buffers)
+        parts.append(payload)
+        parts.extend(buffers)
+
+        views = [memoryview(p).cast("B") for p in parts if len(p)]
+
+        with self._wlock:
+            if not hasattr(self.sock, "sendmsg"):
+                for view in views:
+                    self.sock.sendall(view)
+                return
+
+            while views:
+                sent = self.sock.sendmsg(views[:64])
+                while sent:
+                    if sent >= views[0].nbytes:
+                        sent -= views.pop(0).nbytes
+                    else:
+                        views[0] = views[0][sent:]
+                        sent = 0
+
+    def close(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._rfile.close()
+        self.sock.close()
+
+
+class _Window:
+    def __init__(self, credit):
+        self._cond = threading.Condition()
+        self._credit = credit
+        self._cancelled = False
+
+    def acquire(self):
+        """
+        wait for a credit, return False once the stream is cancelled
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._credit or self._cancelled)
+            if self._cancelled:
+                return False
+            self._credit -= 1
+            return True
+
+    def grant(self, credit):
+        with self._cond:
+            self._credit += credit
+            self._cond.notify()
+
+    def cancel(self):
+        with self._cond:
+            self._cancelled = True
+            self._cond.notify()
+
+
+class RpcServer:
+    """
+    serve the public methods of target on a connection
+    """
+
+    def __init__(self, target, sock: socket.socket, max_workers: int = 8):
+        self.target = target
+        self._conn = _Connection(sock)
+        self._pool = ThreadPoolExecutor(max_workers, "MyrrhRpc")
+        self._windows: dict[int, _Window] = dict()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve, name="MyrrhRpcServer", daemon=True)
+        self._thread.start()
+        return self
+
+    def join(self, timeout=None):
+        if self._thread:
+            self._thread.join(timeout)
+
+    def serve(self):
+        """
+        serve until the client closes the connection
+        """
+        try:
+            while True:
+                try:
+                    rid, kind, payload, buffers = self._conn.recv()
+                except (EOFError, OSError):
+                    break
+
+                if kind == CALL:
+                    # registered before the call runs, its credits and cancel can arrive at any time
+                    self._windows[rid] = _Window(STREAM_WINDOW)
+                    self._pool.submit(self._call, rid, payload, buffers)
+                elif kind in (CREDIT, CANCEL):
+                    window = self._windows.get(rid)
+                    if window is None:
+                        continue
+                    if kind == CREDIT:
+                        window.grant(_CREDIT.unpack(payload)[0])
+                    else:
+                        window.cancel()
+        finally:
+            for window in list(self._windows.values()):
+                window.cancel()
+            self._pool.shutdown()
+            self._conn.close()
+
+    def _call(self, rid, payload, buffers):
+        try:
+            name, args, kwargs = pickle.loads(payload, buffers=buffers)
+            if name.startswith("_"):
+                raise AttributeError(name)
+
+            result = getattr(self.target, name)(*args, **kwargs)
+
+            if inspect.isgenerator(result):
+                self._stream(rid, result)
+            else:
+                self._conn.send(rid, RESULT, *_dumps(result))
+
+        except OSError as e:
+            if e.errno in (errno.EPIPE, errno.EBADF, errno.ECONNRESET):
+                return
+            self._error(rid, e)
+
+        except Exception as e:
+            self._error(rid, e)
+
+        finally:
+            self._windows.pop(rid, None)
+
+    def _stream(self, rid, items):
+        window = self._windows[rid]
+        try:
+            # the next item is only produced once the client can take it
+            while window.acquire():
+                try:
+                    item = next(items)
+                except StopIteration:
+                    self._conn.send(rid, END, b"")
+                    return
+                self._conn.send(rid, ITEM, *_dumps(item))
+        finally:
+            items.close()
+
+    def _error(self, rid, exc):
+        try:
+            self._conn.send(rid, ERROR, _exception(exc))
+        except OSError:
+            pass
+
+
+class _Stream:
+    def __init__(self, client: "RpcClient"):
+        self.items: queue.SimpleQueue = queue.SimpleQueue()
+        self.rid = 0
+        self._client = client
+
+    def set_item(self, item):
+        self.items.put((ITEM, item))
+
+    def set_end(self):
+        self.items.put((END, None))
+
+    def set_exception(self, exc):
+        self.items.put((ERROR, exc))
+
+    def __iter__(self):
+        consumed = 0
+        try:
+            while True:
+                kind, item = self.items.get()
+                if kind == ITEM:
+                    yield item
+                    consumed += 1
+                    if consumed == STREAM_WINDOW // 2:
+                        self._client._grant(self.rid, consumed)
+                        consumed = 0
+                elif kind == END:
+                    return
+                else:
+                    raise item
+        finally:
+            self._client._cancel(self.rid)
+
+
+class RpcClient:
+    """
+    call the methods served on a connection, it is thread safe and calls from many threads are multiplexed
+    """
+
+    def __init__(self, sock: socket.socket):
+        self._conn = _Connection(sock)
+        self._ids = itertools.count(1)
+        self._pending: dict[int, Future | _Stream] = dict()
+        self._lock = threading.Lock()
+        self._closed: BaseException | None = None
+        self._reader = threading.Thread(target=self._read, name="MyrrhRpcClient", daemon=True)
+        self._reader.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_a, **_k):
+        self.close()
+
+    def _read(self):
+        reason: BaseException = EOFError()
+        try:
+            while True:
+                rid, kind, payload, buffers = self._conn.recv()
+
+                with self._lock:
+                    pending = self._pending.get(rid) if kind == ITEM else self._pending.pop(rid, None)
+
+                if pending is None:
+                    continue
+
+                # a message that can not be decoded only fails its own call
+                try:
+                    if kind == ERROR:
+                        _raise(payload)
+                    elif kind == ITEM:
+                        pending.set_item(pickle.loads(payload, buffers=buffers))  # type: ignore[union-attr]
+                    elif kind == END:
+                        pending.set_end()  # type: ignore[union-attr]
+                    else:
+                        pending.set_result(pickle.loads(payload, buffers=buffers))  # type: ignore[union-attr]
+                except Exception as e:
+                    if kind == ITEM:
+                        self._cancel(rid)
+                    pending.set_exception(e)
+
+        except (EOFError, OSError) as e:
+            reason = e
+
+        finally:
+            self._shutdown(reason)
+
+    def _shutdown(self, reason):
+        with self._lock:
+            if self._closed is None:
+                self._closed = reason
+            pending = list(self._pending.values())
+            self._pending.clear()
+
+        for p in pending:
+            p.set_exception(OSError(errno.EPIPE, os.strerror(errno.EPIPE)))
+
+    def _request(self, pending, name, args, kwargs):
+        with self._lock:
+            if self._closed is not None:
+                raise OSError(errno.EPIPE, os.strerror(errno.EPIPE))
+
+            rid = next(self._ids)
+            self._pending[rid] = pending
+            if isinstance(pending, _Stream):
+                pending.rid = rid
+
+        try:
+            self._conn.send(rid, CALL, *_dumps((name, args, kwargs)))
+        except BaseException:
+            with self._lock:
+                self._pending.pop(rid, None)
+            raise
+
+        return pending
+
+    def _grant(self, rid, credit):
+        try:
+            self._conn.send(rid, CREDIT, _CREDIT.pack(credit))
+        except OSError:
+            pass
+
+    def _cancel(self, rid):
+        """
+        stop a stream not received up to its end, nothing to do once it ended
+        """
+        with self._lock:
+            if self._pending.pop(rid, None) is None:
+                return
+
+        try:
+            self._conn.send(rid, CANCEL, b"")
+        except OSError:
+            pass
+
+    def submit(self, name: str, *args, **kwargs) -> Future:
+        return self._request(Future(), name, args, kwargs)
+
+    def call(self, name: str, *args, **kwargs) -> typing.Any:
+        return self.submit(name, *args, **kwargs).result()
+
+    def stream(self, name: str, *args, **kwargs) -> typing.Iterator:
+        """
+        call a method returning a generator, its items are yielded as soon as received
+
+        closing the iterator, or dropping it, before its end cancels the remote generator
+        """
+        stream = self._request(_Stream(self), name, args, kwargs)
+        items = iter(stream)
+        # a generator never started does not run its finally block when collected
+        weakref.finalize(items, self._cancel, stream.rid)
+        return items
+
+    @property
+    def proxy(self):
+        return RpcProxy(self)
+
+    def close(self):
+        self._shutdown(EOFError())
+        self._conn.close()
+        self._reader.join()
+
+
+class RpcProxy:
+    """
+    call the remote methods as attributes, client.proxy.read(handle, 1024)
+    """
+
+    def __init__(self, client: RpcClient):
+        self._client = client
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def method(*args, **kwargs):
+            return self._client.call(name, *args, **kwargs)
+
+        method.__name__ = name
+        return method
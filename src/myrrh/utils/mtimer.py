@@ -1,3 +1,4 @@
+import threading
 import time
 import typing
 
@@ -11,17 +12,19 @@ class MTimer:
 
     INFINITE = -1
 
-    def __init__(self, timeout=None, count=None, step=None, raise_on_expired=False):
+    def __init__(self, timeout=None, count=None, step=None, raise_on_expired=False, wakeup=None):
         """
         Create simple synchronous timer
 
         :param int timeout: timer expiration in second
         :param in count: timer expiration in discrete time count
+        :param threading.Event wakeup: event ending the current step when set, a new one is created if True
         """
         self._count = count
         self._timeout = timeout
         self._step_sleep_time = step
         self._raise_on_expired = raise_on_expired
+        self._wakeup = threading.Event() if wakeup is True else wakeup
 
         self._idle_endtime = 0
 
@@ -107,7 +110,7 @@ class MTimer:
             else:
                 return False
         if self._step_sleep_time:
-            time.sleep(self.sleep_time)
+            self._sleep(self.sleep_time)
 
         self._idle_endtime = self._ctime
 
@@ -132,6 +135,27 @@ class MTimer:
 
         # None
 
+    def _sleep(self, delay):
+        if self._wakeup is None:
+            time.sleep(delay)
+        elif self._wakeup.wait(delay):
+            self._wakeup.clear()
+            self._woken()
+
+    def _woken(self):
+        pass
+
+    def wake(self):
+        """
+        end the current step, or the next one if the timer is not idling
+        """
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    @property
+    def wakeup(self):
+        return self._wakeup
+
     def reset(self):
         self._starttime = self._ctime
         self._nbstep = 0
@@ -155,21 +179,26 @@ class MVectorTimer(MTimer):
     def sleep_time(self):
         vector = int((self.duration - self._stamp) / self._step_sleep_time)
         wait = self._vectors[min(len(self._vectors) - 1, vector)]
-        return wait
+        return min(wait, self._timeleft) if self._timeout else wait
 
     def stamp(self):
         self._stamp = self.duration
 
+    def _woken(self):
+        # something happened, restart from the shortest steps
+        self.stamp()
+
 
 class MBurstTimer(MVectorTimer):
     _VECTOR = [0.01] * 10 + [0.1] * 10 + [0.2] * 30 + [0.3] * 50 + [0.5] * 500 + [1]
     _STEP = 0.1
 
-    def __init__(self, vectors=None, timeout=None, count=None, step=None, raise_on_expired=False):
+    def __init__(self, vectors=None, timeout=None, count=None, step=None, raise_on_expired=False, wakeup=None):
         super().__init__(
             vectors=vectors and list(vectors) or self._VECTOR,
             timeout=timeout,
             count=count,
             step=step or self._STEP,
             raise_on_expired=raise_on_expired,
+            wakeup=wakeup,
         )
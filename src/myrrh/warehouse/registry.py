@@ -47,6 +47,10 @@ class ItemRegistry:
 
     generic = GenericItem
 
+    # bumped on each registration, compiled adapters of previous generations are rebuilt
+    generation = 0
+    __adapters__: dict[str, tuple[int, pydantic.TypeAdapter]] = {}
+
     def __new__(cls):
         if cls.__single__ is None:
             cls.__single__ = super().__new__(cls)
@@ -85,29 +89,51 @@ class ItemRegistry:
     def FactorySupply(self) -> typing.Type[Supply]:
         return Supply[self.ProviderModelT]  # type: ignore[name-defined]
 
+    def type_adapter(self, name: str) -> pydantic.TypeAdapter:
+        """
+        return the TypeAdapter of the "WarehouseItemT" or "ProviderModelT" union, compiled once per registry generation
+        """
+        generation = self.generation
+
+        adapter = self.__adapters__.get(name)
+        if adapter and adapter[0] == generation:
+            return adapter[1]
+
+        adapter = self.__adapters__[name] = generation, pydantic.TypeAdapter(getattr(self, name))
+        return adapter[1]
+
     def warehouse_model_validate(self, *a, **kwa):
-        cls = pydantic.TypeAdapter(self.WarehouseItemT).validate_python(*a, **kwa)
+        cls = self.type_adapter("WarehouseItemT").validate_python(*a, **kwa)
         return cls
 
     def provider_model_validate(self, *a, **kwa):
-        cls = pydantic.TypeAdapter(self.ProviderModelT).validate_python(*a, **kwa)
+        cls = self.type_adapter("ProviderModelT").validate_python(*a, **kwa)
         return cls
 
-    def register_warehouse(self, item_cls):
-        self.warehouse_predefined_items[item_cls._type_()] = item_cls
-        self.__warehouse_items__[item_cls._type_()] = item_cls
+    def warehouse_model_construct(self, values: dict, item_cls: typing.Type[BaseItem] | None = None) -> BaseItem:
+        """
+        build an item without validation, values must come from validated items
+        """
+        item_cls = item_cls or self.__warehouse_items__.get(values.get("type_"), GenericItem)
+        return item_cls.model_construct(**values)
+
+    def _invalidate(self, name):
         try:
-            del self.WarehouseItemT
+            delattr(self, name)
         except AttributeError:
             pass
 
+        self.generation += 1
+
+    def register_warehouse(self, item_cls):
+        self.warehouse_predefined_items[item_cls._type_()] = item_cls
+        self.__warehouse_items__[item_cls._type_()] = item_cls
+        self._invalidate("WarehouseItemT")
+
     def register_provider_model(self, provider_model: ProviderSettings):
         for value in typing.get_args(provider_model.model_fields["name"].annotation):
             self.provider_settings[value] = provider_model
-        try:
-            del self.ProviderModelT
-        except AttributeError:
-            pass
+        self._invalidate("ProviderModelT")
 
 
 def register_warehouse(module_name: str, item: str):
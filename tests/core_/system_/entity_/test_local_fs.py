@@ -0,0 +1,152 @@
+import errno
+import os
+import stat
+import tempfile
+import unittest
+
+from unittest import mock
+
+from myrrh.core.services.system import MOsError
+from myrrh.provider import IFileSystemService, StatField
+from mplugins.provider.local.system import FileSystem
+
+
+class TestFileSystemList(unittest.TestCase):
+    def setUp(self):
+        self.fs = FileSystem()
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+
+        self.path = os.fsencode(tmpdir.name)
+        self.names = [b"file%d" % i for i in range(10)]
+        for name in self.names:
+            with open(os.path.join(self.path, name), "wb") as f:
+                f.write(name)
+        os.mkdir(os.path.join(self.path, b"dir"))
+
+    def test_list_names(self):
+        entries, cursor = self.fs.list(self.path)
+
+        self.assertIsNone(cursor)
+        self.assertEqual(sorted(e["name"] for e in entries), sorted(self.names + [b"dir"]))
+        self.assertEqual(set(entries[0]), {"name"})
+
+    def test_list_fields(self):
+        entries, _ = self.fs.list(self.path, (StatField.MODE | StatField.SIZE | StatField.MTIME).value)
+        entries = {e["name"]: e for e in entries}
+
+        self.assertEqual(set(entries[b"dir"]), {"name", "st_mode", "st_size", "st_mtime", "st_mtime_ns"})
+        self.assertEqual(entries[b"file1"]["st_mtime_ns"], os.stat(os.path.join(self.path, b"file1")).st_mtime_ns)
+        self.assertTrue(stat.S_ISDIR(entries[b"dir"]["st_mode"]))
+        self.assertTrue(stat.S_ISREG(entries[b"file1"]["st_mode"]))
+        self.assertEqual(entries[b"file1"]["st_size"], len(b"file1"))
+
+    def test_list_paging(self):
+        names = []
+        entries, cursor = self.fs.list(self.path, limit=4)
+        names.extend(e["name"] for e in entries)
+        self.assertEqual(len(entries), 4)
+
+        while cursor is not None:
+            entries, cursor = self.fs.list(self.path, cursor=cursor, limit=4)
+            names.extend(e["name"] for e in entries)
+
+        self.assertEqual(sorted(names), sorted(self.names + [b"dir"]))
+
+    def test_list_errors(self):
+        with self.assertRaises(FileNotFoundError):
+            self.fs.list(os.path.join(self.path, b"none"))
+
+        with self.assertRaises(NotADirectoryError):
+            self.fs.list(os.path.join(self.path, b"file1"))
+
+        with self.assertRaises(OSError):
+            self.fs.list(self.path, cursor=-1)
+
+    def test_close_cursor(self):
+        _, cursor = self.fs.list(self.path, limit=4)
+        self.fs.close_cursor(cursor)
+
+        with self.assertRaises(OSError):
+            self.fs.list(self.path, cursor=cursor, limit=4)
+
+        self.fs.close_cursor(cursor)
+
+    def test_cursors_evicted(self):
+        with mock.patch.object(FileSystem, "list_cursors_max", 2):
+            cursors = [self.fs.list(self.path, limit=4)[1] for _ in range(3)]
+            self.addCleanup(lambda: [self.fs.close_cursor(c) for c in cursors])
+
+            with self.assertRaises(OSError):
+                self.fs.list(self.path, cursor=cursors[0], limit=4)
+
+            entries, _ = self.fs.list(self.path, cursor=cursors[2], limit=4)
+            self.assertEqual(len(entries), 4)
+
+        with mock.patch.object(FileSystem, "list_cursors_ttl", 0.0):
+            _, cursor = self.fs.list(self.path, limit=4)
+            self.addCleanup(self.fs.close_cursor, cursor)
+
+            with self.assertRaises(OSError):
+                self.fs.list(self.path, cursor=cursor, limit=4)
+
+    def test_close_cursor_default(self):
+        class DefaultFileSystem(FileSystem):
+            close_cursor = IFileSystemService.close_cursor
+
+        self.assertIsNone(DefaultFileSystem().close_cursor(1))
+
+
+class TestOsFsList(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        import bmy
+
+        eid = bmy.new(path="**/local", eid="fs_list")
+        bmy.build(eid=eid)
+
+        with bmy.select(eid):
+            from mlib.py import os as mos
+
+        cls.mos = mos
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = tmpdir.name
+
+        for name in ("file", "noperm"):
+            with open(os.path.join(self.path, name), "wb"):
+                pass
+        os.chmod(os.path.join(self.path, "noperm"), 0)
+
+    def test_listdir_perm(self):
+        self.assertEqual(self.mos.listdir(self.path), ["file"])
+
+    def test_scandir_perm(self):
+        self.assertEqual([e.name for e in self.mos.scandir(self.path)], ["file"])
+
+    def test_scandir_stat_ns(self):
+        entries = {e.name: e for e in self.mos.scandir(self.path)}
+
+        self.assertEqual(entries["file"].stat().st_mtime_ns, os.stat(os.path.join(self.path, "file")).st_mtime_ns)
+
+    def test_listdir_later_page(self):
+        fs = type(self.mos.myrrh_os.fs)
+        list_ = fs.list
+
+        def failing(self, path, fields=0, cursor=None, limit=0, **kwargs):
+            if cursor is not None:
+                raise OSError(errno.EIO, os.strerror(errno.EIO))
+            return list_(self, path, fields, cursor, 1, **kwargs)
+
+        with mock.patch.object(fs, "list", failing):
+            with self.assertRaises(OSError) as cm:
+                self.mos.listdir(self.path)
+
+        self.assertEqual(cm.exception.errno, errno.EIO)
+        self.assertIsInstance(cm.exception, MOsError)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import unittest
+
+from unittest import mock
+
+from myrrh.provider import EnvDelta
+from mplugins.provider.local.system import Shell, ShellSession, StreamPosix
+
+
+class TestEnvDelta(unittest.TestCase):
+    def setUp(self):
+        self.base = {b"A": b"1", b"B": b"2"}
+
+    def test_mapping(self):
+        env = EnvDelta(self.base, {b"B": None, b"C": b"3"})
+
+        self.assertEqual(dict(env), {b"A": b"1", b"C": b"3"})
+        self.assertNotIn(b"B", env)
+        self.assertEqual(len(env), 2)
+
+    def test_derive(self):
+        env = EnvDelta(self.base)
+        derived = env.derive({b"A": b"0"})
+
+        self.assertEqual(derived.key, env.key)
+        self.assertEqual(dict(derived), {b"A": b"0", b"B": b"2"})
+        self.assertNotEqual(EnvDelta(self.base).key, env.key)
+
+
+@unittest.skipUnless(os.name == "posix", "posix shell required")
+class TestShellEnvDelta(unittest.TestCase):
+    def setUp(self):
+        self.shell = Shell()
+        self.env = EnvDelta({b"PATH": os.fsencode(os.environ["PATH"]), b"MYRRH_A": b"a", b"MYRRH_B": b"b"})
+
+    def test_base(self):
+        out, _, rval = self.shell.execute(b'echo "$MYRRH_A$MYRRH_B"', env=self.env)
+
+        self.assertEqual(rval, 0)
+        self.assertEqual(out.strip(), b"ab")
+
+    def test_changes(self):
+        self.shell.execute(b"true", env=self.env)
+        out, _, _ = self.shell.execute(b'echo "$MYRRH_A$MYRRH_B"', env=self.env.derive({b"MYRRH_A": b"c", b"MYRRH_B": None}))
+        self.assertEqual(out.strip(), b"c")
+
+        out, _, _ = self.shell.execute(b'echo "$MYRRH_A$MYRRH_B"', env=self.env)
+        self.assertEqual(out.strip(), b"ab")
+
+
+@unittest.skipUnless(os.name == "posix", "posix shell required")
+class TestShellSession(unittest.TestCase):
+    def setUp(self):
+        self.session = ShellSession()
+        self.addCleanup(self.session.close)
+
+    def test_execute(self):
+        self.assertEqual(self.session.execute(b"echo out; echo err >&2; exit 3", "/", {}), (b"out\n", b"err\n", 3))
+        self.assertEqual(self.session.execute(b"printf out", "/", {}), (b"out", b"", 0))
+        self.assertTrue(self.session.alive())
+
+    def test_isolation(self):
+        out, _, _ = self.session.execute(b'cd /tmp; X=1; echo "$MYRRH_A"; pwd', "/", {b"MYRRH_A": b"it's $A"})
+        self.assertEqual(out, b"it's $A\n/tmp\n")
+
+        out, _, _ = self.session.execute(b'pwd; echo "$X$MYRRH_A"', "/", {})
+        self.assertEqual(out, b"/\n\n")
+
+    def test_syntax_error(self):
+        _, err, rval = self.session.execute(b"echo 'a (", "/", {})
+
+        self.assertEqual(rval, 2)
+        self.assertTrue(err)
+        self.assertEqual(self.session.execute(b"echo ok", "/", {})[0], b"ok\n")
+
+
+@unittest.skipUnless(os.name == "posix", "posix shell required")
+class TestShellSessions(TestShellEnvDelta):
+    def setUp(self):
+        super().setUp()
+        self.shell.sessions_max_size = 2
+
+    def test_reuse(self):
+        created = Shell._session_pool().stats["created"]
+
+        for _ in range(3):
+            self.shell.execute(b"true", env=self.env)
+
+        self.assertLessEqual(Shell._session_pool().stats["created"], created + 1)
+
+
+@unittest.skipUnless(os.name == "posix", "posix shell required")
+class TestRuntimeEnvDelta(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        import bmy
+
+        eid = bmy.new(path="**/local", eid="env_delta")
+        bmy.build(eid=eid)
+
+        cls.myrrh_os = bmy.entity(eid).runtime.myrrh_os
+
+    def setUp(self):
+        self.env = dict(self.myrrh_os.getenvb())
+        self.env[b"MYRRH_A"] = b"a"
+        self.env.pop(b"HOME", None)
+
+    def test_delta(self):
+        base = self.myrrh_os.getbaseenvb()
+        env = self.myrrh_os.getenvdeltab(self.env)
+
+        self.assertIs(self.myrrh_os.getenvdeltab(), base)
+        self.assertEqual(env.key, base.key)
+        self.assertEqual(env.changes, {b"MYRRH_A": b"a", b"HOME": None})
+
+    def test_shell(self):
+        out, _, rval = self.myrrh_os.shell.execute(b'echo "$MYRRH_A-$HOME"', env=self.env)
+
+        self.assertEqual(rval, 0)
+        self.assertEqual(out, b"a-\n")
+
+    def test_open_process(self):
+        with mock.patch.object(StreamPosix, "open_process", side_effect=OSError) as open_process:
+            self.assertRaises(OSError, self.myrrh_os.Stream().open_process, b"/bin/true", 0, [], env=self.env)
+
+        env = open_process.call_args.kwargs["env"]
+        self.assertIsInstance(env, EnvDelta)
+        self.assertEqual(env.changes, {b"MYRRH_A": b"a", b"HOME": None})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import threading
+import unittest
+
+from myrrh.core._entity._registry import Registry
+
+
+class SlowProvider:
+    def __init__(self):
+        self.release = threading.Event()
+        self.delivering = threading.Event()
+        self.delivered = []
+
+    def catalog(self):
+        return ("slow", "fast")
+
+    def deliver(self, name):
+        self.delivered.append(name)
+
+        if name == "slow":
+            self.delivering.set()
+            self.release.wait(10)
+
+        return {"type_": name, "value": name}
+
+
+class RegistryLoadTest(unittest.TestCase):
+    def setUp(self):
+        self.provider = SlowProvider()
+        self.registry = Registry(self.provider, [])
+
+    def test_single_delivery(self):
+        results = []
+
+        def read():
+            results.append(self.registry.slow.value)
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for t in threads:
+            t.start()
+
+        self.assertTrue(self.provider.delivering.wait(10))
+        self.provider.release.set()
+
+        for t in threads:
+            t.join(10)
+
+        self.assertEqual(results, ["slow"] * 8)
+        self.assertEqual(self.provider.delivered.count("slow"), 1)
+
+    def test_other_items_readable(self):
+        thread = threading.Thread(target=lambda: self.registry.slow)
+        thread.start()
+        self.addCleanup(thread.join, 10)
+        self.addCleanup(self.provider.release.set)
+
+        self.assertTrue(self.provider.delivering.wait(10))
+
+        results = []
+        reader = threading.Thread(target=lambda: results.append(self.registry["fast.value"]))
+        reader.start()
+        reader.join(5)
+
+        self.assertEqual(results, ["fast"])
+        self.assertFalse(self.provider.release.is_set())
+
+    def test_present_item(self):
+        self.provider.release.set()
+
+        item = self.registry.fast
+        self.assertIs(self.registry.fast, item)
+        self.assertEqual(self.provider.delivered, ["fast"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import time
+import unittest
+
+from myrrh.core._system.managers import RuntimeCache, runtime_cached_property
+
+
+class Owner:
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+        self.__m_runtime_cache__ = RuntimeCache()
+
+    def _compute(self):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("failure")
+        return self.calls
+
+    @runtime_cached_property("test_cache_forever")
+    def forever(self):
+        return self._compute()
+
+    @runtime_cached_property("test_cache_short", validity=0.05)
+    def short(self):
+        return self._compute()
+
+
+class RuntimeCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.owner = Owner()
+
+    def test_cached(self):
+        self.assertEqual(self.owner.forever, 1)
+        self.assertEqual(self.owner.forever, 1)
+        self.assertEqual(self.owner.calls, 1)
+
+    def test_set(self):
+        self.assertEqual(self.owner.forever, 1)
+        self.owner.forever = 10
+        self.assertEqual(self.owner.forever, 10)
+
+        del self.owner.forever
+        self.assertEqual(self.owner.forever, 2)
+
+    def test_direct_write(self):
+        self.assertEqual(self.owner.forever, 1)
+        self.owner.__m_runtime_cache__["test_cache_forever"] = 5
+        self.assertEqual(self.owner.forever, 5)
+
+    def test_validity(self):
+        self.assertEqual(self.owner.short, 1)
+        self.assertEqual(self.owner.short, 1)
+        time.sleep(0.1)
+        self.assertEqual(self.owner.short, 2)
+
+    def test_failure(self):
+        self.owner.fail = True
+        self.assertRaises(RuntimeError, getattr, self.owner, "forever")
+
+        self.owner.fail = False
+        self.assertEqual(self.owner.forever, 2)
+
+    def test_identical_write(self):
+        value = self.owner.forever
+        self.owner.__m_runtime_cache__["test_cache_forever"] = value
+        self.assertIn("test_cache_forever", self.owner.__m_runtime_cache__.__snapshot__)
+
+
+class RuntimeCacheInitTest(unittest.TestCase):
+    def test_init_at_creation_published(self):
+        import bmy
+
+        eid = bmy.new(path="**/local", eid="cache_init")
+        bmy.build(eid=eid)
+
+        with bmy.select(eid):
+            from mlib.py import os as mos
+
+        snapshot = mos.myrrh_os.__m_runtime_cache__.__snapshot__
+        for name in ("fds", "tasks", "modules", "impls"):
+            self.assertIn(name, snapshot)
+
+
+if __name__ == "__main__":
+    unittest.main()
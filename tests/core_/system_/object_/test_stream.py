@@ -0,0 +1,145 @@
+import io
+import lzma
+import os
+import tempfile
+import unittest
+import zlib
+
+from myrrh.provider import IStreamService, Wiring
+from myrrh.utils import mcodec
+from mplugins.provider.local.system import StreamPosix
+
+
+class TestStreamPosix(unittest.TestCase):
+    def setUp(self):
+        self.stream = StreamPosix()
+        self.rfd, self.wfd = os.pipe()
+        self.handle = self.stream.handler.new(b"pipe", self.rfd, None)
+
+        self.addCleanup(os.close, self.rfd)
+        self.addCleanup(self.stream.handler.close, self.handle)
+
+    def _write(self, data):
+        os.write(self.wfd, data)
+        os.close(self.wfd)
+
+    def test_readall_pipe(self):
+        self._write(b"0123456789" * 100)
+
+        data = self.stream.readall(self.handle)
+        self.assertEqual(data, b"0123456789" * 100)
+        self.assertEqual(self.stream.readall(self.handle), b"")
+
+    def test_readall_max_size(self):
+        self._write(b"0123456789")
+
+        self.assertEqual(self.stream.readall(self.handle, extras={"max_size": 4}), b"0123")
+        self.assertEqual(self.stream.readall(self.handle, extras={"max_size": 4}), b"4567")
+        self.assertEqual(self.stream.readall(self.handle), b"89")
+
+    def test_readall_unbounded(self):
+        data = bytes(range(256)) * (self.stream.rdall_chunk_sz // 64)
+
+        with tempfile.TemporaryFile() as f:
+            f.write(data)
+            f.seek(0)
+            handle = self.stream.handler.new(b"file", f.fileno(), None)
+            self.addCleanup(self.stream.handler.close, handle)
+
+            self.assertEqual(self.stream.readall(handle), data)
+
+    def test_readinto(self):
+        self._write(b"0123456789")
+
+        buf = bytearray(4)
+        self.assertEqual(self.stream.readinto(self.handle, buf), 4)
+        self.assertEqual(buf, b"0123")
+
+        view = memoryview(bytearray(16))
+        sz = self.stream.readinto(self.handle, view)
+        self.assertEqual(view[:sz], b"456789")
+        self.assertEqual(self.stream.readinto(self.handle, view), 0)
+
+
+class DefaultStream(StreamPosix):
+    readinto = IStreamService.readinto
+
+
+class TestStreamDefaults(TestStreamPosix):
+    def setUp(self):
+        super().setUp()
+        self.stream = DefaultStream()
+
+
+class TestStreamCodec(unittest.TestCase):
+    def setUp(self):
+        self.stream = StreamPosix()
+        self.stream.stream_codecs = ["zlib", "lzma"]
+
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(os.fsencode(tmpdir.name), b"file")
+        self.data = b"0123456789\n" * 10000
+
+    def test_codecs(self):
+        self.assertEqual(self.stream.codecs(), ("zlib", "lzma"))
+        self.assertEqual(StreamPosix().codecs(), ())
+        self.assertEqual(IStreamService.codecs(self.stream), ())
+
+    def test_read_encoded(self):
+        with open(self.path, "wb") as f:
+            f.write(self.data)
+
+        _, handle = self.stream.open_file(self.path, Wiring.IN.value, extras={"codec": "zlib"})
+        self.addCleanup(self.stream.close, handle)
+
+        data = bytearray()
+        while chunk := self.stream.read(handle, 1000):
+            data += chunk
+
+        self.assertLess(len(data), len(self.data))
+        self.assertEqual(zlib.decompress(data), self.data)
+
+    def test_write_encoded(self):
+        _, handle = self.stream.open_file(self.path, (Wiring.OUT | Wiring.CREATE).value, extras={"codec": "lzma"})
+
+        data = lzma.compress(self.data)
+        for i in range(0, len(data), 100):
+            self.assertEqual(self.stream.write(handle, data[i : i + 100]), len(data[i : i + 100]))
+        self.stream.close(handle)
+
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), self.data)
+
+    def test_codec_errors(self):
+        with self.assertRaises(ValueError):
+            self.stream.open_file(self.path, (Wiring.OUT | Wiring.CREATE).value, extras={"codec": "zstd"})
+
+        _, handle = self.stream.open_file(self.path, Wiring.IN.value, extras={"codec": "zlib"})
+        self.addCleanup(self.stream.close, handle)
+        with self.assertRaises(OSError):
+            self.stream.seek(handle, 0, 0)
+
+    def test_truncated_write(self):
+        _, handle = self.stream.open_file(self.path, (Wiring.OUT | Wiring.CREATE).value, extras={"codec": "zlib"})
+        self.stream.write(handle, zlib.compress(self.data)[:-4])
+
+        with self.assertRaises(OSError):
+            self.stream.close(handle)
+
+
+class TestCodec(unittest.TestCase):
+    def test_entropy(self):
+        self.assertEqual(mcodec.entropy(b""), 0.0)
+        self.assertEqual(mcodec.entropy(b"a" * 100), 0.0)
+        self.assertAlmostEqual(mcodec.entropy(bytes(range(256))), 8.0)
+
+    def test_truncated(self):
+        data = zlib.compress(b"0123456789" * 100)
+        reader = mcodec.reader(io.BytesIO(data[:-4]), "zlib")
+        with self.assertRaises(OSError):
+            reader.read()
+
+
+if __name__ == "__main__":
+    unittest.main()
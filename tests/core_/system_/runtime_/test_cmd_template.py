@@ -0,0 +1,29 @@
+import unittest
+
+from myrrh.core._system.runtime._runtime import _CmdTemplate
+
+
+class CmdTemplateTest(unittest.TestCase):
+    binb = {b"echo": b"/bin/echo", b"pct": b"/opt/100%/bin", b"path": b"/bin/path"}
+
+    def test_static(self):
+        template = _CmdTemplate(b'%(echo)s "50%%"', self.binb)
+        self.assertEqual(template.static, b'/bin/echo "50%"')
+        self.assertEqual(template.format({}), b'/bin/echo "50%"')
+
+    def test_arguments(self):
+        template = _CmdTemplate(b"%(pct)s %(arg)s %%", self.binb)
+        self.assertIsNone(template.static)
+        self.assertEqual(template.format({b"arg": b"a%b"}), b"/opt/100%/bin a%b %")
+
+    def test_binaries_first(self):
+        template = _CmdTemplate(b"%(path)s", self.binb)
+        self.assertEqual(template.format({b"path": b"/tmp"}), b"/bin/path")
+
+    def test_missing(self):
+        template = _CmdTemplate(b"%(missing)s", self.binb)
+        self.assertRaises(KeyError, template.format, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
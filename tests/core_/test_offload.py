@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+
+from concurrent.futures.process import BrokenProcessPool
+
+from myrrh.core.services import offload
+
+
+def _pid(data):
+    return os.getpid(), bytes(data[:4]), len(data)
+
+
+def _exit(data):
+    os._exit(1)
+
+
+def _exit_once(data, marker):
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+
+    return os.getpid()
+
+
+def _fail(data):
+    raise FileNotFoundError(2, "missing")
+
+
+class TestOffload(unittest.TestCase):
+    def setUp(self):
+        self.max_workers, self.threshold = offload.MAX_WORKERS, offload.THRESHOLD
+        offload.MAX_WORKERS, offload.THRESHOLD = 2, 1024
+
+        self.addCleanup(offload.shutdown)
+
+    def tearDown(self):
+        offload.MAX_WORKERS, offload.THRESHOLD = self.max_workers, self.threshold
+
+    def test_inline(self):
+        self.assertEqual(offload.run(_pid, b"data"), (os.getpid(), b"data", 4))
+
+    def test_offloaded(self):
+        data = b"data" * 1024
+
+        pid, head, size = offload.run(_pid, data)
+
+        self.assertNotEqual(pid, os.getpid())
+        self.assertEqual((head, size), (b"data", len(data)))
+
+    def test_disabled(self):
+        offload.MAX_WORKERS = 0
+
+        self.assertEqual(offload.run(_pid, bytes(4096))[0], os.getpid())
+
+    def test_error(self):
+        with self.assertRaises(FileNotFoundError):
+            offload.run(_fail, bytes(4096))
+
+    def test_broken_pool(self):
+        with self.assertRaises(BrokenProcessPool):
+            offload.run(_exit, bytes(4096))
+
+        self.assertNotEqual(offload.run(_pid, bytes(4096))[0], os.getpid())
+
+    def test_broken_pool_retry(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            pid = offload.run(_exit_once, bytes(4096), os.path.join(tmp, "marker"))
+
+        self.assertNotEqual(pid, os.getpid())
+
+    @unittest.skipUnless(os.path.isdir("/dev/shm"), "/dev/shm required")
+    def test_shared_memory_released(self):
+        def segments():
+            return {n for n in os.listdir("/dev/shm") if n.startswith("psm_")}
+
+        before = segments()
+
+        futures = [offload.submit(_pid, bytearray(4096)) for _ in range(4)]
+        for f in futures:
+            f.result()
+
+        self.assertEqual(segments() - before, set())
+
+
+if __name__ == "__main__":
+    unittest.main()
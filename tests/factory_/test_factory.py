@@ -101,6 +101,23 @@ class ItemsBasicTests(unittest.TestCase):
         self.assertEqual(c.type_, "new_kind")
         self.assertEqual(c.key, "value")
 
+    def test_basic_construct_item(self):
+        item = ItemRegistry().warehouse_model_validate({"type_": "system", "label": "mylabel"})
+        c = ItemRegistry().warehouse_model_construct(dict(item))
+
+        self.assertIsInstance(c, ItemRegistry().system)
+        self.assertEqual(c, item)
+
+        item = ItemRegistry().warehouse_model_validate({"type_": "new_kind", "key": "value"})
+        c = ItemRegistry().warehouse_model_construct(dict(item))
+
+        self.assertIsInstance(c, ItemRegistry().generic)
+        self.assertEqual(c.key, "value")
+
+    def test_basic_adapter_cached(self):
+        adapter = ItemRegistry().type_adapter("WarehouseItemT")
+        self.assertIs(ItemRegistry().type_adapter("WarehouseItemT"), adapter)
+
 
 class RegisterBasicTests(unittest.TestCase):
     def test_basic_register_item(self):
@@ -118,6 +135,22 @@ class RegisterBasicTests(unittest.TestCase):
         self.assertEqual(c.val, "value")
         self.assertIn("plugin", ItemRegistry().items)
 
+    def test_basic_register_invalidate_adapter(self):
+        from myrrh.warehouse.item import BaseItem
+
+        class CachedItem(BaseItem[typing.Literal["cached"]]):
+            type_: typing.Literal["cached"]
+            val: str = ""
+
+        adapter = ItemRegistry().type_adapter("WarehouseItemT")
+        generation = ItemRegistry().generation
+
+        ItemRegistry().register_warehouse(CachedItem)
+
+        self.assertEqual(ItemRegistry().generation, generation + 1)
+        self.assertIsNot(ItemRegistry().type_adapter("WarehouseItemT"), adapter)
+        self.assertIsInstance(ItemRegistry().warehouse_model_validate({"type_": "cached"}), CachedItem)
+
     def test_basic_register_provider_model(self):
         import myrrh.warehouse
 
@@ -0,0 +1,114 @@
+import unittest
+
+from unittest import mock
+
+from myrrh.core.services import offload
+from myrrh.framework.arch.nt.mpython.mwinreg import WinReg
+
+
+class FakeOs:
+    def __init__(self, *outputs):
+        self.outputs = list(outputs)
+        self.calls = []
+
+    def p(self, path):
+        return path
+
+    def sh_escape_bytes(self, value):
+        return value
+
+    def cmd(self, cmd, **kwargs):
+        self.calls.append((cmd, kwargs))
+        return self.outputs.pop(0), "", 0
+
+
+class _WinReg(WinReg):
+    myrrh_os = None  # type: ignore[assignment]
+    myrrh_syscall = None  # type: ignore[assignment]
+    __root_system__ = None
+
+    def __new__(cls, myrrh_os):
+        winreg = object.__new__(cls)
+        winreg.myrrh_os = myrrh_os
+        return winreg
+
+    def __init__(self, myrrh_os):
+        super().__init__()
+
+
+REG_QUERY_TREE = """
+HKEY_LOCAL_MACHINE\\SOFTWARE\\Myrrh
+    Name    REG_SZ    myrrh
+
+HKEY_LOCAL_MACHINE\\SOFTWARE\\Myrrh\\Sub
+    Count    REG_DWORD    0x2
+
+HKEY_LOCAL_MACHINE\\SOFTWARE\\Myrrh\\Deep\\Deeper
+    Path    REG_SZ    c:\\myrrh
+"""
+
+
+class TestWinRegSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.os = FakeOs(REG_QUERY_TREE)
+        self.winreg = _WinReg(self.os)
+        self.winreg._default_key = "(Default)"
+
+    def test_build(self):
+        tree = self.winreg._snapshot_build("HKLM\\Software\\Myrrh", REG_QUERY_TREE)
+
+        self.assertEqual(
+            tree,
+            {
+                "hkey_local_machine\\software\\myrrh": (["Sub", "Deep"], [("Name", "myrrh", 1)]),
+                "hkey_local_machine\\software\\myrrh\\sub": ([], [("Count", 2, 4)]),
+                "hkey_local_machine\\software\\myrrh\\deep": (["Deeper"], []),
+                "hkey_local_machine\\software\\myrrh\\deep\\deeper": ([], [("Path", "c:\\myrrh", 1)]),
+            },
+        )
+
+    def test_served(self):
+        hklm = self.winreg.PyHKEY(0, self.winreg, None, "HKLM")
+        self.winreg.SnapshotKey(hklm, "SOFTWARE\\Myrrh")
+        self.assertEqual(len(self.os.calls), 1)
+
+        key = self.winreg.OpenKey(self.winreg.HKEY_LOCAL_MACHINE, "software\\myrrh\\Deep")
+        self.assertEqual(self.winreg.EnumKey(key, 0), "Deeper")
+
+        key = self.winreg.OpenKey(key, "Deeper")
+        self.assertEqual(self.winreg.QueryValueEx(key, "Path"), ("c:\\myrrh", 1))
+
+        with self.assertRaises(FileNotFoundError):
+            self.winreg.OpenKey(self.winreg.HKEY_LOCAL_MACHINE, "SOFTWARE\\Myrrh\\None")
+
+        self.assertEqual(len(self.os.calls), 1)
+
+    def test_invalidate(self):
+        self.winreg.SnapshotKey(self.winreg.HKEY_LOCAL_MACHINE, "SOFTWARE\\Myrrh")
+        self.winreg._snapshot_invalidate(".", "HKLM\\SOFTWARE\\Myrrh\\Sub")
+
+        self.assertEqual(self.winreg._snapshots, {})
+
+
+class TestWinRegParse(unittest.TestCase):
+    def test_undecoded_bytes(self):
+        winreg = _WinReg(FakeOs())
+
+        rows = winreg._parse("\nHKEY_LOCAL_MACHINE\\SOFTWARE\\Myrrh\n    Name    REG_SZ    caf\udce9\n")
+
+        self.assertEqual(rows[0], ["HKEY_LOCAL_MACHINE\\SOFTWARE\\Myrrh", "Name", "caf\udce9", "REG_SZ"])
+
+    def test_offloaded_snapshot(self):
+        winreg = _WinReg(FakeOs())
+        winreg._default_key = "(Default)"
+
+        with mock.patch.object(offload, "run", wraps=offload.run) as run:
+            winreg._parse(REG_QUERY_TREE)
+            self.assertFalse(run.called)
+
+            winreg._snapshot_build("HKLM\\Software\\Myrrh", REG_QUERY_TREE)
+            self.assertEqual(run.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
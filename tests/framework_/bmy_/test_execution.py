@@ -1,8 +1,13 @@
 # -*- coding: utf-8 -*-
+import os
 import time
 import bmy
 import unittest
 
+from unittest import mock
+
+from myrrh.framework.msh.madvsh import _ExecutionInformation, _OutputCapture
+
 alt1 = "alt1"
 if alt1 not in bmy.eids():
     # default using local entity
@@ -88,3 +93,111 @@ class TestBmyExecute(unittest.TestCase):
         exe = bmy.execute("ping 127.0.0.1", ttl=2, count=1)
         o, e, r = next(iter(exe))
         self.assertNotEqual(o.find("127.0.0.1"), -1)
+
+    def test_execute_capture_limits(self):
+        with mock.patch.multiple(_ExecutionInformation, CAPTURE_MAX_SIZE=1000, CAPTURE_TAIL=True, CAPTURE_SPILL_SIZE=100):
+            exe = bmy.execute("seq 1 100000")
+
+        o, e, r = exe[0]
+        self.assertEqual(r, 0)
+        self.assertEqual(len(o), 1000)
+        self.assertTrue(o.endswith("99999\n100000\n"))
+        self.assertGreater(exe[0].dropped[0], 0)
+
+
+class TestBmyExecuteStreaming(unittest.TestCase):
+    def test_consumer_lines(self):
+        events = []
+        o, e, r = bmy.execute("echo a; echo b >&2; echo c", consumer=lambda stream, data: events.append((stream, data)), lines=True)
+
+        self.assertEqual(r, 0)
+        self.assertEqual([d for s, d in events if s == "out"], ["a\n", "c\n"])
+        self.assertEqual([d for s, d in events if s == "err"], ["b\n"])
+        self.assertEqual(o, "a\nc\n")
+
+    def test_consumer_abort(self):
+        with bmy.select():
+            from mlib.sh import advsh
+
+        def consumer(stream, data):
+            if data.startswith("3"):
+                raise advsh.Abort()
+
+        start = time.monotonic()
+        exe = bmy.execute("for i in 1 2 3 4 5 6 7 8 9 10; do echo $i; sleep 1; done", consumer=consumer, lines=True, count=2, timeout=30)
+
+        self.assertLess(time.monotonic() - start, 8)
+        self.assertEqual(exe.ncalls, 1)
+        self.assertIn("aborted", exe[0].state)
+
+    def test_events(self):
+        with bmy.select():
+            from mlib.sh import advsh
+
+        events = []
+        for stream, data in advsh.execute("for i in 1 2 3 4 5 6 7 8 9 10; do echo $i; sleep 1; done", deferred=True, timeout=30).events(lines=True):
+            events.append((stream, data))
+            if data.startswith("2"):
+                break
+
+        self.assertEqual(events, [("out", "1\n"), ("out", "2\n")])
+
+    def test_events_restore(self):
+        with bmy.select():
+            from mlib.sh import advsh
+
+        exe = advsh.execute("echo a", deferred=True, timeout=30)
+        self.assertEqual(list(exe.events(lines=True)), [("out", "a\n")])
+
+        self.assertIsNone(exe._consumer)
+        self.assertFalse(exe._lines)
+
+
+class TestOutputCapture(unittest.TestCase):
+    def test_unbounded(self):
+        capture = _OutputCapture(spill_size=10)
+        for i in range(100):
+            capture.extend(b"%03d" % i)
+
+        self.assertEqual(len(capture), 300)
+        self.assertEqual(bytes(capture.getvalue()), b"".join(b"%03d" % i for i in range(100)))
+        self.assertEqual(capture.dropped, 0)
+
+    def test_head(self):
+        capture = _OutputCapture(max_size=10)
+        capture.extend(b"0123456")
+        capture.extend(b"789abc")
+
+        self.assertEqual(bytes(capture.getvalue()), b"0123456789")
+        self.assertEqual(capture.dropped, 3)
+
+    def test_tail(self):
+        for spill_size in (None, 10):
+            capture = _OutputCapture(max_size=1000, tail=True, spill_size=spill_size)
+            data = b"".join(b"%05d" % i for i in range(10000))
+            for i in range(0, len(data), 7):
+                capture.extend(data[i : i + 7])
+
+            self.assertEqual(bytes(capture.getvalue()), data[-1000:])
+            self.assertEqual(capture.dropped, len(data) - 1000)
+
+            capture.clear()
+            self.assertEqual(len(capture), 0)
+            self.assertEqual(bytes(capture.getvalue()), b"")
+
+    def test_close(self):
+        capture = _OutputCapture(spill_size=10)
+        capture.extend(b"0123456789abcdef")
+        path = capture._path
+
+        capture.close()
+        self.assertIsNone(capture._file)
+        self.assertEqual(capture.getvalue(), b"0123456789abcdef")
+        self.assertEqual(capture.getvalue(lambda data: bytes(data[-3:])), b"def")
+
+        capture.extend(b"g")
+        capture.close()
+        self.assertEqual(capture.getvalue(), b"0123456789abcdefg")
+
+        del capture
+        self.assertFalse(os.path.exists(path))
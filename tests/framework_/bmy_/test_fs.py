@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import bmy
+import errno
 import unittest
 import io as localio
 
@@ -10,7 +11,10 @@ from myrrh.utils.myrrh_test_init import *  # noqa: F403
 setUp(f"bmy.{os.path.basename(__file__)}")  # noqa: F405
 
 with bmy.select():
+    from mlib.fs import advfs
     from mlib.py import os
+    from mlib.py import shutil
+    from mlib.py import tarfile
     from mlib.py.test.support import os_helper
 
 
@@ -200,6 +204,15 @@ class TestFs(SetupDirEntity):
         self.assertEqual(len(dirs2), 1)
         self.assertEqual(dirs2[0], bmy.joinpath(os_helper.TESTFN, "TEST1", "tmp1"))
 
+    def test_lsdir_pattern(self):
+        files = bmy.lsdir(bmy.joinpath(os_helper.TESTFN, "**", "tmp*"), recursive=True)
+
+        self.assertEqual(sorted(files), sorted(self.files))
+
+        files = bmy.lsdir(bmy.joinpath(os_helper.TESTFN, "**", "tmp*"))
+
+        self.assertEqual(sorted(files), sorted(f for f in self.files if f.count(os.sep) == 2))
+
     def test_mkdir(self):
         for d in self.dirs:
             path = bmy.joinpath(self.dirs[0], d)
@@ -220,12 +233,152 @@ class TestRm(SetupDirEntity):
         for f in self.files:
             self.assertRaises(FileNotFoundError, bmy.fstat, f)
 
+    def test_rm_pattern(self):
+        bmy.rm(bmy.joinpath(os_helper.TESTFN, "**", "tmp*"))
+        for f in self.files:
+            self.assertRaises(FileNotFoundError, bmy.fstat, f)
+
+        for d in self.dirs:
+            bmy.fstat(d)
+
+    def test_rm_literal(self):
+        path = bmy.joinpath(self.dirs[-1], "tmp[1]")
+        bmy.entity().runtime.myrrh_syscall.stream_out(os.fsencode(path), localio.BytesIO(b"literal"))
+        bmy.fstat(path)
+
+        bmy.rm(path)
+        self.assertRaises(FileNotFoundError, bmy.fstat, path)
+
     def test_rm_dirs(self):
         bmy.rm(self.dirs)
         for d in self.dirs:
             self.assertRaises(FileNotFoundError, bmy.fstat, d)
 
 
+class TestBulk(SetupDirEntity):
+    def test_bulk_touch_chmod(self):
+        paths = [bmy.joinpath(self.dirs[-1], "bulk%d" % i) for i in range(500)]
+
+        self.assertEqual(advfs.bulk("touch", paths), [(p, 0) for p in paths])
+        self.assertEqual(advfs.bulk("chmod", paths, 0o600), [(p, 0) for p in paths])
+
+        for p in paths:
+            self.assertEqual(os.stat(p).st_mode & 0o777, 0o600)
+
+    def test_bulk_mkdir_rm(self):
+        paths = [bmy.joinpath(self.dirs[-1], "bulk %d" % i, "sub") for i in range(10)]
+
+        self.assertEqual(advfs.bulk("mkdir", paths), [(p, 0) for p in paths])
+        self.assertTrue(all(os.path.isdir(p) for p in paths))
+
+        self.assertEqual(advfs.bulk("rm", paths), [(p, 0) for p in paths])
+        self.assertFalse(any(os.path.exists(p) for p in paths))
+
+    def test_bulk_errors(self):
+        path = bmy.joinpath(self.files[0], "sub")
+
+        self.assertEqual(advfs.bulk("mkdir", [self.dirs[0], path]), [(self.dirs[0], 0), (path, errno.ENOTDIR)])
+        self.assertRaises(ValueError, advfs.bulk, "unknown", [path])
+        self.assertRaises(ValueError, advfs.bulk, "chmod", [path])
+
+
+class TestBatch(SetupDirEntity):
+    def test_batch_ops(self):
+        dest = bmy.joinpath(self.dirs[-1], "batch dir")
+
+        with advfs.batch() as batch:
+            st = batch.stat(self.files[0])
+            exists = batch.exists(self.files[0])
+            mkdir = batch.makedirs(bmy.joinpath(dest, "sub"))
+            rename = batch.rename(self.files[0], bmy.joinpath(dest, "renamed"))
+            chmod = batch.chmod(bmy.joinpath(dest, "renamed"), 0o600)
+            listdir = batch.listdir(dest)
+
+        self.assertEqual(st.result().st_size, self.filecontents["tmp1"]["size"])
+        self.assertTrue(exists.result())
+        self.assertIsNone(mkdir.result())
+        self.assertIsNone(rename.result())
+        self.assertIsNone(chmod.result())
+        self.assertEqual(sorted(listdir.result()), ["renamed", "sub"])
+        self.assertEqual(os.stat(bmy.joinpath(dest, "renamed")).st_mode & 0o777, 0o600)
+        self.assertFalse(os.path.exists(self.files[0]))
+
+    def test_batch_errors(self):
+        path = bmy.joinpath(self.dirs[-1], "none")
+
+        with advfs.batch() as batch:
+            exists = batch.exists(path)
+            st = batch.stat(path)
+            remove = batch.remove(self.dirs[0])
+            mkdir = batch.mkdir(self.dirs[0])
+            rmdir = batch.rmdir(self.dirs[0])
+            listdir = batch.listdir(self.files[1])
+
+        self.assertFalse(exists.result())
+        self.assertEqual([op.errno for op in batch.errors], [errno.ENOENT, errno.EISDIR, errno.EEXIST, errno.ENOTEMPTY, errno.ENOTDIR])
+        self.assertRaises(FileNotFoundError, st.result)
+        self.assertRaises(IsADirectoryError, remove.result)
+        self.assertRaises(FileExistsError, mkdir.result)
+        self.assertRaises(OSError, rmdir.result)
+        self.assertRaises(NotADirectoryError, listdir.result)
+
+    def test_batch_many(self):
+        paths = [bmy.joinpath(self.dirs[-1], "batch %d" % i) for i in range(500)]
+
+        with advfs.batch() as batch:
+            for p in paths:
+                batch.makedirs(p)
+
+        self.assertFalse(batch.errors)
+
+        with advfs.batch() as batch:
+            for p in paths:
+                batch.rmtree(p)
+
+        self.assertFalse(batch.errors)
+        self.assertFalse(any(os.path.exists(p) for p in paths))
+
+    def test_batch_not_run(self):
+        batch = advfs.batch()
+        st = batch.stat(self.files[0])
+
+        self.assertRaises(RuntimeError, st.result)
+        batch.run()
+        self.assertEqual(st.result().st_size, self.filecontents["tmp1"]["size"])
+
+
+class TestArchive(SetupDirEntity):
+    def setUp(self):
+        super().setUp()
+        self.archive_path = os_helper.TESTFN + "_archive"
+        self.addCleanup(shutil.rmtree, self.archive_path, True)
+
+    def assertExtracted(self, path):
+        for f in self.files:
+            self.assertEqual(read_dist(bmy.joinpath(path, f), bmy.entity()), self.filecontents[os.path.basename(f)]["data"])
+
+    def test_make_unpack_archive(self):
+        for format in ("tar", "gztar"):
+            base_name = bmy.joinpath(self.archive_path, format)
+            archive_name = shutil.make_archive(base_name, format, base_dir=os_helper.TESTFN)
+            self.assertTrue(os.path.isfile(archive_name))
+
+            extract_dir = bmy.joinpath(self.archive_path, "extract_" + format)
+            shutil.unpack_archive(archive_name, extract_dir)
+            self.assertExtracted(extract_dir)
+
+    def test_tarfile_extractall(self):
+        archive_name = shutil.make_archive(bmy.joinpath(self.archive_path, "archive"), "gztar", base_dir=os_helper.TESTFN)
+
+        extract_dir = bmy.joinpath(self.archive_path, "extract")
+        with tarfile.open(archive_name) as tar:
+            tar.extractall(extract_dir)
+        self.assertExtracted(extract_dir)
+
+    def test_archive_unsupported(self):
+        self.assertFalse(advfs.archive(bmy.joinpath(self.archive_path, "archive.tar.zst"), None, [os_helper.TESTFN], "zstd"))
+
+
 class TestMove(SetupDirEntity):
     def test_move(self):
         path = bmy.joinpath(self.dirs[0], "moved")
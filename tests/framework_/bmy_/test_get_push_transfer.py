@@ -69,6 +69,18 @@ class BMyrrhstProfile(unittest.TestCase):
                 )
             )
 
+    def _enable_codecs(self):
+        from unittest import mock
+        from mplugins.provider.local.system import StreamPosix
+
+        patcher = mock.patch.object(StreamPosix, "stream_codecs", ["zlib"])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        syscall = bmy.entity(main).runtime.myrrh_syscall
+        syscall._codecs.clear()
+        self.addCleanup(syscall._codecs.clear)
+
 
 class SetupDirLocal(BMyrrhstProfile):
     def setUp(self):
@@ -266,6 +278,37 @@ class TestBmyGet(SetupDirEntity):
 
         self.total = sum(len(d) for d in data)
 
+    def test_getdir_verify(self):
+        tempdir = localtempfile.mkdtemp()
+        self.addCleanup(localsupport.rmtree, tempdir + localos.sep)
+
+        dirs, files = bmy.get(support.TESTFN, tempdir + localos.sep, verify=True)
+
+        self.assertEqual(len(files), len(self.files))
+        self.assertDirs(dirs)
+
+    def test_getdir_compressed(self):
+        self._enable_codecs()
+
+        tempdir = localtempfile.mkdtemp()
+        self.addCleanup(localsupport.rmtree, tempdir + localos.sep)
+
+        dirs, files = bmy.get(support.TESTFN, tempdir + localos.sep, verify=True)
+
+        self.assertEqual(len(files), len(self.files))
+        self.assertDirs(dirs)
+
+    def test_hash_files(self):
+        import hashlib
+
+        digests = advfs.hash_files(self.files + [support.TESTFN], "sha256")
+
+        for digest, file in zip(digests, self.files):
+            self.assertEqual(digest, hashlib.sha256(self.filecontents[os.path.basename(file)]["data"]).hexdigest())
+
+        self.assertIsNone(digests[-1])
+        self.assertRaises(ValueError, advfs.hash_files, self.files, "unknown")
+
     def test_getdir_nochunk(self):
         tempdir = localtempfile.mkdtemp()
         self.addCleanup(localsupport.rmtree, tempdir + localos.sep)
@@ -395,6 +438,26 @@ class TestBmyPush(SetupDirLocal):
 
         self.total = sum(len(d) for d in data)
 
+    def test_pushdir_verify(self):
+        tempdir = tempfile.mkdtemp(dir=os.getcwd())
+        self.addCleanup(support.rmtree, tempdir + os.sep)
+
+        dirs, files = bmy.push(localsupport.TESTFN, tempdir + os.sep, verify=True)
+
+        self.assertEqual(len(files), len(self.files))
+        self.assertDirs(dirs)
+
+    def test_pushdir_compressed(self):
+        self._enable_codecs()
+
+        tempdir = tempfile.mkdtemp(dir=os.getcwd())
+        self.addCleanup(support.rmtree, tempdir + os.sep)
+
+        dirs, files = bmy.push(localsupport.TESTFN, tempdir + os.sep, verify=True)
+
+        self.assertEqual(len(files), len(self.files))
+        self.assertDirs(dirs)
+
     def test_pushdir_rename(self):
         tempdir = tempfile.mkdtemp(dir=os.getcwd())
         self.addCleanup(support.rmtree, tempdir)
@@ -500,6 +563,15 @@ class TestBmyTransfer(SetupDirEntity):
 
         self.total = sum(len(d) for d in data)
 
+    def test_transferdir_verify(self):
+        tempdir = tgttempfile.mkdtemp(dir=tgtos.getcwd())
+        self.addCleanup(tgtsupport.rmtree, tempdir + tgtos.sep)
+
+        dirs, files = bmy.transfer(main, support.TESTFN, tempdir + tgtos.sep, eid=tgt, verify=True)
+
+        self.assertEqual(len(files), len(self.files))
+        self.assertDirs(dirs)
+
     def test_transferdir_rename(self):
         tempdir = tgttempfile.mkdtemp(dir=tgtos.getcwd())
         self.addCleanup(tgtsupport.rmtree, tempdir)
@@ -543,6 +615,75 @@ class TestBmyTransfer(SetupDirEntity):
         self.total = sum(len(d) for d in data)
 
 
+class TestStreamIn(BMyrrhstProfile):
+    def setUp(self):
+        super().setUp()
+        from unittest import mock
+
+        self._enable_codecs()
+        self.syscall = bmy.entity(main).runtime.myrrh_syscall
+        self.syscall._samples.clear()
+
+        self.tempdir = tempfile.mkdtemp(dir=os.getcwd())
+        self.addCleanup(support.rmtree, self.tempdir)
+
+        # the codec of each opened file
+        self.codecs = []
+        open_file = self.syscall.open_file
+
+        def record(file_path, *a, extras=None, **kw):
+            self.codecs.append(extras and extras.get("codec"))
+            return open_file(file_path, *a, extras=extras, **kw)
+
+        patcher = mock.patch.object(self.syscall, "open_file", side_effect=record)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _read(self, name, data):
+        path = os.path.join(self.tempdir, name)
+        with local_open(path, "wb") as f:
+            f.write(data)
+
+        self.assertEqual(read_dist(path, main), data)
+
+    def test_stream_in_compressed(self):
+        min_size = self.syscall.CODEC_MIN_SIZE
+        for size in (10, min_size, min_size * 3 + 7):
+            self._read("data%d" % size, b"".join(b"line %d\n" % i for i in range(size))[:size])
+
+        self.assertEqual(self.codecs, [None, "zlib", "zlib"])
+
+    def test_stream_in_entropy(self):
+        data = localos.urandom(self.syscall.CODEC_MIN_SIZE * 2)
+
+        # the first file of a kind is compressed, its content sample turns compression off for the next ones
+        self._read("random1.bin", data)
+        self._read("random2.bin", data)
+        self._read("random3.BIN", data)
+        self._read("random.txt", data)
+
+        self.assertEqual(self.codecs, ["zlib", None, None, "zlib"])
+
+    @unittest.skipUnless(hasattr(localos, "mkfifo"), "requires mkfifo")
+    def test_stream_in_fifo(self):
+        import threading
+
+        path = os.path.join(self.tempdir, "fifo")
+        localos.mkfifo(path)
+        data = bytes(i % 251 for i in range(self.syscall.CODEC_MIN_SIZE * 2))
+
+        def write():
+            with local_open(path, "wb") as f:
+                f.write(data)
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        self.addCleanup(writer.join)
+
+        self.assertEqual(read_dist(path, main), data)
+        self.assertEqual(self.codecs, [None])
+
+
 """
 def load_tests(*args):
     tests = (TestBmyPush,
@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+import os
+import tempfile
 import unittest
 import bmy
 
@@ -57,5 +59,39 @@ class TestBmyNew(unittest.TestCase):
         self.assertRaises(bmy.BmyMyrrhFailure, bmy.build, eid=eid)
 
 
+class TestBmyLoad(unittest.TestCase):
+    def setUp(self):
+        bmy.init()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = tmp.name
+
+        for eid in ("l1", "l2"):
+            bmy.build(eid=bmy.new(path="**/local", eid=eid))
+            bmy.save(self.path, eid=eid)
+
+        bmy.init()
+
+    def test_load_build(self):
+        reports = []
+        eids = bmy.load(self.path, build=True, progress=lambda *args: reports.append(args))
+
+        self.assertEqual(sorted(eids), ["l1", "l2"])
+        self.assertTrue(bmy.isbuilt(eid=eids))
+        self.assertEqual(sorted(r[3] for r in reports), [1, 2])
+        self.assertTrue(all(r[2] is None and r[4] == 2 for r in reports))
+
+    def test_load_failure_isolation(self):
+        with open(os.path.join(self.path, "broken.emyrrh"), "w") as f:
+            f.write("{")
+
+        with self.assertRaises(bmy.BmyMyrrhFailure) as cm:
+            bmy.load(self.path, max_workers=2)
+
+        self.assertIn("broken", str(cm.exception))
+        self.assertTrue({"l1", "l2"}.issubset(bmy.eids()))
+        self.assertNotIn("broken", bmy.eids())
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
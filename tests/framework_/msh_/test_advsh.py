@@ -0,0 +1,82 @@
+import threading
+import time
+import unittest
+
+from unittest import mock
+
+from myrrh.framework.msh.madvsh import _ExecutionInformation
+from myrrh.utils import mtimer
+
+
+class FakeProc:
+    """
+    process exiting after delay, its output stays open as if held by a child
+    """
+
+    def __init__(self, delay):
+        self._exited = threading.Event()
+        threading.Timer(delay, self._exited.set).start()
+
+    def output(self, nbytes=None, timeout=None):
+        return None
+
+    error = output
+
+    @property
+    def exit_status(self):
+        return 0 if self._exited.is_set() else None
+
+    def wait(self, timeout=None):
+        self._exited.wait(timeout)
+        return self.exit_status
+
+    def terminate(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class TestCommunicate(unittest.TestCase):
+    def _communicate(self, **kwargs):
+        exe = _ExecutionInformation(FakeProc(0.1), bytes, **kwargs)
+
+        # the timer steps are much longer than the process
+        with mock.patch.object(mtimer.MBurstTimer, "_VECTOR", [5]):
+            start = time.monotonic()
+            exe.communicate(timeout=30)
+
+        return time.monotonic() - start
+
+    def test_polling_exit(self):
+        self.assertLess(self._communicate(), 2)
+
+    def test_consumer_exit(self):
+        self.assertLess(self._communicate(consumer=lambda *_a: None), 2)
+
+    def test_consumer_output_end(self):
+        class SlowProc(FakeProc):
+            # the output ends well after the process exited
+            def __init__(self):
+                super().__init__(0.1)
+                self._chunks = [b"a", b"b", b"c"]
+
+            def output(self, nbytes=None, timeout=None):
+                if not self._chunks:
+                    return None
+                time.sleep(0.6)
+                return self._chunks.pop(0)
+
+            def error(self, nbytes=None, timeout=None):
+                return None
+
+        events = []
+        exe = _ExecutionInformation(SlowProc(), bytes, consumer=lambda stream, data: events.append(data))
+        exe.communicate(timeout=30)
+
+        self.assertEqual(events, [b"a", b"b", b"c"])
+        self.assertEqual(exe.out, b"abc")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import time
+import bmy
+import unittest
+
+from myrrh.framework.msh.mscheduler import Job, Scheduler
+
+main = "main"
+if main not in bmy.eids():
+    # default using local entity
+    main = bmy.new(path="**/local", eid="main")
+
+if not bmy.isbuilt(eid=main):
+    bmy.build(eid=main)
+
+with bmy.select(main):
+    from mlib.sh import advsh
+
+
+class TestScheduler(unittest.TestCase):
+    def test_periodic_results(self):
+        with Scheduler(2, jitter=0) as scheduler:
+            job = scheduler.add(advsh, "echo scheduled", 0.1)
+            results = [scheduler.results.get(timeout=10) for _ in range(3)]
+
+        for result in results:
+            self.assertIs(result.job, job)
+            self.assertIsNone(result.error)
+            o, _, r = result.exe
+            self.assertEqual(r, 0)
+            self.assertEqual(o.strip(), "scheduled")
+
+        self.assertGreaterEqual(job.stats["runs"], 3)
+        self.assertIsNotNone(job.stats["latency_mean"])
+
+    def test_skip_overlapping(self):
+        with Scheduler(2, jitter=0) as scheduler:
+            job = scheduler.add(advsh, "sleep 0.5", 0.1, timeout=10)
+            time.sleep(0.8)
+
+        self.assertLessEqual(job.runs, 2)
+        self.assertGreater(job.skipped, 0)
+
+    def test_group(self):
+        calls = []
+
+        with Scheduler(jitter=0, callback=calls.append) as scheduler:
+            jobs = scheduler.add([advsh, advsh], "echo group", 0.2)
+            for _ in range(2):
+                scheduler.results.get(timeout=10)
+
+            scheduler.remove(jobs[0])
+
+        self.assertEqual(len(jobs), 2)
+        self.assertEqual(scheduler.jobs, jobs[1:])
+        self.assertGreaterEqual(len(calls), 2)
+
+    def test_bounded_results(self):
+        with Scheduler(jitter=0, maxsize=1) as scheduler:
+            scheduler.add(advsh, "echo drop", 0.05)
+            deadline = time.monotonic() + 10
+            while not scheduler.dropped and time.monotonic() < deadline:
+                time.sleep(0.05)
+
+        self.assertTrue(scheduler.dropped)
+        self.assertEqual(scheduler.results.qsize(), 1)
+
+
+class TestJobStats(unittest.TestCase):
+    def test_zero_stats(self):
+        job = Job(advsh, "true", 1)
+        self.assertIsNone(job.stats["latency_mean"])
+
+        job._latencies.extend([0.0, 0.0])
+        job._lags.append(0.0)
+
+        self.assertEqual(job.stats["latency_mean"], 0.0)
+        self.assertEqual(job.stats["latency_max"], 0.0)
+        self.assertEqual(job.stats["latency_p95"], 0.0)
+        self.assertEqual(job.stats["lag_max"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
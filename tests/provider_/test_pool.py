@@ -0,0 +1,153 @@
+import threading
+import time
+import unittest
+
+from myrrh.provider import ISession, SessionPool
+
+
+class FakeSession(ISession):
+    def __init__(self, key):
+        self.key = key
+        self.healthy = True
+        self.closed = False
+
+    def alive(self):
+        return self.healthy
+
+    def close(self):
+        self.closed = True
+
+
+class TestSessionPool(unittest.TestCase):
+    def setUp(self):
+        self.created = []
+        self.pool = SessionPool(self.factory, max_size=2)
+        self.addCleanup(self.pool.close)
+
+    def factory(self, key):
+        session = FakeSession(key)
+        self.created.append(session)
+        return session
+
+    def test_reuse(self):
+        with self.pool.session("a") as s1:
+            pass
+
+        with self.pool.session("a") as s2:
+            pass
+
+        self.assertIs(s1, s2)
+        self.assertEqual(self.pool.stats["created"], 1)
+        self.assertEqual(self.pool.stats["reused"], 1)
+
+    def test_keys(self):
+        with self.pool.session("a") as s1, self.pool.session("b") as s2:
+            self.assertEqual((s1.key, s2.key), ("a", "b"))
+
+        self.assertEqual(self.pool.stats["keys"], {"a": {"idle": 1, "busy": 0}, "b": {"idle": 1, "busy": 0}})
+
+    def test_unhealthy(self):
+        with self.pool.session("a") as s1:
+            s1.healthy = False
+
+        with self.pool.session("a") as s2:
+            pass
+
+        self.assertIsNot(s1, s2)
+        self.assertTrue(s1.closed)
+        self.assertEqual(self.pool.stats["discarded"], 1)
+
+    def test_discard_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.pool.session("a") as s1:
+                raise RuntimeError
+
+        self.assertTrue(s1.closed)
+        self.assertEqual(self.pool.stats["idle"], 0)
+
+    def test_limit(self):
+        s1 = self.pool.acquire("a")
+        self.pool.acquire("a")
+
+        with self.assertRaises(TimeoutError):
+            self.pool.acquire("a", timeout=0.05)
+
+        threading.Timer(0.05, self.pool.release, ("a", s1)).start()
+        self.assertIs(self.pool.acquire("a", timeout=5), s1)
+
+        stats = self.pool.stats
+        self.assertEqual(stats["created"], 2)
+        self.assertEqual(stats["busy"], 2)
+        self.assertEqual(stats["timeouts"], 1)
+
+    def test_idle_eviction(self):
+        pool = SessionPool(self.factory, min_size=1, max_size=3, max_idle=0.01)
+        self.addCleanup(pool.close)
+
+        sessions = [pool.acquire("a") for _ in range(3)]
+        for s in sessions:
+            pool.release("a", s)
+
+        time.sleep(0.02)
+        pool.evict()
+
+        self.assertEqual([s.closed for s in sessions], [True, True, False])
+        self.assertEqual(pool.stats["evicted"], 2)
+
+    def test_eviction_across_keys(self):
+        pool = SessionPool(self.factory, max_idle=0.01)
+        self.addCleanup(pool.close)
+
+        with pool.session("a") as s1:
+            pass
+
+        time.sleep(0.02)
+        with pool.session("b"):
+            pass
+
+        self.assertTrue(s1.closed)
+        self.assertNotIn("a", pool.stats["keys"])
+
+    def test_max_keys(self):
+        pool = SessionPool(self.factory, max_keys=2)
+        self.addCleanup(pool.close)
+
+        with pool.session("a") as s1, pool.session("b"):
+            with self.assertRaises(TimeoutError):
+                pool.acquire("c", timeout=0.05)
+
+        with pool.session("a"), pool.session("c"):
+            pass
+
+        self.assertEqual(list(pool.stats["keys"]), ["a", "c"])
+        self.assertFalse(s1.closed)
+        self.assertTrue(self.created[1].closed)
+        self.assertEqual(pool.stats["evicted"], 1)
+
+    def test_fill(self):
+        pool = SessionPool(self.factory, min_size=2, max_size=3)
+        self.addCleanup(pool.close)
+
+        pool.fill("a")
+
+        self.assertEqual(len(self.created), 2)
+        self.assertEqual(pool.stats["idle"], 2)
+
+    def test_close(self):
+        s1 = self.pool.acquire("a")
+        with self.pool.session("a") as s2:
+            pass
+
+        self.pool.close()
+        self.assertTrue(s2.closed)
+        self.assertFalse(s1.closed)
+
+        self.pool.release("a", s1)
+        self.assertTrue(s1.closed)
+
+        with self.assertRaises(ValueError):
+            self.pool.acquire("a")
+
+
+if __name__ == "__main__":
+    unittest.main()
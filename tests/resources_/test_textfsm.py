@@ -0,0 +1,40 @@
+import unittest
+
+from myrrh.resources import textfsm
+
+REG_QUERY = """
+HKEY_LOCAL_MACHINE\\SOFTWARE\\Myrrh
+    Name    REG_SZ    myrrh
+    Count    REG_DWORD    0x2
+
+HKEY_LOCAL_MACHINE\\SOFTWARE\\Myrrh\\Sub
+    (Default)    REG_SZ    caf\udce9
+"""
+
+
+class TestTextFsm(unittest.TestCase):
+    def test_parse(self):
+        rows = textfsm.parse(REG_QUERY.encode("utf-8", "surrogatepass"), "nt_reg")
+        values = [r for r in rows if r[3]]
+
+        self.assertEqual(
+            values,
+            [
+                ["HKEY_LOCAL_MACHINE\\SOFTWARE\\Myrrh", "Name", "myrrh", "REG_SZ"],
+                ["HKEY_LOCAL_MACHINE\\SOFTWARE\\Myrrh", "Count", "0x2", "REG_DWORD"],
+                ["HKEY_LOCAL_MACHINE\\SOFTWARE\\Myrrh\\Sub", "(Default)", "caf\udce9", "REG_SZ"],
+            ],
+        )
+
+    def test_context(self):
+        parser = textfsm.getparser("nt_reg")
+
+        with parser as fsm:
+            first = fsm.ParseText(REG_QUERY)
+
+        with parser as fsm:
+            self.assertEqual(fsm.ParseText(REG_QUERY), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
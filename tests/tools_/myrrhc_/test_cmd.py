@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+import bmy
+import unittest
+
+from unittest import mock
+
+from prompt_toolkit.application.current import create_app_session
+from prompt_toolkit.data_structures import Size
+from prompt_toolkit.formatted_text import fragment_list_to_text, to_formatted_text
+from prompt_toolkit.output import DummyOutput
+
+from myrrh.tools.myrrhc import cmd
+
+main = "main"
+if main not in bmy.eids():
+    # default using local entity
+    main = bmy.new(path="**/local", eid="main")
+
+
+class StubOutput(DummyOutput):
+    # two lines per page, the last row is kept for the prompt
+    def get_size(self):
+        return Size(rows=3, columns=80)
+
+
+class TestEidOutput(unittest.TestCase):
+    def setUp(self):
+        self.pages = list()
+
+        session = create_app_session(output=StubOutput())
+        session.__enter__()
+        self.addCleanup(session.__exit__, None, None, None)
+
+        patcher = mock.patch.object(cmd, "print_container", self._print_container)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch.object(cmd.EidOuput, "MAX_PENDING_PAGES", 2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.output = cmd.EidOuput(main)
+
+    def _print_container(self, container):
+        # a page row as the text of each column, title included
+        self.pages.append([[fragment_list_to_text(to_formatted_text(w.content.text)) for w in column.children] for column in container.children])
+
+    def test_incremental(self):
+        self.output.write("l1\nl2\nl3", main)
+
+        self.assertEqual(self.pages, [[[main, "l1\nl2"]]])
+
+        self.output.write("\r\nl4\n", main)
+
+        self.assertEqual(self.pages, [[[main, "l1\nl2"]], [["l3\nl4"]]])
+
+    def test_partial_line(self):
+        self.output.write("l", main)
+        self.output.write("1", main)
+
+        self.assertEqual(self.pages, [])
+
+        self.output.close()
+
+        self.assertEqual(self.pages, [[[main, "l1"]]])
+
+    def test_columns(self):
+        self.output.write("o1\n", "other")
+        self.output.write("m1\nm2\nm3\n", main)
+
+        # every column waits for a full page
+        self.assertEqual(self.pages, [])
+
+        self.output.write("o2\n", "other")
+
+        self.assertEqual(self.pages, [[[main, "m1\nm2"], ["other", "o1\no2"]]])
+
+        self.output.close()
+
+        self.assertEqual(self.pages[1:], [[["m3"], [""]]])
+
+    def test_pending_pages(self):
+        self.output.write("o1\n", "other")
+        self.output.write("".join("m%d\n" % i for i in range(5)), main)
+
+        # a column holding more than MAX_PENDING_PAGES pages does not wait anymore
+        self.assertEqual(self.pages[0], [[main, "m0\nm1"], ["other", "o1"]])
+        self.assertEqual(self.pages[1:], [[["m2\nm3"], [""]]])
+
+    def test_stream(self):
+        stream = self.output[main]
+        stream.write("l1\nl2\n")
+
+        self.assertEqual(self.pages, [[[main, "l1\nl2"]]])
+        self.assertFalse(stream.isatty())
+
+
+if __name__ == "__main__":
+    unittest.main()
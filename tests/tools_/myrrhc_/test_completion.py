@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import os
+import time
+import unittest
+
+from unittest import mock
+
+from myrrh.tools.myrrhc import completion
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class FakeOs:
+    path = os.path
+
+    def __init__(self, *listings):
+        self.listings = list(listings)
+        self.scanned = list()
+
+    def getcwd(self):
+        return "/cwd"
+
+    def scandir(self, directory):
+        self.scanned.append(directory)
+        return self.listings.pop(0)
+
+
+class TestDirCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+
+        patcher = mock.patch.object(completion, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch.object(completion._DirCache, "TTL", 5.0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.cache = completion._DirCache()
+
+    def _wait(self, directory, entries):
+        # the background load is done once its listing is stored
+        key = ("e", os.path.join("/cwd", directory))
+        deadline = time.monotonic() + 10
+        while self.cache._listings.get(key, (0, None))[1] != entries and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(self.cache._listings[key][1], entries)
+
+    def test_cached(self):
+        mos = FakeOs(["a"], ["b"])
+
+        self.assertEqual(self.cache.scandir("e", mos, "d"), ["a"])
+        self.clock.now += 4
+        self.assertEqual(self.cache.scandir("e", mos, "d"), ["a"])
+
+        self.assertEqual(mos.scanned, ["d"])
+
+    def test_expired(self):
+        mos = FakeOs(["a"], ["b"])
+        self.cache.scandir("e", mos, "d")
+
+        self.clock.now += 5
+
+        # the expired listing is still served while refreshed in background
+        self.assertEqual(self.cache.scandir("e", mos, "d"), ["a"])
+        self._wait("d", ["b"])
+
+        self.assertEqual(self.cache.scandir("e", mos, "d"), ["b"])
+        self.assertEqual(mos.scanned, ["d", "d"])
+
+    def test_prefetch(self):
+        mos = FakeOs(["a"])
+
+        self.cache.prefetch("e", mos, ["d", None, ""])
+        self._wait("d", ["a"])
+
+        self.assertEqual(self.cache.scandir("e", mos, "d"), ["a"])
+        self.assertEqual(mos.scanned, ["d"])
+
+        # a listing still valid is not loaded again
+        self.cache.prefetch("e", mos, ["d"])
+        self.assertEqual(mos.scanned, ["d"])
+
+    def test_entities(self):
+        mos = FakeOs(["a"], ["b"])
+
+        self.assertEqual(self.cache.scandir("e1", mos, "d"), ["a"])
+        self.assertEqual(self.cache.scandir("e2", mos, "d"), ["b"])
+        self.assertEqual(self.cache.scandir("e1", mos, "d"), ["a"])
+
+        self.cache.clear()
+        mos.listings.append(["c"])
+
+        self.assertEqual(self.cache.scandir("e2", mos, "d"), ["c"])
+
+    def test_max_size(self):
+        mos = FakeOs(["a"], ["b"], ["c"])
+
+        with mock.patch.object(completion._DirCache, "MAX_SIZE", 1):
+            self.cache.scandir("e", mos, "d1")
+            self.cache.scandir("e", mos, "d2")
+            self.assertEqual(self.cache.scandir("e", mos, "d1"), ["c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import errno
+import unittest
+
+from myrrh.utils import merrno
+
+
+def baseline_errno_from_msgb(err, map=merrno.posix_error_mappings, encoding="utf8", errors="ignore"):
+    # errno_from_msgb as it was before the matchers
+    if err:
+        error = err.rsplit(b":", 1)[-1].strip()
+    else:
+        return merrno.default_errorno
+    return map.get(error.decode(encoding, errors=errors), merrno.default_errorno)
+
+
+class TestErrnoMatcher(unittest.TestCase):
+    ERRORS = (
+        b"",
+        b"No such file or directory",
+        b"rm: cannot remove 'x': No such file or directory\n",
+        b"mkdir: cannot create directory 'x': Permission denied",
+        b"ls: x: Not a directory\nls: y: Permission denied\n",
+        # the text after the last ':' spans the last lines
+        b"cp: x: Permission denied\nNo such file or directory",
+        b"sh: 1: x: not found\ntrailing text",
+        b"unknown message",
+    )
+
+    def test_errno(self):
+        matcher = merrno.errno_matcher()
+
+        for err in self.ERRORS:
+            with self.subTest(err=err):
+                self.assertEqual(matcher.errno(err), baseline_errno_from_msgb(err))
+                self.assertEqual(merrno.errno_from_msgb(err), baseline_errno_from_msgb(err))
+
+        self.assertEqual(matcher.errno(b"x: Permission denied\n"), errno.EACCES)
+        self.assertEqual(matcher.errno(b"x: Permission denied\nNo such file or directory"), merrno.default_errorno)
+
+    def test_errnos(self):
+        self.assertEqual(
+            merrno.errnos_from_msgb(self.ERRORS),
+            [baseline_errno_from_msgb(err) for err in self.ERRORS],
+        )
+
+    def test_localized_map(self):
+        map = {"Fichier introuvable": errno.ENOENT}
+
+        self.assertEqual(merrno.errno_from_msgb(b"x: Fichier introuvable", map), errno.ENOENT)
+        self.assertEqual(merrno.errno_from_msgb(b"x: No such file or directory", map), merrno.default_errorno)
+
+    def test_cache(self):
+        map = {"Fichier introuvable": errno.ENOENT}
+
+        self.assertIs(merrno.errno_matcher(map), merrno.errno_matcher(map))
+        self.assertIsNot(merrno.errno_matcher(map), merrno.errno_matcher(map, "latin-1"))
+
+        for _ in range(merrno.MATCHERS_MAX * 2):
+            merrno.errno_matcher(dict(map))
+
+        self.assertLessEqual(len(merrno._matchers), merrno.MATCHERS_MAX)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+import gc
+import itertools
+import socket
+import threading
+import time
+import unittest
+
+from myrrh.utils.mrpc import OOB_THRESHOLD, STREAM_WINDOW, RpcClient, RpcServer
+
+
+def _undecodable():
+    raise ValueError("undecodable")
+
+
+class Undecodable:
+    def __reduce__(self):
+        return _undecodable, ()
+
+
+class Service:
+    def __init__(self):
+        self.release = threading.Event()
+        self.stopped = threading.Event()
+        self.produced = 0
+
+    def echo(self, value):
+        return value
+
+    def wait(self):
+        return self.release.wait(10)
+
+    def fail(self):
+        raise FileNotFoundError(2, "missing")
+
+    def chunks(self, count, size):
+        for i in range(count):
+            yield bytes([i]) * size
+
+    def endless(self):
+        try:
+            for i in itertools.count():
+                self.produced = i + 1
+                yield i
+        finally:
+            self.stopped.set()
+
+    def undecodable(self):
+        return Undecodable()
+
+    def undecodable_items(self):
+        yield 1
+        yield Undecodable()
+
+    def _private(self):
+        return True
+
+
+class TestRpc(unittest.TestCase):
+    def setUp(self):
+        self.service = Service()
+        client_sock, server_sock = socket.socketpair()
+
+        self.server = RpcServer(self.service, server_sock).start()
+        self.client = RpcClient(client_sock)
+
+        self.addCleanup(self.server.join, 10)
+        self.addCleanup(self.client.close)
+        self.addCleanup(self.service.release.set)
+
+    def test_call(self):
+        value = {"a": [1, 2.0, None], "b": (b"x", "y")}
+
+        self.assertEqual(self.client.call("echo", value), value)
+        self.assertEqual(self.client.proxy.echo(value=3), 3)
+
+    def test_out_of_band(self):
+        data = bytes(range(256)) * (OOB_THRESHOLD // 128)
+
+        result = self.client.call("echo", [data, bytearray(data)])
+
+        self.assertEqual(result, [data, bytearray(data)])
+        self.assertEqual([type(r) for r in result], [bytes, bytearray])
+
+    def test_error(self):
+        with self.assertRaises(FileNotFoundError) as cm:
+            self.client.call("fail")
+
+        self.assertEqual(cm.exception.errno, 2)
+        self.assertTrue(cm.exception.straceback)
+
+        with self.assertRaises(AttributeError):
+            self.client.call("_private")
+
+    def test_stream(self):
+        chunks = list(self.client.stream("chunks", 3, OOB_THRESHOLD))
+
+        self.assertEqual(chunks, [bytes([i]) * OOB_THRESHOLD for i in range(3)])
+
+    def test_stream_window(self):
+        items = self.client.stream("endless")
+
+        self.assertEqual(next(items), 0)
+        time.sleep(0.2)
+        self.assertLessEqual(self.service.produced, STREAM_WINDOW + 1)
+
+        self.assertEqual(list(itertools.islice(items, STREAM_WINDOW * 4)), list(range(1, STREAM_WINDOW * 4 + 1)))
+        time.sleep(0.2)
+        self.assertLessEqual(self.service.produced, STREAM_WINDOW * 5 + 1)
+
+    def test_stream_cancel(self):
+        items = self.client.stream("endless")
+        self.assertEqual(next(items), 0)
+
+        items.close()
+
+        self.assertTrue(self.service.stopped.wait(10))
+        self.assertFalse(self.client._pending)
+        self.assertEqual(self.client.call("echo", 1), 1)
+
+    def test_stream_collected(self):
+        for started in (True, False):
+            self.service.stopped.clear()
+            self.service.produced = 0
+
+            items = self.client.stream("endless")
+            if started:
+                next(items)
+            else:
+                # the call is only known to run once it produced its first item
+                deadline = time.monotonic() + 10
+                while not self.service.produced and time.monotonic() < deadline:
+                    time.sleep(0.01)
+
+            del items
+            gc.collect()
+
+            self.assertTrue(self.service.stopped.wait(10))
+            self.assertFalse(self.client._pending)
+
+    def test_in_flight(self):
+        waiting = self.client.submit("wait")
+
+        self.assertEqual(self.client.call("echo", 1), 1)
+        self.assertFalse(waiting.done())
+
+        self.service.release.set()
+        self.assertTrue(waiting.result(10))
+
+    def test_concurrent_clients(self):
+        results = dict()
+
+        def call(i):
+            results[i] = self.client.call("echo", i)
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+
+        self.assertEqual(results, {i: i for i in range(16)})
+
+    def test_undecodable(self):
+        with self.assertRaises(ValueError):
+            self.client.call("undecodable")
+
+        with self.assertRaises(ValueError):
+            list(self.client.stream("undecodable_items"))
+
+        self.assertEqual(self.client.submit("echo", 1).result(10), 1)
+
+    def test_closed(self):
+        waiting = self.client.submit("wait")
+        self.client.close()
+
+        with self.assertRaises(OSError):
+            waiting.result(10)
+
+        with self.assertRaises(OSError):
+            self.client.call("echo", 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import threading
+import time
+import unittest
+
+from myrrh.utils.mtimer import MBurstTimer, MTimer, MVectorTimer
+
+
+class TestMTimer(unittest.TestCase):
+    def test_count(self):
+        timer = MTimer(count=3)
+
+        self.assertEqual([timer.idle for _ in range(3)], [True, True, False])
+        self.assertTrue(timer.expired_on_count)
+
+    def test_timeout(self):
+        timer = MTimer(timeout=0.05, step=0.01, raise_on_expired=True)
+
+        with self.assertRaises(MTimer.DelayExpired) as cm:
+            while True:
+                timer.idle
+
+        self.assertIs(cm.exception.timer, timer)
+        self.assertGreaterEqual(timer.duration, 0.05)
+
+    def test_sleep(self):
+        timer = MTimer(step=0.05)
+
+        start = time.monotonic()
+        timer.idle
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+
+    def test_wake(self):
+        timer = MTimer(step=5, wakeup=True)
+        threading.Timer(0.05, timer.wake).start()
+
+        start = time.monotonic()
+        timer.idle
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertFalse(timer.wakeup.is_set())
+
+    def test_wake_before_idle(self):
+        event = threading.Event()
+        timer = MTimer(step=5, wakeup=event)
+        timer.wake()
+
+        start = time.monotonic()
+        timer.idle
+        self.assertLess(time.monotonic() - start, 2)
+
+
+class TestMVectorTimer(unittest.TestCase):
+    def test_vectors(self):
+        timer = MVectorTimer([0.01, 0.02, 0.04], step=0.01)
+
+        self.assertEqual(timer.sleep_time, 0.01)
+        time.sleep(0.03)
+        self.assertEqual(timer.sleep_time, 0.04)
+
+    def test_timeout(self):
+        timer = MVectorTimer([5], timeout=0.05, step=1)
+
+        self.assertLessEqual(timer.sleep_time, 0.05)
+
+    def test_woken_restart(self):
+        timer = MBurstTimer(vectors=[0.01, 5], step=0.01, wakeup=True)
+        time.sleep(0.03)
+        self.assertEqual(timer.sleep_time, 5)
+
+        threading.Timer(0.05, timer.wake).start()
+        timer.idle
+
+        self.assertEqual(timer.sleep_time, 0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()